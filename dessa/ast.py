@@ -26,6 +26,7 @@ class Program(Node):
     """The root node of every AST our parser produces."""
     def __init__(self) -> None:
         self.statements: list[Statement] = []
+        self.resolved = False  # Set once dessa.resolver has annotated the tree
 
     def token_literal(self) -> str:
         if self.statements:
@@ -82,6 +83,9 @@ class Identifier(Expression):
     def __init__(self, token: Token, value: str) -> None:
         self.token = token  # The 'IDENT' token
         self.value = value
+        # Lexical address assigned by dessa.resolver
+        self.depth: int | None = None
+        self.slot: int | None = None
 
     def token_literal(self) -> str:
         return self.token.literal
@@ -95,6 +99,7 @@ class IntegerLiteral(Expression):
     def __init__(self, token: Token, value: int) -> None:
         self.token = token
         self.value = value
+        self.constant = None  # The Integer object, cached by the evaluators
 
     def token_literal(self) -> str:
         return self.token.literal
@@ -103,6 +108,20 @@ class IntegerLiteral(Expression):
         return str(self.value)
 
 
+class StringLiteral(Expression):
+    """A string literal is a literal that represents a sequence of characters."""
+    def __init__(self, token: Token, value: str) -> None:
+        self.token = token
+        self.value = value
+        self.constant = None  # The String object, cached by the evaluators
+
+    def token_literal(self) -> str:
+        return self.token.literal
+
+    def __str__(self) -> str:
+        return f'"{self.value}"'
+
+
 class Boolean(Expression):
     """A boolean literal is a literal that represents one of two values: true or false."""
     def __init__(self, token: Token, value: bool) -> None:
@@ -122,6 +141,7 @@ class PrefixExpression(Expression):
         self.token = token  # The prefix token, e.g., '!'
         self.operator = operator
         self.right = right
+        self.operand_type: str | None = None  # Proven type of the operands, set by dessa.inference
 
     def token_literal(self) -> str:
         return self.token.literal
@@ -137,6 +157,7 @@ class InfixExpression(Expression):
         self.left = left
         self.operator = operator
         self.right = right
+        self.operand_type: str | None = None  # Proven type of the operands, set by dessa.inference
 
     def token_literal(self) -> str:
         return self.token.literal
@@ -150,6 +171,7 @@ class BlockStatement(Statement):
     def __init__(self, token: Token, statements: list[Statement]) -> None:
         self.token = token  # The '{' token
         self.statements = statements
+        self.origin: 'BlockStatement | None' = None  # The block as written, when this is an optimized or specialized copy
 
     def token_literal(self) -> str:
         return self.token.literal
@@ -174,12 +196,48 @@ class IfExpression(Expression):
         return f"if {self.condition} {{ {self.consequence} }}{alt_str}"
 
 
+class WhileExpression(Expression):
+    """A while expression runs its body for as long as its condition is truthy."""
+    def __init__(self, token: Token, condition: Expression, body: BlockStatement) -> None:
+        self.token = token  # The 'while' token
+        self.condition = condition
+        self.body = body
+
+    def token_literal(self) -> str:
+        return self.token.literal
+
+    def __str__(self) -> str:
+        return f"while {self.condition} {{ {self.body} }}"
+
+
+class ForExpression(Expression):
+    """A for expression runs its body once for each integer in a range, bound to a name."""
+    def __init__(self, token: Token, name: Identifier, start: Expression | None, stop: Expression, body: BlockStatement) -> None:
+        self.token = token  # The 'for' token
+        self.name = name
+        self.start = start  # None counts from 0
+        self.stop = stop
+        self.body = body
+
+    def token_literal(self) -> str:
+        return self.token.literal
+
+    def __str__(self) -> str:
+        bounds = f"{self.start}, {self.stop}" if self.start else str(self.stop)
+        return f"for {self.name} in range({bounds}) {{ {self.body} }}"
+
+
 class FunctionLiteral(Expression):
     """A function literal defines a function."""
     def __init__(self, token: Token, parameters: list[Identifier], body: BlockStatement) -> None:
         self.token = token  # The 'fn' token
         self.parameters = parameters
         self.body = body
+        self.slots: dict[str, int] | None = None  # Frame layout assigned by dessa.resolver
+        self.cells: dict[str, int] | None = None  # Layout of the variables its closures capture
+        self.padding: list[None] | None = None  # Slots after the parameters, if the frame cannot escape
+        self.constants: list[int] | None = None  # Cells it reads that the enclosing call never rebinds
+        self.specializations: dict[tuple, BlockStatement] | None = None  # Bodies specialized per captured values
 
     def token_literal(self) -> str:
         return self.token.literal
@@ -195,6 +253,8 @@ class CallExpression(Expression):
         self.token = token  # The '(' token
         self.function = function
         self.arguments = arguments
+        self.tail = False  # Set by dessa.resolver for calls in tail position
+        self.cache = None  # The last callee's frame shape, cached by dessa.evaluator
 
     def token_literal(self) -> str:
         return self.token.literal
@@ -202,3 +262,98 @@ class CallExpression(Expression):
     def __str__(self) -> str:
         args = ", ".join(str(a) for a in self.arguments)
         return f"{self.function}({args})"
+
+
+class ArrayLiteral(Expression):
+    """An array literal evaluates its elements into a new array."""
+    def __init__(self, token: Token, elements: list[Expression]) -> None:
+        self.token = token  # The '[' token
+        self.elements = elements
+
+    def token_literal(self) -> str:
+        return self.token.literal
+
+    def __str__(self) -> str:
+        elements = ", ".join(str(e) for e in self.elements)
+        return f"[{elements}]"
+
+
+class HashLiteral(Expression):
+    """A hash literal evaluates its keys and values, in order, into a new hash."""
+    def __init__(self, token: Token, pairs: list[tuple[Expression, Expression]]) -> None:
+        self.token = token  # The '{' token
+        self.pairs = pairs
+
+    def token_literal(self) -> str:
+        return self.token.literal
+
+    def __str__(self) -> str:
+        pairs = ", ".join(f"{key}: {value}" for key, value in self.pairs)
+        return f"{{{pairs}}}"
+
+
+class IndexExpression(Expression):
+    """An index expression reads an element of an array or a value of a hash."""
+    def __init__(self, token: Token, left: Expression, index: Expression) -> None:
+        self.token = token  # The '[' token
+        self.left = left
+        self.index = index
+
+    def token_literal(self) -> str:
+        return self.token.literal
+
+    def __str__(self) -> str:
+        return f"({self.left}[{self.index}])"
+
+
+def children(node: Node) -> list[Node]:
+    """Returns the direct child nodes of a node."""
+    if isinstance(node, Program) or isinstance(node, BlockStatement):
+        return list(node.statements)
+    elif isinstance(node, ExpressionStatement):
+        return [node.expression]
+    elif isinstance(node, LetStatement):
+        return [node.value]
+    elif isinstance(node, ReturnStatement):
+        return [node.return_value]
+    elif isinstance(node, PrefixExpression):
+        return [node.right]
+    elif isinstance(node, InfixExpression):
+        return [node.left, node.right]
+    elif isinstance(node, IfExpression):
+        if node.alternative:
+            return [node.condition, node.consequence, node.alternative]
+        return [node.condition, node.consequence]
+    elif isinstance(node, CallExpression):
+        return [node.function] + node.arguments
+    elif isinstance(node, ArrayLiteral):
+        return list(node.elements)
+    elif isinstance(node, HashLiteral):
+        return [child for pair in node.pairs for child in pair]
+    elif isinstance(node, IndexExpression):
+        return [node.left, node.index]
+    elif isinstance(node, WhileExpression):
+        return [node.condition, node.body]
+    elif isinstance(node, ForExpression):
+        if node.start:
+            return [node.start, node.stop, node.body]
+        return [node.stop, node.body]
+    return []
+
+
+def bound_names(statements: list[Node]) -> list[str]:
+    """Returns the names that lets and for loops bind in statements, excluding nested functions."""
+    return [node.name.value for node in walk(statements) if isinstance(node, (LetStatement, ForExpression))]
+
+
+def walk(nodes: list[Node]):
+    """Yields nodes depth-first without descending into function literals."""
+    stack = list(reversed(nodes))
+    while stack:
+        node = stack.pop()
+        if node is None:
+            continue
+        yield node
+        if isinstance(node, FunctionLiteral):
+            continue
+        stack.extend(reversed(children(node)))
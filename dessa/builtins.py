@@ -0,0 +1,131 @@
+from typing import Callable
+from dessa.object import Object, Integer, Array, Hash, String, Vector, Builtin, Error, new_array, new_integer, numpy, NULL, FALSE
+
+# How an engine applies a Dessa function to arguments on a builtin's behalf.
+# It returns the function's value, or an Error that the builtin hands back.
+Apply = Callable[[Object, list[Object]], Object | None]
+
+
+def _builtin(arity: int) -> Callable[[Callable], Builtin]:
+    """Registers the decorated function as a builtin taking `arity` arguments."""
+
+    def decorator(fn: Callable) -> Builtin:
+        name = fn.__name__.lstrip("_")
+
+        def call(args: list[Object], apply: Apply) -> Object | None:
+            if len(args) != arity:
+                return _error(f"wrong number of arguments: want={arity}, got={len(args)}")
+            return fn(*args, apply)
+
+        builtin = BUILTINS[name] = Builtin(name, call)
+        return builtin
+
+    return decorator
+
+
+# The functions every program can call without binding them. A let of the
+# same name shadows one.
+BUILTINS: dict[str, Builtin] = {}
+
+
+@_builtin(1)
+def _len(value: Object, apply: Apply) -> Object:
+    if type(value) not in (Array, Hash, String, Vector):
+        return _error(f"argument to `len` not supported, got {value.object_type()}")
+    return new_integer(len(value))
+
+
+@_builtin(1)
+def _sum(arr: Object, apply: Apply) -> Object:
+    if type(arr) is Vector:
+        return new_integer(int(arr.values.sum()))
+    if type(arr) is not Array:
+        return _error(f"argument to `sum` must be ARRAY, got {arr.object_type()}")
+    if arr.packed:
+        return new_integer(sum(arr.values()))
+    total = 0
+    for element in arr.values():
+        if type(element) is not Integer:
+            return _error(f"type mismatch: INTEGER + {element.object_type()}")
+        total += element.value
+    return new_integer(total)
+
+
+@_builtin(2)
+def _push(arr: Object, element: Object, apply: Apply) -> Object:
+    if type(arr) is not Array:
+        return _error(f"first argument to `push` must be ARRAY, got {arr.object_type()}")
+    if not arr.length:
+        return new_array([element])
+    elements = arr.elements
+    if len(elements) == arr.length and (not arr.packed or type(element) is Integer):
+        # Nothing has been pushed onto this array yet, so the new one can
+        # extend its storage instead of copying it.
+        try:
+            elements.append(element.value if arr.packed else element)
+            return Array(elements, arr.length + 1)
+        except OverflowError:
+            pass
+    return Array(arr.objects() + [element])
+
+
+@_builtin(2)
+def _map(arr: Object, fn: Object, apply: Apply) -> Object:
+    if type(arr) is not Array:
+        return _error(f"first argument to `map` must be ARRAY, got {arr.object_type()}")
+    results = []
+    for element in arr.objects():
+        result = apply(fn, [element])
+        if isinstance(result, Error):
+            return result
+        results.append(result)
+    return new_array(results)
+
+
+@_builtin(2)
+def _filter(arr: Object, fn: Object, apply: Apply) -> Object:
+    if type(arr) is not Array:
+        return _error(f"first argument to `filter` must be ARRAY, got {arr.object_type()}")
+    kept = []
+    for element in arr.objects():
+        result = apply(fn, [element])
+        if isinstance(result, Error):
+            return result
+        if result is not NULL and result is not FALSE:
+            kept.append(element)
+    return new_array(kept)
+
+
+@_builtin(3)
+def _reduce(arr: Object, initial: Object, fn: Object, apply: Apply) -> Object | None:
+    if type(arr) is not Array:
+        return _error(f"first argument to `reduce` must be ARRAY, got {arr.object_type()}")
+    accumulator = initial
+    for element in arr.objects():
+        accumulator = apply(fn, [accumulator, element])
+        if isinstance(accumulator, Error):
+            return accumulator
+    return accumulator
+
+
+@_builtin(1)
+def _vector(arr: Object, apply: Apply) -> Object:
+    if numpy is None:
+        return _error("`vector` needs NumPy, which is not installed")
+    if type(arr) is not Array:
+        return _error(f"argument to `vector` must be ARRAY, got {arr.object_type()}")
+    if arr.packed:
+        return Vector(numpy.array(arr.values(), dtype=numpy.int64))
+    values = []
+    for element in arr.values():
+        if type(element) is not Integer:
+            return _error(f"vector elements must be INTEGER, got {element.object_type()}")
+        values.append(element.value)
+    try:
+        return Vector(numpy.array(values, dtype=numpy.int64))
+    except OverflowError:
+        return _error("vector elements must fit in 64 bits")
+
+
+def _error(message: str) -> Error:
+    return Error(message=message)
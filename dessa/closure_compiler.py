@@ -0,0 +1,433 @@
+from __future__ import annotations
+from typing import Callable
+from dessa.ast import (
+    Node,
+    Program,
+    ExpressionStatement,
+    IntegerLiteral,
+    StringLiteral,
+    Boolean as astBoolean,
+    PrefixExpression,
+    InfixExpression,
+    IfExpression,
+    WhileExpression,
+    ForExpression,
+    BlockStatement,
+    ReturnStatement,
+    LetStatement,
+    Identifier,
+    FunctionLiteral,
+    CallExpression,
+    ArrayLiteral,
+    HashLiteral,
+    IndexExpression,
+)
+from dessa.environment import Environment
+from dessa.inference import INTEGER, BOOLEAN, infer
+from dessa.evaluator import (
+    new_error,
+    _apply_function,
+    _unbound,
+    _check_arity,
+    _eval_string_literal,
+    _eval_infix_expression,
+    _eval_prefix_expression,
+    _eval_range,
+    _eval_index_expression,
+    _new_hash,
+)
+from dessa.object import (
+    Object,
+    Integer,
+    new_integer,
+    NULL,
+    TRUE,
+    FALSE,
+    ReturnValue,
+    Error,
+    Function,
+    Builtin,
+    new_array,
+)
+
+Code = Callable[[Environment], Object | None]
+
+
+class _Abort(Exception):
+    """Unwinds compiled code with a Dessa runtime error."""
+
+    def __init__(self, error: Error) -> None:
+        self.error = error
+
+
+class CompiledClosure(Function):
+    """A Function whose body has already been compiled to a Python closure."""
+
+    def __init__(self, parameters, body, env, code: Code) -> None:
+        super().__init__(parameters=parameters, body=body, env=env)
+        self.code = code
+
+
+def compile_program(program: Program) -> Code:
+    """Compiles a program into a closure that runs it in an environment."""
+    infer(program)
+    statements = [_compile(s) for s in program.statements]
+
+    def run_program(env: Environment) -> Object | None:
+        result = None
+        try:
+            for statement in statements:
+                result = statement(env)
+                if type(result) is ReturnValue:
+                    return result.value
+        except _Abort as abort:
+            return abort.error
+        return result
+
+    return run_program
+
+
+def run(program: Program, env: Environment) -> Object | None:
+    """Compiles a program to closures and runs it."""
+    return compile_program(program)(env)
+
+
+def _check(result: Object) -> Object:
+    """Raises Dessa errors produced by the shared evaluator helpers."""
+    if type(result) is Error:
+        raise _Abort(result)
+    return result
+
+
+def _compile(node: Node) -> Code:
+    # dessa.evaluator quickens nodes into subclasses of the AST types, so a
+    # node compiles as the first type in its MRO that has a compiler.
+    for node_type in type(node).__mro__:
+        compiler = _COMPILERS.get(node_type)
+        if compiler is not None:
+            return compiler(node)
+    raise TypeError(f"cannot compile {type(node).__name__}")
+
+
+def _compile_expression_statement(node: ExpressionStatement) -> Code:
+    return _compile(node.expression)
+
+
+def _compile_integer_literal(node: IntegerLiteral) -> Code:
+    value = new_integer(node.value)
+
+    def integer_literal(env: Environment) -> Object:
+        return value
+
+    return integer_literal
+
+
+def _compile_string_literal(node: StringLiteral) -> Code:
+    value = _eval_string_literal(node, None)
+
+    def string_literal(env: Environment) -> Object:
+        return value
+
+    return string_literal
+
+
+def _compile_boolean(node: astBoolean) -> Code:
+    value = TRUE if node.value else FALSE
+
+    def boolean(env: Environment) -> Object:
+        return value
+
+    return boolean
+
+
+def _compile_identifier(node: Identifier) -> Code:
+    name = node.value
+
+    def identifier(env: Environment) -> Object:
+        value = env.get(name)
+        if value is None:
+            return _check(_unbound(name))
+        return value
+
+    return identifier
+
+
+def _compile_prefix_expression(node: PrefixExpression) -> Code:
+    operator = node.operator
+    right = _compile(node.right)
+
+    if operator == "-" and node.operand_type == INTEGER:
+        def negate_integer(env: Environment) -> Object:
+            return new_integer(-right(env).value)
+        return negate_integer
+
+    if operator == "-":
+        def negate(env: Environment) -> Object:
+            value = right(env)
+            if type(value) is Integer:
+                return new_integer(-value.value)
+            return _check(_eval_prefix_expression(operator, value))
+        return negate
+
+    if operator == "!":
+        def bang(env: Environment) -> Object:
+            value = right(env)
+            if value is FALSE or value is NULL:
+                return TRUE
+            return FALSE
+        return bang
+
+    def prefix(env: Environment) -> Object:
+        return _check(_eval_prefix_expression(operator, right(env)))
+    return prefix
+
+
+def _compile_infix_expression(node: InfixExpression) -> Code:
+    factory = _INFIX_FACTORIES.get(node.operator)
+    left = _compile(node.left)
+    right = _compile(node.right)
+    if node.operand_type == INTEGER:
+        # Both operands are proven integers, so they need no type test.
+        integer_op = _INTEGER_OPERATIONS[node.operator]
+
+        def integer_infix(env: Environment) -> Object:
+            return integer_op(left(env).value, right(env).value)
+        return integer_infix
+    if node.operand_type == BOOLEAN:
+        equal = node.operator == "=="
+
+        def boolean_infix(env: Environment) -> Object:
+            return TRUE if (left(env) is right(env)) is equal else FALSE
+        return boolean_infix
+    if factory is None:
+        operator = node.operator
+
+        def infix(env: Environment) -> Object:
+            lhs = left(env)
+            return _check(_eval_infix_expression(operator, lhs, right(env)))
+        return infix
+    return factory(left, right)
+
+
+def _integer_infix(operator: str, integer_op: Callable[[int, int], Object]):
+    """Builds a factory for an infix operator with an integer fast path."""
+
+    def factory(left: Code, right: Code) -> Code:
+        def infix(env: Environment) -> Object:
+            lhs = left(env)
+            rhs = right(env)
+            if type(lhs) is Integer and type(rhs) is Integer:
+                return integer_op(lhs.value, rhs.value)
+            return _check(_eval_infix_expression(operator, lhs, rhs))
+        return infix
+
+    return factory
+
+
+_INTEGER_OPERATIONS: dict[str, Callable[[int, int], Object]] = {
+    "+": lambda a, b: new_integer(a + b),
+    "-": lambda a, b: new_integer(a - b),
+    "*": lambda a, b: new_integer(a * b),
+    "/": lambda a, b: new_integer(a // b),
+    "<": lambda a, b: TRUE if a < b else FALSE,
+    ">": lambda a, b: TRUE if a > b else FALSE,
+    "==": lambda a, b: TRUE if a == b else FALSE,
+    "!=": lambda a, b: TRUE if a != b else FALSE,
+}
+
+_INFIX_FACTORIES = {
+    operator: _integer_infix(operator, integer_op)
+    for operator, integer_op in _INTEGER_OPERATIONS.items()
+}
+
+
+def _compile_if_expression(node: IfExpression) -> Code:
+    condition = _compile(node.condition)
+    consequence = _compile(node.consequence)
+    if node.alternative:
+        alternative = _compile(node.alternative)
+
+        def if_else(env: Environment) -> Object | None:
+            value = condition(env)
+            if value is FALSE or value is NULL:
+                return alternative(env)
+            return consequence(env)
+        return if_else
+
+    def if_only(env: Environment) -> Object | None:
+        value = condition(env)
+        if value is FALSE or value is NULL:
+            return NULL
+        return consequence(env)
+    return if_only
+
+
+def _compile_while_expression(node: WhileExpression) -> Code:
+    condition = _compile(node.condition)
+    body = _compile(node.body)
+
+    def while_loop(env: Environment) -> Object | None:
+        while True:
+            value = condition(env)
+            if value is FALSE or value is NULL:
+                return NULL
+            result = body(env)
+            if type(result) is ReturnValue:
+                return result
+    return while_loop
+
+
+def _compile_for_expression(node: ForExpression) -> Code:
+    name = node.name.value
+    zero = new_integer(0)
+    start = _compile(node.start) if node.start else lambda env: zero
+    stop = _compile(node.stop)
+    body = _compile(node.body)
+
+    def for_loop(env: Environment) -> Object | None:
+        bounds = _check(_eval_range(start(env), stop(env)))
+        for value in bounds:
+            env.set(name, new_integer(value))
+            result = body(env)
+            if type(result) is ReturnValue:
+                return result
+        return NULL
+    return for_loop
+
+
+def _compile_block_statement(node: BlockStatement) -> Code:
+    statements = [_compile(s) for s in node.statements]
+    if not statements:
+        return lambda env: None
+    if len(statements) == 1:
+        return statements[0]
+
+    def block(env: Environment) -> Object | None:
+        result = None
+        for statement in statements:
+            result = statement(env)
+            if type(result) is ReturnValue:
+                return result
+        return result
+    return block
+
+
+def _compile_return_statement(node: ReturnStatement) -> Code:
+    value = _compile(node.return_value)
+
+    def return_statement(env: Environment) -> Object:
+        return ReturnValue(value=value(env))
+
+    return return_statement
+
+
+def _compile_let_statement(node: LetStatement) -> Code:
+    name = node.name.value
+    value = _compile(node.value)
+
+    def let_statement(env: Environment) -> None:
+        env.set(name, value(env))
+
+    return let_statement
+
+
+def _compile_function_literal(node: FunctionLiteral) -> Code:
+    parameters = node.parameters
+    body = node.body
+    code = _compile(body)
+
+    def function_literal(env: Environment) -> Object:
+        return CompiledClosure(parameters=parameters, body=body, env=env, code=code)
+
+    return function_literal
+
+
+def _compile_call_expression(node: CallExpression) -> Code:
+    function = _compile(node.function)
+    arguments = [_compile(a) for a in node.arguments]
+
+    if len(arguments) == 1:
+        argument = arguments[0]
+
+        def call_one(env: Environment) -> Object | None:
+            fn = function(env)
+            return _apply(fn, [argument(env)])
+        return call_one
+
+    def call(env: Environment) -> Object | None:
+        fn = function(env)
+        return _apply(fn, [argument(env) for argument in arguments])
+    return call
+
+
+def _compile_array_literal(node: ArrayLiteral) -> Code:
+    elements = [_compile(e) for e in node.elements]
+
+    def array_literal(env: Environment) -> Object:
+        return new_array([element(env) for element in elements])
+
+    return array_literal
+
+
+def _compile_hash_literal(node: HashLiteral) -> Code:
+    children = [_compile(child) for pair in node.pairs for child in pair]
+
+    def hash_literal(env: Environment) -> Object:
+        return _check(_new_hash([child(env) for child in children]))
+
+    return hash_literal
+
+
+def _compile_index_expression(node: IndexExpression) -> Code:
+    left = _compile(node.left)
+    index = _compile(node.index)
+
+    def index_expression(env: Environment) -> Object:
+        return _check(_eval_index_expression(left(env), index(env)))
+
+    return index_expression
+
+
+def _apply(fn: Object, args: list[Object]) -> Object | None:
+    """Applies a function, running compiled bodies directly."""
+    if type(fn) is CompiledClosure:
+        error = _check_arity(fn, len(args))
+        if error is not None:
+            raise _Abort(error)
+        env = Environment(outer=fn.env)
+        for i, param in enumerate(fn.parameters):
+            env.set(param.value, args[i])
+        result = fn.code(env)
+        if type(result) is ReturnValue:
+            return result.value
+        return result
+    if type(fn) is Builtin:
+        return _check(fn.fn(args, _apply))
+    if not isinstance(fn, Function):
+        raise _Abort(new_error(f"not a function: {fn.object_type()}"))
+    result = _apply_function(fn, args)
+    if isinstance(result, Error):
+        raise _Abort(result)
+    return result
+
+
+_COMPILERS: dict[type, Callable[[Node], Code]] = {
+    ExpressionStatement: _compile_expression_statement,
+    IntegerLiteral: _compile_integer_literal,
+    StringLiteral: _compile_string_literal,
+    astBoolean: _compile_boolean,
+    Identifier: _compile_identifier,
+    PrefixExpression: _compile_prefix_expression,
+    InfixExpression: _compile_infix_expression,
+    IfExpression: _compile_if_expression,
+    WhileExpression: _compile_while_expression,
+    ForExpression: _compile_for_expression,
+    BlockStatement: _compile_block_statement,
+    ReturnStatement: _compile_return_statement,
+    LetStatement: _compile_let_statement,
+    FunctionLiteral: _compile_function_literal,
+    CallExpression: _compile_call_expression,
+    ArrayLiteral: _compile_array_literal,
+    HashLiteral: _compile_hash_literal,
+    IndexExpression: _compile_index_expression,
+}
@@ -0,0 +1,492 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from enum import IntEnum
+from dessa.ast import (
+    Node,
+    Program,
+    ExpressionStatement,
+    IntegerLiteral,
+    StringLiteral,
+    Boolean as astBoolean,
+    PrefixExpression,
+    InfixExpression,
+    IfExpression,
+    WhileExpression,
+    ForExpression,
+    BlockStatement,
+    ReturnStatement,
+    LetStatement,
+    Identifier,
+    FunctionLiteral,
+    CallExpression,
+    ArrayLiteral,
+    HashLiteral,
+    IndexExpression,
+    bound_names,
+    walk,
+)
+from dessa.object import Object, CompiledFunction, String, new_integer
+
+
+class OpCode(IntEnum):
+    # Operands follow the opcode inline, one list slot each.
+    CONSTANT = 0          # constant index
+    TRUE = 1
+    FALSE = 2
+    NULL = 3
+    NOTHING = 4           # pushes Python None, the "no value" of let and empty blocks
+    POP = 5               # target for a propagated return, 0 to leave the frame
+    ADD = 6
+    SUB = 7
+    MUL = 8
+    DIV = 9
+    EQ = 10
+    NOT_EQ = 11
+    LT = 12
+    GT = 13
+    MINUS = 14
+    BANG = 15
+    JUMP = 16             # target
+    JUMP_NOT_TRUTHY = 17  # target
+    GET_GLOBAL = 18       # name index
+    SET_GLOBAL = 19       # name index
+    GET_LOCAL = 20        # slot
+    SET_LOCAL = 21        # slot
+    TRY_LOCAL = 22        # slot, target
+    GET_DEREF = 23        # slot holding a cell
+    SET_DEREF = 24        # slot holding a cell
+    TRY_DEREF = 25        # slot holding a cell, target
+    GET_FREE = 26         # free index
+    TRY_FREE = 27         # free index, target
+    CLOSURE = 28          # constant index
+    CALL = 29             # argument count
+    RETURN_VALUE = 30
+    RANGE = 31            # slot that receives the iterator
+    FOR_ITER = 32         # slot holding the iterator, target when exhausted
+    ARRAY = 33            # element count
+    INDEX = 34
+    HASH = 35             # key and value count
+    WRAP_RETURN = 36      # wraps a return whose if or loop is used as a value
+    RETURN_RESULT = 37    # returns the last statement's value, unwrapping a return
+
+
+OPERAND_COUNTS: dict[OpCode, int] = {
+    OpCode.CONSTANT: 1,
+    OpCode.POP: 1,
+    OpCode.JUMP: 1,
+    OpCode.JUMP_NOT_TRUTHY: 1,
+    OpCode.GET_GLOBAL: 1,
+    OpCode.SET_GLOBAL: 1,
+    OpCode.GET_LOCAL: 1,
+    OpCode.SET_LOCAL: 1,
+    OpCode.TRY_LOCAL: 2,
+    OpCode.GET_DEREF: 1,
+    OpCode.SET_DEREF: 1,
+    OpCode.TRY_DEREF: 2,
+    OpCode.GET_FREE: 1,
+    OpCode.TRY_FREE: 2,
+    OpCode.CLOSURE: 1,
+    OpCode.CALL: 1,
+    OpCode.RANGE: 1,
+    OpCode.FOR_ITER: 2,
+    OpCode.ARRAY: 1,
+    OpCode.HASH: 1,
+}
+
+INFIX_OPCODES: dict[str, OpCode] = {
+    "+": OpCode.ADD,
+    "-": OpCode.SUB,
+    "*": OpCode.MUL,
+    "/": OpCode.DIV,
+    "==": OpCode.EQ,
+    "!=": OpCode.NOT_EQ,
+    "<": OpCode.LT,
+    ">": OpCode.GT,
+}
+
+PREFIX_OPCODES: dict[str, OpCode] = {
+    "-": OpCode.MINUS,
+    "!": OpCode.BANG,
+}
+
+
+class CompileError(Exception):
+    """Raised when a node cannot be lowered to bytecode."""
+    pass
+
+
+@dataclass
+class Bytecode:
+    """The output of the compiler: the top-level code plus shared pools."""
+    main: CompiledFunction
+    constants: list[Object | CompiledFunction] = field(default_factory=list)
+    names: list[str] = field(default_factory=list)
+
+
+def disassemble(instructions: list[int]) -> str:
+    """Returns a human readable listing of the instructions."""
+    lines = []
+    ip = 0
+    while ip < len(instructions):
+        op = OpCode(instructions[ip])
+        count = OPERAND_COUNTS.get(op, 0)
+        operands = instructions[ip + 1:ip + 1 + count]
+        lines.append(" ".join([f"{ip:04d}", op.name] + [str(o) for o in operands]))
+        ip += 1 + count
+    return "\n".join(lines)
+
+
+class _Scope:
+    """The compile-time view of one function body."""
+
+    def __init__(self, outer: _Scope | None, function: FunctionLiteral | None) -> None:
+        self.outer = outer
+        self.function = function
+        self.instructions: list[int] = []
+        self.slots: dict[str, int] = {}
+        self.parameters: set[str] = set()
+        self.cells: set[str] = set()
+        self.free: dict[tuple[int, str], int] = {}
+        self.free_sources: list[tuple[bool, int]] = []
+        self.num_slots = 0
+
+    def is_global(self) -> bool:
+        return self.function is None
+
+
+class Compiler:
+    """Lowers a Program to bytecode for the stack VM in dessa.vm."""
+
+    def __init__(self) -> None:
+        self._constants: list[Object | CompiledFunction] = []
+        self._integers: dict[int, int] = {}
+        self._strings: dict[str, int] = {}
+        self._names: list[str] = []
+        self._name_indexes: dict[str, int] = {}
+        self._escaping: dict[int, set[str]] = {}
+        self._scope = _Scope(None, None)
+        # Jumps to the end of the innermost if or loop used as a value, which
+        # is where a return inside it stops; None when a return leaves the frame.
+        self._capture: list[int] | None = None
+
+    def compile(self, program: Program) -> Bytecode:
+        """Compiles a program into bytecode."""
+        self._compile_body(program.statements)
+        self._emit(OpCode.RETURN_RESULT)
+        main = CompiledFunction(
+            instructions=self._scope.instructions,
+            num_locals=self._scope.num_slots,
+            num_parameters=0,
+            cells=[],
+            free_sources=[],
+            source="",
+            constants=self._constants,
+            names=self._names,
+        )
+        return Bytecode(main=main, constants=self._constants, names=self._names)
+
+    def _emit(self, op: OpCode, *operands: int) -> int:
+        """Appends an instruction and returns its position."""
+        instructions = self._scope.instructions
+        position = len(instructions)
+        instructions.append(int(op))
+        instructions.extend(operands)
+        return position
+
+    def _patch(self, position: int, target: int) -> None:
+        """Points the last operand of the jump at position to target."""
+        op = OpCode(self._scope.instructions[position])
+        self._scope.instructions[position + OPERAND_COUNTS[op]] = target
+
+    def _here(self) -> int:
+        return len(self._scope.instructions)
+
+    def _add_constant(self, obj: Object | CompiledFunction) -> int:
+        self._constants.append(obj)
+        return len(self._constants) - 1
+
+    def _integer_constant(self, value: int) -> int:
+        index = self._integers.get(value)
+        if index is None:
+            index = self._add_constant(new_integer(value))
+            self._integers[value] = index
+        return index
+
+    def _string_constant(self, value: str) -> int:
+        index = self._strings.get(value)
+        if index is None:
+            index = self._add_constant(String(value))
+            self._strings[value] = index
+        return index
+
+    def _name(self, name: str) -> int:
+        index = self._name_indexes.get(name)
+        if index is None:
+            index = len(self._names)
+            self._names.append(name)
+            self._name_indexes[name] = index
+        return index
+
+    def _compile_body(self, statements: list) -> None:
+        """Compiles statements so that the value of the last one stays on the stack."""
+        if not statements:
+            self._emit(OpCode.NOTHING)
+            return
+        last = len(statements) - 1
+        for i, statement in enumerate(statements):
+            if isinstance(statement, ExpressionStatement):
+                self._compile_statement_expression(statement.expression)
+                if i != last:
+                    self._emit_pop()
+            elif isinstance(statement, LetStatement):
+                self._compile_expression(statement.value)
+                self._compile_store(statement.name.value)
+                if i == last:
+                    self._emit(OpCode.NOTHING)
+            elif isinstance(statement, ReturnStatement):
+                self._compile_expression(statement.return_value)
+                if self._capture is None:
+                    self._emit(OpCode.RETURN_VALUE)
+                else:
+                    self._emit(OpCode.WRAP_RETURN)
+                    self._capture.append(self._emit(OpCode.JUMP, 0))
+                return
+            else:
+                raise CompileError(f"cannot compile {type(statement).__name__}")
+
+    def _emit_pop(self) -> None:
+        """Drops a statement's value, passing a wrapped return outward."""
+        position = self._emit(OpCode.POP, 0)
+        if self._capture is not None:
+            self._capture.append(position)
+
+    def _compile_statement_expression(self, node: Node) -> None:
+        """Compiles a statement's expression; an if or loop here lets a return pass through."""
+        if isinstance(node, IfExpression):
+            self._compile_if_expression(node)
+        elif isinstance(node, WhileExpression):
+            self._compile_while_expression(node)
+        elif isinstance(node, ForExpression):
+            self._compile_for_expression(node)
+        else:
+            self._compile_expression(node)
+
+    def _compile_value(self, node: Node) -> None:
+        """Compiles an if or loop used as a value, where a return becomes its value."""
+        outer = self._capture
+        self._capture = []
+        self._compile_statement_expression(node)
+        for position in self._capture:
+            self._patch(position, self._here())
+        self._capture = outer
+
+    def _compile_expression(self, node: Node) -> None:
+        if isinstance(node, IntegerLiteral):
+            self._emit(OpCode.CONSTANT, self._integer_constant(node.value))
+        elif isinstance(node, StringLiteral):
+            self._emit(OpCode.CONSTANT, self._string_constant(node.value))
+        elif isinstance(node, astBoolean):
+            self._emit(OpCode.TRUE if node.value else OpCode.FALSE)
+        elif isinstance(node, Identifier):
+            self._compile_load(node.value)
+        elif isinstance(node, InfixExpression):
+            self._compile_expression(node.left)
+            self._compile_expression(node.right)
+            op = INFIX_OPCODES.get(node.operator)
+            if op is None:
+                raise CompileError(f"unknown operator: {node.operator}")
+            self._emit(op)
+        elif isinstance(node, PrefixExpression):
+            self._compile_expression(node.right)
+            op = PREFIX_OPCODES.get(node.operator)
+            if op is None:
+                raise CompileError(f"unknown operator: {node.operator}")
+            self._emit(op)
+        elif isinstance(node, (IfExpression, WhileExpression, ForExpression)):
+            self._compile_value(node)
+        elif isinstance(node, CallExpression):
+            self._compile_expression(node.function)
+            for argument in node.arguments:
+                self._compile_expression(argument)
+            self._emit(OpCode.CALL, len(node.arguments))
+        elif isinstance(node, FunctionLiteral):
+            self._compile_function_literal(node)
+        elif isinstance(node, ArrayLiteral):
+            for element in node.elements:
+                self._compile_expression(element)
+            self._emit(OpCode.ARRAY, len(node.elements))
+        elif isinstance(node, HashLiteral):
+            for key, value in node.pairs:
+                self._compile_expression(key)
+                self._compile_expression(value)
+            self._emit(OpCode.HASH, len(node.pairs) * 2)
+        elif isinstance(node, IndexExpression):
+            self._compile_expression(node.left)
+            self._compile_expression(node.index)
+            self._emit(OpCode.INDEX)
+        else:
+            raise CompileError(f"cannot compile {type(node).__name__}")
+
+    def _compile_if_expression(self, node: IfExpression) -> None:
+        self._compile_expression(node.condition)
+        jump_not_truthy = self._emit(OpCode.JUMP_NOT_TRUTHY, 0)
+        self._compile_body(node.consequence.statements)
+        jump = self._emit(OpCode.JUMP, 0)
+        self._patch(jump_not_truthy, self._here())
+        if node.alternative:
+            self._compile_body(node.alternative.statements)
+        else:
+            self._emit(OpCode.NULL)
+        self._patch(jump, self._here())
+
+    def _compile_while_expression(self, node: WhileExpression) -> None:
+        start = self._here()
+        self._compile_expression(node.condition)
+        jump_not_truthy = self._emit(OpCode.JUMP_NOT_TRUTHY, 0)
+        self._compile_body(node.body.statements)
+        self._emit_pop()
+        self._emit(OpCode.JUMP, start)
+        self._patch(jump_not_truthy, self._here())
+        self._emit(OpCode.NULL)
+
+    def _compile_for_expression(self, node: ForExpression) -> None:
+        if node.start:
+            self._compile_expression(node.start)
+        else:
+            self._emit(OpCode.CONSTANT, self._integer_constant(0))
+        self._compile_expression(node.stop)
+        # The iterator lives in a hidden local rather than on the stack, so
+        # a return from the body leaves nothing behind.
+        slot = self._scope.num_slots
+        self._scope.num_slots += 1
+        self._emit(OpCode.RANGE, slot)
+        start = self._here()
+        for_iter = self._emit(OpCode.FOR_ITER, slot, 0)
+        self._compile_store(node.name.value)
+        self._compile_body(node.body.statements)
+        self._emit_pop()
+        self._emit(OpCode.JUMP, start)
+        self._patch(for_iter, self._here())
+        self._emit(OpCode.NULL)
+
+    def _compile_function_literal(self, node: FunctionLiteral) -> None:
+        scope = _Scope(self._scope, node)
+        for i, param in enumerate(node.parameters):
+            scope.slots[param.value] = i
+            scope.parameters.add(param.value)
+        scope.num_slots = len(node.parameters)
+        for name in _declared_names(node.body.statements):
+            if name not in scope.slots:
+                scope.slots[name] = scope.num_slots
+                scope.num_slots += 1
+        for child in _child_functions(node.body):
+            scope.cells.update(self._escaping_names(child) & scope.slots.keys())
+
+        self._scope = scope
+        outer_capture = self._capture
+        self._capture = None
+        self._compile_body(node.body.statements)
+        self._emit(OpCode.RETURN_RESULT)
+        self._scope = scope.outer
+        self._capture = outer_capture
+
+        params = ", ".join(str(p) for p in node.parameters)
+        compiled = CompiledFunction(
+            instructions=scope.instructions,
+            num_locals=scope.num_slots,
+            num_parameters=len(node.parameters),
+            cells=sorted(scope.slots[name] for name in scope.cells),
+            free_sources=scope.free_sources,
+            source=f"fn({params}) {{\n{node.body.origin or node.body}\n}}",
+            constants=self._constants,
+            names=self._names,
+        )
+        self._emit(OpCode.CLOSURE, self._add_constant(compiled))
+
+    def _escaping_names(self, node: FunctionLiteral) -> set[str]:
+        """Returns the names a function may read from enclosing scopes."""
+        key = id(node)
+        names = self._escaping.get(key)
+        if names is None:
+            names = _read_names(node.body)
+            for child in _child_functions(node.body):
+                names |= self._escaping_names(child)
+            names -= {param.value for param in node.parameters}
+            self._escaping[key] = names
+        return names
+
+    def _compile_store(self, name: str) -> None:
+        scope = self._scope
+        if scope.is_global():
+            self._emit(OpCode.SET_GLOBAL, self._name(name))
+        elif name in scope.cells:
+            self._emit(OpCode.SET_DEREF, scope.slots[name])
+        else:
+            self._emit(OpCode.SET_LOCAL, scope.slots[name])
+
+    def _compile_load(self, name: str) -> None:
+        """
+        Emits a lookup that mirrors Environment.get: the innermost bound
+        binding wins, falling through to enclosing scopes and then globals.
+        Parameters are always bound, so the chain stops at them; let
+        bindings may not have run yet, so they are tried with a jump past
+        the rest of the chain.
+        """
+        pending: list[int] = []
+        scope = self._scope
+        if not scope.is_global() and name in scope.slots:
+            slot = scope.slots[name]
+            cell = name in scope.cells
+            if name in scope.parameters:
+                self._emit(OpCode.GET_DEREF if cell else OpCode.GET_LOCAL, slot)
+                return
+            pending.append(self._emit(OpCode.TRY_DEREF if cell else OpCode.TRY_LOCAL, slot, 0))
+
+        enclosing = scope.outer
+        while enclosing is not None and not enclosing.is_global():
+            if name in enclosing.slots:
+                index = self._free_index(scope, enclosing, name)
+                if name in enclosing.parameters:
+                    self._emit(OpCode.GET_FREE, index)
+                    break
+                pending.append(self._emit(OpCode.TRY_FREE, index, 0))
+            enclosing = enclosing.outer
+        else:
+            self._emit(OpCode.GET_GLOBAL, self._name(name))
+
+        for position in pending:
+            self._patch(position, self._here())
+
+    def _free_index(self, scope: _Scope, owner: _Scope, name: str) -> int:
+        """Threads a cell from owner down to scope and returns its free index."""
+        key = (id(owner), name)
+        index = scope.free.get(key)
+        if index is None:
+            if scope.outer is owner:
+                source = (True, owner.slots[name])
+            else:
+                source = (False, self._free_index(scope.outer, owner, name))
+            index = len(scope.free_sources)
+            scope.free_sources.append(source)
+            scope.free[key] = index
+        return index
+
+
+def _declared_names(statements: list) -> list[str]:
+    """Returns the names bound in a function body, excluding nested functions."""
+    return bound_names(statements)
+
+
+def _read_names(body: BlockStatement) -> set[str]:
+    """Returns the identifiers read in a function body, excluding nested functions."""
+    return {node.value for node in walk(body.statements) if isinstance(node, Identifier)}
+
+
+def _child_functions(body: BlockStatement) -> list[FunctionLiteral]:
+    """Returns the function literals directly nested in a function body."""
+    return [node for node in walk(body.statements) if isinstance(node, FunctionLiteral)]
+
+
+def compile_program(program: Program) -> Bytecode:
+    """Compiles a program into bytecode."""
+    return Compiler().compile(program)
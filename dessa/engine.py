@@ -0,0 +1,49 @@
+from typing import Callable
+from dessa.ast import Program
+from dessa.environment import Environment
+from dessa.evaluator import eval
+from dessa.lexer import DEFAULT_LEXER, get_lexer
+from dessa.object import Object
+from dessa.optimizer import optimize as optimize_program
+from dessa.parser import Parser
+from dessa import closure_compiler, exception_evaluator, memoizer, stack_evaluator, transpiler, vm
+
+Engine = Callable[[Program, Environment], Object | None]
+
+# The execution engines that can run a parsed program, keyed by name.
+ENGINES: dict[str, Engine] = {
+    "eval": eval,
+    "stack": stack_evaluator.run,
+    "exceptions": exception_evaluator.run,
+    "memo": memoizer.run,
+    "vm": vm.run,
+    "closures": closure_compiler.run,
+    "python": transpiler.run,
+}
+
+DEFAULT_ENGINE = "eval"
+
+
+def get_engine(name: str) -> Engine:
+    """Looks up an execution engine by name."""
+    engine = ENGINES.get(name)
+    if engine is None:
+        choices = ", ".join(sorted(ENGINES))
+        raise ValueError(f"unknown engine {name!r}, expected one of: {choices}")
+    return engine
+
+
+def run(
+    source: str,
+    env: Environment | None = None,
+    engine: str = DEFAULT_ENGINE,
+    lexer: str = DEFAULT_LEXER,
+    optimize: bool = False,
+) -> Object | None:
+    """Parses source code and runs it with the named engine."""
+    if env is None:
+        env = Environment()
+    program = Parser(get_lexer(lexer)(source)).parse_program()
+    if optimize:
+        optimize_program(program)
+    return get_engine(engine)(program, env)
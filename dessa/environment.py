@@ -1,9 +1,13 @@
 from __future__ import annotations
+from typing import Callable, TypeVar
 from dessa.object import Object
 
+T = TypeVar("T")
+
 
 class Environment:
     """Represents the environment for variable bindings."""
+    __slots__ = ("_store", "_outer", "_sessions")
 
     def __init__(self, outer: Environment | None = None):
         self._store: dict[str, Object] = {}
@@ -20,3 +24,119 @@ class Environment:
         """Sets a variable in the environment."""
         self._store[name] = value
         return value
+
+    def get_at(self, depth: int, slot: int | None, name: str) -> Object | None:
+        """Gets a variable by the lexical address assigned by the resolver."""
+        env = self
+        while depth:
+            env = env._outer
+            depth -= 1
+        if slot is not None:
+            obj = env._slots[slot]
+            if obj is not None:
+                return obj
+            # Not bound yet in its frame, so it resolves like get would.
+            env = env._outer
+            if env is None:
+                return None
+        return env.get(name)
+
+    def set_at(self, depth: int, slot: int, value: Object) -> Object:
+        """Sets a variable by the lexical address assigned by the resolver."""
+        env = self
+        while depth:
+            env = env._outer
+            depth -= 1
+        env._slots[slot] = value
+        return value
+
+    def captured(self) -> Environment:
+        """Returns the environment closed over by functions created here."""
+        return self
+
+    def bindings(self) -> dict[str, Object]:
+        """Returns every visible binding, inner scopes shadowing outer ones."""
+        visible = self._outer.bindings() if self._outer is not None else {}
+        visible.update(self._store)
+        return visible
+
+    def session(self, factory: Callable[[Environment], T]) -> T:
+        """Returns the state factory made for runs in this environment, making it on first use."""
+        # Engines keep their state here rather than in tables keyed on the
+        # environment, so it is freed together with the environment. The
+        # slot is filled lazily to keep creating environments cheap.
+        sessions: dict[Callable, object] | None = getattr(self, "_sessions", None)
+        if sessions is None:
+            sessions = self._sessions = {}
+        state = sessions.get(factory)
+        if state is None:
+            state = sessions[factory] = factory(self)
+        return state
+
+
+# Frames only need a dict for names outside their layout, which is rare.
+_NO_EXTRA_BINDINGS: dict[str, Object] = {}
+
+
+class Frame(Environment):
+    """
+    An environment for a function call that keeps its bindings in slots.
+
+    A call whose variables are captured by closures keeps those in a
+    separate frame just outside its own, which is all its closures hold on
+    to.
+    """
+    __slots__ = ("_index", "_slots")
+
+    def __init__(self, outer: Environment | None, slots: dict[str, int], values: list[Object | None]):
+        self._outer = outer
+        self._index = slots
+        self._slots = values
+        self._store = _NO_EXTRA_BINDINGS
+
+    def get(self, name: str) -> Object | None:
+        """Gets a variable from the environment."""
+        slot = self._index.get(name)
+        obj = self._slots[slot] if slot is not None else self._store.get(name)
+        if obj is None and self._outer is not None:
+            return self._outer.get(name)
+        return obj
+
+    def set(self, name: str, value: Object) -> Object:
+        """Sets a variable in the environment."""
+        slot = self._index.get(name)
+        if slot is None:
+            if self._store is _NO_EXTRA_BINDINGS:
+                self._store = {}
+            self._store[name] = value
+        else:
+            self._slots[slot] = value
+        return value
+
+    def get_local(self, slot: int, name: str) -> Object | None:
+        """Gets a variable by its slot, falling back outward while it is unbound."""
+        obj = self._slots[slot]
+        if obj is None and self._outer is not None:
+            return self._outer.get(name)
+        return obj
+
+    def slot_value(self, slot: int) -> Object | None:
+        """Returns the value in a slot of this frame, or None while it is unbound."""
+        return self._slots[slot]
+
+    def set_local(self, slot: int, value: Object) -> Object:
+        """Sets a variable by its slot."""
+        self._slots[slot] = value
+        return value
+
+    def captured(self) -> Environment:
+        """Returns the frame of captured variables, or the function's own environment."""
+        return self._outer
+
+    def bindings(self) -> dict[str, Object]:
+        visible = self._outer.bindings() if self._outer is not None else {}
+        visible.update(self._store)
+        for name, slot in self._index.items():
+            if self._slots[slot] is not None:
+                visible[name] = self._slots[slot]
+        return visible
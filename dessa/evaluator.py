@@ -1,113 +1,423 @@
+from typing import Callable
 from dessa.ast import (
     Node,
     Program,
     ExpressionStatement,
     IntegerLiteral,
+    StringLiteral,
     Boolean as astBoolean,
     PrefixExpression,
     InfixExpression,
     IfExpression,
+    WhileExpression,
+    ForExpression,
     BlockStatement,
     ReturnStatement,
     LetStatement,
     Identifier,
     FunctionLiteral,
+    CallExpression,
+    ArrayLiteral,
+    HashLiteral,
+    IndexExpression,
 )
-from dessa.environment import Environment
+from dessa.builtins import BUILTINS
+from dessa.environment import Environment, Frame
+from dessa.resolver import resolve
+from dessa.specializer import specialize
 from dessa.object import (
     Object,
     Integer,
     Boolean,
+    new_integer,
     NULL,
     TRUE,
     FALSE,
     ReturnValue,
     Error,
     Function,
+    Array,
+    Hash,
+    String,
+    Vector,
+    Builtin,
+    new_array,
+    concat,
+    numpy,
 )
-from dessa.ast import (
-    Node,
-    Program,
-    ExpressionStatement,
-    IntegerLiteral,
-    Boolean as astBoolean,
-    PrefixExpression,
-    InfixExpression,
-    IfExpression,
-    BlockStatement,
-    ReturnStatement,
-    LetStatement,
-    Identifier,
-    FunctionLiteral,
-    CallExpression,
-)
+
+NodeEvaluator = Callable[[Node, Environment], Object | None]
+
+
+class _Registry(dict):
+    """Maps node types to evaluators, resolving subclasses on first use."""
+
+    def __missing__(self, node_type: type) -> NodeEvaluator:
+        for base in node_type.__mro__[1:]:
+            if base in self:
+                evaluator = self[base]
+                break
+        else:
+            evaluator = _eval_unknown
+        self[node_type] = evaluator
+        return evaluator
+
+
+# The evaluator for each kind of AST node. Dispatch is one lookup on the
+# node's type, so new node types only need to register a handler.
+EVALUATORS: dict[type, NodeEvaluator] = _Registry()
+
+
+def register(node_type: type) -> Callable[[NodeEvaluator], NodeEvaluator]:
+    """Registers the decorated function as the evaluator for a node type."""
+
+    def decorator(evaluator: NodeEvaluator) -> NodeEvaluator:
+        EVALUATORS[node_type] = evaluator
+        return evaluator
+
+    return decorator
+
+
 def eval(node: Node, env: Environment) -> Object | None:
     """Evaluates a node in the AST."""
-    if isinstance(node, Program):
-        return _eval_program(node, env)
-    elif isinstance(node, ExpressionStatement):
-        return eval(node.expression, env)
-    elif isinstance(node, IntegerLiteral):
-        return Integer(value=node.value)
-    elif isinstance(node, astBoolean):
-        return TRUE if node.value else FALSE
-    elif isinstance(node, PrefixExpression):
-        right = eval(node.right, env)
-        if isinstance(right, Error):
-            return right
-        return _eval_prefix_expression(node.operator, right)
-    elif isinstance(node, InfixExpression):
-        left = eval(node.left, env)
-        if isinstance(left, Error):
-            return left
+    # The handlers on the call path index EVALUATORS themselves rather than
+    # calling this, which saves a Python frame per node and so lets
+    # non-tail recursion in Dessa go deeper.
+    return EVALUATORS[type(node)](node, env)
+
+
+def _eval_unknown(node: Node, env: Environment) -> None:
+    return None
+
+
+@register(ExpressionStatement)
+def _eval_expression_statement(node: ExpressionStatement, env: Environment) -> Object | None:
+    return EVALUATORS[type(node.expression)](node.expression, env)
+
+
+@register(IntegerLiteral)
+def _eval_integer_literal(node: IntegerLiteral, env: Environment) -> Object:
+    integer = node.constant
+    if integer is None:
+        integer = node.constant = new_integer(node.value)
+    return integer
+
+
+@register(StringLiteral)
+def _eval_string_literal(node: StringLiteral, env: Environment) -> Object:
+    string = node.constant
+    if string is None:
+        string = node.constant = String(node.value)
+    return string
+
+
+@register(astBoolean)
+def _eval_boolean(node: astBoolean, env: Environment) -> Object:
+    return TRUE if node.value else FALSE
+
+
+@register(PrefixExpression)
+def _eval_prefix(node: PrefixExpression, env: Environment) -> Object:
+    right = eval(node.right, env)
+    if isinstance(right, Error):
+        return right
+    return _eval_prefix_expression(node.operator, right)
+
+
+@register(InfixExpression)
+def _eval_infix(node: InfixExpression, env: Environment) -> Object:
+    left = EVALUATORS[type(node.left)](node.left, env)
+    if isinstance(left, Error):
+        return left
+    right = EVALUATORS[type(node.right)](node.right, env)
+    if isinstance(right, Error):
+        return right
+    if type(left) is Integer and type(right) is Integer:
+        specialized = _INTEGER_INFIX_NODES.get(node.operator)
+        if specialized is not None:
+            node.__class__ = specialized
+    return _eval_infix_expression(node.operator, left, right)
+
+
+def _deoptimize_infix(node: InfixExpression, left: Object, right: Object | None, env: Environment) -> Object:
+    """Turns a specialized infix node back into a generic one and finishes evaluating it."""
+    node.__class__ = InfixExpression
+    if isinstance(left, Error):
+        return left
+    if right is None:
         right = eval(node.right, env)
-        if isinstance(right, Error):
-            return right
-        return _eval_infix_expression(node.operator, left, right)
-    elif isinstance(node, IfExpression):
-        return _eval_if_expression(node, env)
-    elif isinstance(node, BlockStatement):
-        return _eval_block_statement(node, env)
-    elif isinstance(node, ReturnStatement):
-        val = eval(node.return_value, env)
-        if isinstance(val, Error):
-            return val
-        return ReturnValue(value=val)
-    elif isinstance(node, LetStatement):
-        val = eval(node.value, env)
-        if isinstance(val, Error):
-            return val
-        env.set(node.name.value, val)
-    elif isinstance(node, Identifier):
-        val = env.get(node.value)
-        if val is None:
-            return new_error(f"identifier not found: {node.value}")
+    if isinstance(right, Error):
+        return right
+    return _eval_infix_expression(node.operator, left, right)
+
+
+def _integer_infix_node(operator: str, compute: Callable[[int, int], Object]) -> type:
+    """Creates the node type an infix expression becomes once its operands are Integers."""
+
+    class IntegerInfixExpression(InfixExpression):
+        """An InfixExpression specialized for two Integer operands."""
+
+    def evaluate(node: InfixExpression, env: Environment) -> Object:
+        left = EVALUATORS[type(node.left)](node.left, env)
+        if type(left) is not Integer:
+            return _deoptimize_infix(node, left, None, env)
+        right = EVALUATORS[type(node.right)](node.right, env)
+        if type(right) is not Integer:
+            return _deoptimize_infix(node, left, right, env)
+        return compute(left.value, right.value)
+
+    IntegerInfixExpression.__qualname__ = f"IntegerInfixExpression[{operator}]"
+    register(IntegerInfixExpression)(evaluate)
+    return IntegerInfixExpression
+
+
+# Infix nodes rewrite themselves into these once they have seen two Integer
+# operands, skipping the type comparison and the operator dispatch.
+_INTEGER_INFIX_NODES: dict[str, type] = {
+    operator: _integer_infix_node(operator, compute)
+    for operator, compute in {
+        "+": lambda a, b: new_integer(a + b),
+        "-": lambda a, b: new_integer(a - b),
+        "*": lambda a, b: new_integer(a * b),
+        "/": lambda a, b: new_integer(a // b),
+        "<": lambda a, b: TRUE if a < b else FALSE,
+        ">": lambda a, b: TRUE if a > b else FALSE,
+        "==": lambda a, b: TRUE if a == b else FALSE,
+        "!=": lambda a, b: TRUE if a != b else FALSE,
+    }.items()
+}
+
+
+@register(ReturnStatement)
+def _eval_return_statement(node: ReturnStatement, env: Environment) -> Object:
+    val = eval(node.return_value, env)
+    if isinstance(val, Error) or type(val) is _TailCall:
         return val
-    elif isinstance(node, FunctionLiteral):
-        params = node.parameters
-        body = node.body
-        return Function(parameters=params, body=body, env=env)
-    elif isinstance(node, CallExpression):
-        function = eval(node.function, env)
-        if isinstance(function, Error):
-            return function
-        args = _eval_expressions(node.arguments, env)
-        if len(args) == 1 and isinstance(args[0], Error):
-            return args[0]
-        return _apply_function(function, args)
+    return ReturnValue(value=val)
+
+
+@register(LetStatement)
+def _eval_let_statement(node: LetStatement, env: Environment) -> Object | None:
+    val = eval(node.value, env)
+    if isinstance(val, Error):
+        return val
+    _bind(node.name, val, env)
     return None
+
+
+def _bind(name: Identifier, val: Object, env: Environment) -> None:
+    """Binds a name at the address the resolver gave it."""
+    if name.slot is None:
+        env.set(name.value, val)
+    elif name.depth:
+        env.set_at(name.depth, name.slot, val)
+    else:
+        env.set_local(name.slot, val)
+
+
+@register(Identifier)
+def _eval_identifier(node: Identifier, env: Environment) -> Object:
+    if not node.depth:
+        if node.slot is not None:
+            node.__class__ = _LocalIdentifier
+            val = env.get_local(node.slot, node.value)
+        else:
+            node.__class__ = _NamedIdentifier
+            val = env.get(node.value)
+    else:
+        val = env.get_at(node.depth, node.slot, node.value)
+    if val is None:
+        return _unbound(node.value)
+    return val
+
+
+def _unbound(name: str) -> Object:
+    """Returns the builtin a name nothing binds refers to, or an error."""
+    builtin = BUILTINS.get(name)
+    if builtin is None:
+        return new_error(f"identifier not found: {name}")
+    return builtin
+
+
+class _LocalIdentifier(Identifier):
+    """An Identifier specialized to read a slot of the current frame."""
+
+
+class _NamedIdentifier(Identifier):
+    """An Identifier specialized to look its name up in the environment."""
+
+
+@register(_LocalIdentifier)
+def _eval_local_identifier(node: Identifier, env: Environment) -> Object:
+    val = env._slots[node.slot]
+    if val is None:
+        # Not bound in this frame yet, so it has to be looked up outward.
+        node.__class__ = Identifier
+        val = env.get_local(node.slot, node.value)
+        if val is None:
+            return _unbound(node.value)
+    return val
+
+
+@register(_NamedIdentifier)
+def _eval_named_identifier(node: Identifier, env: Environment) -> Object:
+    val = env.get(node.value)
+    if val is None:
+        return _unbound(node.value)
+    return val
+
+
+@register(FunctionLiteral)
+def _eval_function_literal(node: FunctionLiteral, env: Environment) -> Object:
+    env = env.captured()
+    return Function(
+        parameters=node.parameters,
+        body=node.body if node.constants is None else specialize(node, env),
+        env=env,
+        slots=node.slots,
+        cells=node.cells,
+        padding=node.padding,
+    )
+
+
+@register(CallExpression)
+def _eval_call_expression(node: CallExpression, env: Environment) -> Object | None:
+    function = EVALUATORS[type(node.function)](node.function, env)
+    if type(function) is Function:
+        node.__class__ = _FunctionCallExpression
+    return _finish_call_expression(node, function, env)
+
+
+def _finish_call_expression(node: CallExpression, function: Object, env: Environment) -> Object | None:
+    """Evaluates the arguments of a call and applies its evaluated function."""
+    if isinstance(function, Error):
+        return function
+    args = _eval_expressions(node.arguments, env)
+    if len(args) == 1 and isinstance(args[0], Error):
+        return args[0]
+    if node.tail:
+        return _TailCall(function, args)
+    return _apply_function(function, args)
+
+
+class _FunctionCallExpression(CallExpression):
+    """A CallExpression specialized for calling a Function."""
+
+
+@register(_FunctionCallExpression)
+def _eval_function_call_expression(node: CallExpression, env: Environment) -> Object | None:
+    function = EVALUATORS[type(node.function)](node.function, env)
+    if type(function) is not Function:
+        node.__class__ = CallExpression
+        return _finish_call_expression(node, function, env)
+    args = []
+    for argument in node.arguments:
+        value = EVALUATORS[type(argument)](argument, env)
+        if isinstance(value, Error):
+            return value
+        args.append(value)
+    cache = node.cache
+    if cache is None or cache.body is not function.body:
+        cache = node.cache = _CallCache(function, len(args))
+    if cache.error is not None:
+        return cache.error
+    if node.tail:
+        return _TailCall(function, args)
+    if cache.padding is None:
+        extended_env = _extend_function_env(function, args)
+    else:
+        if cache.trim:
+            del args[cache.arity:]
+        args += cache.padding
+        extended_env = Frame(function.env, function.slots, args)
+    evaluated = EVALUATORS[type(function.body)](function.body, extended_env)
+    if type(evaluated) is _TailCall:
+        return _apply_function(evaluated.fn, evaluated.args)
+    if isinstance(evaluated, ReturnValue):
+        return evaluated.value
+    return evaluated
+
+
+class _CallCache:
+    """
+    A call site's monomorphic inline cache.
+
+    Functions made from the same literal share a body, so the cache holds
+    for any of them: its arity is checked once, and when their frames
+    cannot escape, the evaluated arguments become the frame's values
+    directly.
+    """
+    __slots__ = ("body", "arity", "error", "trim", "padding")
+
+    def __init__(self, fn: Function, argc: int) -> None:
+        self.body = fn.body
+        self.arity = len(fn.parameters)
+        self.error = _check_arity(fn, argc)
+        self.trim = argc > self.arity
+        self.padding = fn.padding
+
+
+class _TailCall(ReturnValue):
+    """
+    A call in tail position, handed back to the caller's _apply_function.
+
+    It is a ReturnValue so blocks stop at it and pass it outward like a
+    return.
+    """
+    __slots__ = ("fn", "args")
+
+    def __init__(self, fn: Object, args: list[Object]) -> None:
+        super().__init__(value=None)
+        self.fn = fn
+        self.args = args
+
+
 def _apply_function(fn: Object, args: list[Object]) -> Object:
     """Applies a function to a list of arguments."""
-    if not isinstance(fn, Function):
-        return new_error(f"not a function: {fn.object_type()}")
+    while True:
+        if type(fn) is Builtin:
+            return fn.fn(args, _apply_function)
+        if not isinstance(fn, Function):
+            return new_error(f"not a function: {fn.object_type()}")
+        error = _check_arity(fn, len(args))
+        if error is not None:
+            return error
+
+        extended_env = _extend_function_env(fn, args)
+        evaluated = EVALUATORS[type(fn.body)](fn.body, extended_env)
+        if type(evaluated) is not _TailCall:
+            return _unwrap_return_value(evaluated)
+        # Run the tail call in this loop instead of nesting Python frames.
+        fn, args = evaluated.fn, evaluated.args
 
-    extended_env = _extend_function_env(fn, args)
-    evaluated = eval(fn.body, extended_env)
-    return _unwrap_return_value(evaluated)
+
+def _check_arity(fn: Function, argc: int) -> Error | None:
+    """Returns an error if a function is called with too few arguments."""
+    if argc < len(fn.parameters):
+        return new_error(f"wrong number of arguments: want={len(fn.parameters)}, got={argc}")
+    return None
 
 
 def _extend_function_env(fn: Function, args: list[Object]) -> Environment:
-    """Extends the environment for a function call."""
+    """Extends the environment for a function call, taking over the argument list."""
+    if fn.padding is not None:
+        del args[len(fn.parameters):]
+        args += fn.padding
+        return Frame(fn.env, fn.slots, args)
+    if fn.slots is not None:
+        values: list[Object | None] = [None] * len(fn.slots)
+        if not fn.cells:
+            for i, param in enumerate(fn.parameters):
+                values[fn.slots[param.value]] = args[i]
+            return Frame(fn.env, fn.slots, values)
+        cells: list[Object | None] = [None] * len(fn.cells)
+        for i, param in enumerate(fn.parameters):
+            slot = fn.slots.get(param.value)
+            if slot is not None:
+                values[slot] = args[i]
+            else:
+                cells[fn.cells[param.value]] = args[i]
+        return Frame(Frame(fn.env, fn.cells, cells), fn.slots, values)
     env = Environment(outer=fn.env)
     for i, param in enumerate(fn.parameters):
         env.set(param.value, args[i])
@@ -127,7 +437,7 @@ def _eval_expressions(
     """Evaluates a list of expressions."""
     result = []
     for expression in expressions:
-        evaluated = eval(expression, env)
+        evaluated = EVALUATORS[type(expression)](expression, env)
         if isinstance(evaluated, Error):
             return [evaluated]
         result.append(evaluated)
@@ -139,11 +449,14 @@ def new_error(message: str, *args) -> Error:
     return Error(message=message.format(*args))
 
 
+@register(Program)
 def _eval_program(program: Program, env: Environment) -> Object | None:
     """Evaluates a program."""
+    if not program.resolved:
+        resolve(program)
     result: Object | None = None
     for statement in program.statements:
-        result = eval(statement, env)
+        result = EVALUATORS[type(statement)](statement, env)
         if isinstance(result, ReturnValue):
             return result.value
         elif isinstance(result, Error):
@@ -151,11 +464,12 @@ def _eval_program(program: Program, env: Environment) -> Object | None:
     return result
 
 
+@register(BlockStatement)
 def _eval_block_statement(block: BlockStatement, env: Environment) -> Object | None:
     """Evaluates a block statement."""
     result: Object | None = None
     for statement in block.statements:
-        result = eval(statement, env)
+        result = EVALUATORS[type(statement)](statement, env)
         if result is not None and (
             isinstance(result, ReturnValue) or isinstance(result, Error)
         ):
@@ -174,31 +488,41 @@ def _eval_prefix_expression(operator: str, right: Object | None) -> Object:
 
 def _eval_infix_expression(operator: str, left: Object | None, right: Object | None) -> Object:
     """Evaluates an infix expression."""
-    if left.object_type() != right.object_type():
-        return new_error(
-            f"type mismatch: {left.object_type()} {operator} {right.object_type()}"
-        )
-    if isinstance(left, Integer) and isinstance(right, Integer):
+    if type(left) is Integer and type(right) is Integer:
         return _eval_integer_infix_expression(operator, left, right)
+    if type(left) is Vector or type(right) is Vector:
+        return _eval_vector_infix_expression(operator, left, right)
+    left_type = left.object_type()
+    right_type = right.object_type()
+    if left_type != right_type:
+        return new_error(f"type mismatch: {left_type} {operator} {right_type}")
+    elif operator == "+" and type(left) is String:
+        return concat(left, right)
     elif operator == "==":
-        return TRUE if left is right else FALSE
+        return TRUE if _equal(left, right) else FALSE
     elif operator == "!=":
-        return TRUE if left is not right else FALSE
-    return new_error(
-        f"unknown operator: {left.object_type()} {operator} {right.object_type()}"
-    )
+        return FALSE if _equal(left, right) else TRUE
+    return new_error(f"unknown operator: {left_type} {operator} {right_type}")
+
+
+def _equal(left: Object, right: Object) -> bool:
+    """Compares two objects of the same type: by hash key if they have one, otherwise by identity."""
+    if left is right:
+        return True
+    key = left.hash_key()
+    return key is not None and key == right.hash_key()
 
 
 def _eval_integer_infix_expression(operator: str, left: Integer, right: Integer) -> Object:
     """Evaluates an integer infix expression."""
     if operator == "+":
-        return Integer(value=left.value + right.value)
+        return new_integer(left.value + right.value)
     elif operator == "-":
-        return Integer(value=left.value - right.value)
+        return new_integer(left.value - right.value)
     elif operator == "*":
-        return Integer(value=left.value * right.value)
+        return new_integer(left.value * right.value)
     elif operator == "/":
-        return Integer(value=left.value // right.value)
+        return new_integer(left.value // right.value)
     elif operator == "<":
         return TRUE if left.value < right.value else FALSE
     elif operator == ">":
@@ -210,19 +534,160 @@ def _eval_integer_infix_expression(operator: str, left: Integer, right: Integer)
     return new_error(f"unknown operator: INTEGER {operator} INTEGER")
 
 
+# The NumPy function applying each infix operator to vectors elementwise.
+_VECTOR_OPERATIONS = {} if numpy is None else {
+    "+": numpy.add,
+    "-": numpy.subtract,
+    "*": numpy.multiply,
+    "/": numpy.floor_divide,
+    "<": numpy.less,
+    ">": numpy.greater,
+    "==": numpy.equal,
+    "!=": numpy.not_equal,
+}
+
+
+def _eval_vector_infix_expression(operator: str, left: Object, right: Object) -> Object:
+    """Evaluates an infix expression on a vector and a vector or an integer, elementwise."""
+    operands = []
+    for operand in (left, right):
+        if type(operand) is Vector:
+            operands.append(operand.values)
+        elif type(operand) is Integer:
+            try:
+                operands.append(numpy.int64(operand.value))
+            except OverflowError:
+                return new_error(f"integer too large for a vector: {operand.value}")
+        else:
+            return new_error(f"type mismatch: {left.object_type()} {operator} {right.object_type()}")
+    left_values, right_values = operands
+    if left_values.shape and right_values.shape and len(left_values) != len(right_values):
+        return new_error(f"vector lengths differ: {len(left_values)} {operator} {len(right_values)}")
+    if operator == "/" and not right_values.all():
+        return new_error("division by zero")
+    values = _VECTOR_OPERATIONS[operator](left_values, right_values)
+    return Vector(values if values.dtype == numpy.int64 else values.astype(numpy.int64))
+
+
+@register(IfExpression)
 def _eval_if_expression(if_expression: IfExpression, env: Environment) -> Object | None:
     """Evaluates an if expression."""
-    condition = eval(if_expression.condition, env)
+    condition = EVALUATORS[type(if_expression.condition)](if_expression.condition, env)
     if isinstance(condition, Error):
         return condition
     if _is_truthy(condition):
-        return eval(if_expression.consequence, env)
+        return EVALUATORS[type(if_expression.consequence)](if_expression.consequence, env)
     elif if_expression.alternative:
-        return eval(if_expression.alternative, env)
+        return EVALUATORS[type(if_expression.alternative)](if_expression.alternative, env)
     else:
         return NULL
 
 
+@register(WhileExpression)
+def _eval_while_expression(node: WhileExpression, env: Environment) -> Object | None:
+    """Evaluates a while expression in the environment around it."""
+    while True:
+        condition = eval(node.condition, env)
+        if isinstance(condition, Error):
+            return condition
+        if not _is_truthy(condition):
+            return NULL
+        result = eval(node.body, env)
+        if isinstance(result, ReturnValue) or isinstance(result, Error):
+            return result
+
+
+@register(ForExpression)
+def _eval_for_expression(node: ForExpression, env: Environment) -> Object | None:
+    """Evaluates a for expression, rebinding its name in the environment around it."""
+    start = eval(node.start, env) if node.start else new_integer(0)
+    if isinstance(start, Error):
+        return start
+    stop = eval(node.stop, env)
+    if isinstance(stop, Error):
+        return stop
+    bounds = _eval_range(start, stop)
+    if type(bounds) is Error:
+        return bounds
+    name, body = node.name, node.body
+    for value in bounds:
+        _bind(name, new_integer(value), env)
+        result = eval(body, env)
+        if isinstance(result, ReturnValue) or isinstance(result, Error):
+            return result
+    return NULL
+
+
+def _eval_range(start: Object | None, stop: Object | None) -> range | Error:
+    """Returns the integers a for expression counts through."""
+    for bound in (start, stop):
+        if type(bound) is not Integer:
+            return new_error(f"range bounds must be INTEGER, got {bound.object_type()}")
+    return range(start.value, stop.value)
+
+
+@register(ArrayLiteral)
+def _eval_array_literal(node: ArrayLiteral, env: Environment) -> Object:
+    elements = _eval_expressions(node.elements, env)
+    if len(elements) == 1 and isinstance(elements[0], Error):
+        return elements[0]
+    return new_array(elements)
+
+
+@register(HashLiteral)
+def _eval_hash_literal(node: HashLiteral, env: Environment) -> Object:
+    items = _eval_expressions([child for pair in node.pairs for child in pair], env)
+    if len(items) == 1 and isinstance(items[0], Error):
+        return items[0]
+    return _new_hash(items)
+
+
+def _new_hash(items: list[Object]) -> Object:
+    """Builds a hash from alternating keys and values; a later equal key replaces an earlier one."""
+    pairs = {}
+    for i in range(0, len(items), 2):
+        key = items[i]
+        hash_key = key.hash_key()
+        if hash_key is None:
+            return new_error(f"unusable as hash key: {key.object_type()}")
+        pairs[hash_key] = (key, items[i + 1])
+    return Hash(pairs)
+
+
+@register(IndexExpression)
+def _eval_index(node: IndexExpression, env: Environment) -> Object:
+    left = eval(node.left, env)
+    if isinstance(left, Error):
+        return left
+    index = eval(node.index, env)
+    if isinstance(index, Error):
+        return index
+    return _eval_index_expression(left, index)
+
+
+def _eval_index_expression(left: Object | None, index: Object | None) -> Object:
+    """Evaluates an index expression; indexes past either end of an array and missing keys give null."""
+    if type(left) is Array:
+        if type(index) is not Integer:
+            return new_error(f"array index must be INTEGER, got {index.object_type()}")
+        if 0 <= index.value < len(left):
+            return left.get(index.value)
+        return NULL
+    if type(left) is Vector:
+        if type(index) is not Integer:
+            return new_error(f"vector index must be INTEGER, got {index.object_type()}")
+        if 0 <= index.value < len(left):
+            return new_integer(int(left.values[index.value]))
+        return NULL
+    if type(left) is Hash:
+        key = index.hash_key()
+        if key is None:
+            return new_error(f"unusable as hash key: {index.object_type()}")
+        pair = left.pairs.get(key)
+        return NULL if pair is None else pair[1]
+    return new_error(f"index operator not supported: {left.object_type()}")
+
+
 def _is_truthy(obj: Object | None) -> bool:
     """Checks if an object is truthy."""
     if obj is NULL:
@@ -251,4 +716,4 @@ def _eval_minus_prefix_operator_expression(right: Object | None) -> Object:
     """Evaluates a minus prefix operator expression."""
     if not isinstance(right, Integer):
         return new_error(f"unknown operator: -{right.object_type()}")
-    return Integer(value=-right.value)
+    return new_integer(-right.value)
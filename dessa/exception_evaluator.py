@@ -0,0 +1,316 @@
+from dessa.ast import (
+    Node,
+    Program,
+    ExpressionStatement,
+    IntegerLiteral,
+    StringLiteral,
+    Boolean as astBoolean,
+    PrefixExpression,
+    InfixExpression,
+    IfExpression,
+    WhileExpression,
+    ForExpression,
+    BlockStatement,
+    ReturnStatement,
+    LetStatement,
+    Identifier,
+    FunctionLiteral,
+    CallExpression,
+    ArrayLiteral,
+    HashLiteral,
+    IndexExpression,
+)
+from dessa.environment import Environment
+from dessa.evaluator import (
+    NodeEvaluator,
+    new_error,
+    _Registry,
+    _TailCall,
+    _bind,
+    _unbound,
+    _check_arity,
+    _eval_boolean,
+    _eval_function_literal,
+    _eval_integer_literal,
+    _eval_string_literal,
+    _eval_integer_infix_expression,
+    _eval_infix_expression,
+    _eval_prefix_expression,
+    _eval_range,
+    _eval_index_expression,
+    _extend_function_env,
+    _new_hash,
+)
+from dessa.object import (
+    Object,
+    Integer,
+    new_integer,
+    ReturnValue,
+    Error,
+    Function,
+    Builtin,
+    new_array,
+    NULL,
+    FALSE,
+)
+from dessa.resolver import resolve
+
+
+class _Abort(Exception):
+    """Unwinds to the program boundary with a Dessa runtime error."""
+
+    def __init__(self, error: Error) -> None:
+        self.error = error
+
+
+class _Return(Exception):
+    """Unwinds to the enclosing function with the value of a return."""
+
+    def __init__(self, value: Object | None, wrapper: ReturnValue | None = None) -> None:
+        self.value = value
+        self.wrapper = wrapper  # The ReturnValue being unwound, if one exists
+
+
+# The evaluator for each kind of AST node in this mode.
+EVALUATORS: dict[type, NodeEvaluator] = _Registry()
+EVALUATORS.update({
+    IntegerLiteral: _eval_integer_literal,
+    StringLiteral: _eval_string_literal,
+    astBoolean: _eval_boolean,
+    FunctionLiteral: _eval_function_literal,
+})
+
+
+def register(node_type: type):
+    """Registers the decorated function as the evaluator for a node type."""
+
+    def decorator(evaluator: NodeEvaluator) -> NodeEvaluator:
+        EVALUATORS[node_type] = evaluator
+        return evaluator
+
+    return decorator
+
+
+def run(program: Program, env: Environment) -> Object | None:
+    """
+    Evaluates a program, propagating errors and returns as exceptions.
+
+    Errors unwind straight to the program and returns to their function,
+    so nodes do not check the values of their children. Results and
+    errors are the same as dessa.evaluator.eval.
+    """
+    if not program.resolved:
+        resolve(program)
+    result: Object | None = None
+    try:
+        for statement in program.statements:
+            result = eval(statement, env)
+            if isinstance(result, ReturnValue):
+                return result.value
+    except _Return as unwound:
+        return unwound.value
+    except _Abort as abort:
+        return abort.error
+    return result
+
+
+def eval(node: Node, env: Environment) -> Object | None:
+    """Evaluates a node, raising instead of returning errors and returns."""
+    return EVALUATORS[type(node)](node, env)
+
+
+@register(ExpressionStatement)
+def _eval_expression_statement(node: ExpressionStatement, env: Environment) -> Object | None:
+    expression = node.expression
+    statement = _STATEMENTS.get(type(expression))
+    if statement is not None:
+        # A return in an if or a loop used as a statement unwinds past it.
+        return statement(expression, env)
+    return EVALUATORS[type(expression)](expression, env)
+
+
+@register(BlockStatement)
+def _eval_block_statement(block: BlockStatement, env: Environment) -> Object | None:
+    result: Object | None = None
+    for statement in block.statements:
+        result = EVALUATORS[type(statement)](statement, env)
+        if type(result) is ReturnValue:
+            # A return value held in a variable still returns when used as
+            # a statement.
+            raise _Return(result.value, result)
+    return result
+
+
+@register(IfExpression)
+def _eval_if_expression(node: IfExpression, env: Environment) -> Object | None:
+    try:
+        return _eval_if_statement(node, env)
+    except _Return as unwound:
+        return _returned_value(unwound)
+
+
+@register(WhileExpression)
+def _eval_while_expression(node: WhileExpression, env: Environment) -> Object | None:
+    try:
+        return _eval_while_statement(node, env)
+    except _Return as unwound:
+        return _returned_value(unwound)
+
+
+@register(ForExpression)
+def _eval_for_expression(node: ForExpression, env: Environment) -> Object | None:
+    try:
+        return _eval_for_statement(node, env)
+    except _Return as unwound:
+        return _returned_value(unwound)
+
+
+def _returned_value(unwound: _Return) -> ReturnValue:
+    """Returns the value an if or a loop used as a value evaluates to when its body returns."""
+    if unwound.wrapper is not None:
+        return unwound.wrapper
+    return ReturnValue(value=unwound.value)
+
+
+def _eval_if_statement(node: IfExpression, env: Environment) -> Object | None:
+    condition = eval(node.condition, env)
+    if condition is not NULL and condition is not FALSE:
+        return _eval_block_statement(node.consequence, env)
+    elif node.alternative:
+        return _eval_block_statement(node.alternative, env)
+    return NULL
+
+
+def _eval_while_statement(node: WhileExpression, env: Environment) -> Object:
+    condition, body = node.condition, node.body
+    while True:
+        value = eval(condition, env)
+        if value is NULL or value is FALSE:
+            return NULL
+        _eval_block_statement(body, env)
+
+
+def _eval_for_statement(node: ForExpression, env: Environment) -> Object:
+    start = eval(node.start, env) if node.start else new_integer(0)
+    bounds = _eval_range(start, eval(node.stop, env))
+    if type(bounds) is Error:
+        raise _Abort(bounds)
+    name, body = node.name, node.body
+    for value in bounds:
+        _bind(name, new_integer(value), env)
+        _eval_block_statement(body, env)
+    return NULL
+
+
+# The ifs and loops whose returns unwind past them when used as statements.
+_STATEMENTS = {
+    IfExpression: _eval_if_statement,
+    WhileExpression: _eval_while_statement,
+    ForExpression: _eval_for_statement,
+}
+
+
+@register(ReturnStatement)
+def _eval_return_statement(node: ReturnStatement, env: Environment) -> None:
+    raise _Return(eval(node.return_value, env))
+
+
+@register(LetStatement)
+def _eval_let_statement(node: LetStatement, env: Environment) -> None:
+    value = eval(node.value, env)
+    name = node.name
+    if name.slot is None:
+        env.set(name.value, value)
+    elif name.depth:
+        env.set_at(name.depth, name.slot, value)
+    else:
+        env.set_local(name.slot, value)
+
+
+@register(Identifier)
+def _eval_identifier(node: Identifier, env: Environment) -> Object:
+    if not node.depth:
+        if node.slot is not None:
+            value = env.get_local(node.slot, node.value)
+        else:
+            value = env.get(node.value)
+    else:
+        value = env.get_at(node.depth, node.slot, node.value)
+    if value is None:
+        value = _unbound(node.value)
+        if type(value) is Error:
+            raise _Abort(value)
+    return value
+
+
+@register(PrefixExpression)
+def _eval_prefix(node: PrefixExpression, env: Environment) -> Object:
+    result = _eval_prefix_expression(node.operator, eval(node.right, env))
+    if type(result) is Error:
+        raise _Abort(result)
+    return result
+
+
+@register(InfixExpression)
+def _eval_infix(node: InfixExpression, env: Environment) -> Object:
+    left = eval(node.left, env)
+    right = eval(node.right, env)
+    if type(left) is Integer and type(right) is Integer:
+        return _eval_integer_infix_expression(node.operator, left, right)
+    result = _eval_infix_expression(node.operator, left, right)
+    if type(result) is Error:
+        raise _Abort(result)
+    return result
+
+
+@register(ArrayLiteral)
+def _eval_array_literal(node: ArrayLiteral, env: Environment) -> Object:
+    return new_array([eval(element, env) for element in node.elements])
+
+
+@register(HashLiteral)
+def _eval_hash_literal(node: HashLiteral, env: Environment) -> Object:
+    result = _new_hash([eval(child, env) for pair in node.pairs for child in pair])
+    if type(result) is Error:
+        raise _Abort(result)
+    return result
+
+
+@register(IndexExpression)
+def _eval_index(node: IndexExpression, env: Environment) -> Object:
+    result = _eval_index_expression(eval(node.left, env), eval(node.index, env))
+    if type(result) is Error:
+        raise _Abort(result)
+    return result
+
+
+@register(CallExpression)
+def _eval_call_expression(node: CallExpression, env: Environment) -> Object | None:
+    function = eval(node.function, env)
+    args = [eval(argument, env) for argument in node.arguments]
+    if node.tail:
+        return _TailCall(function, args)
+    return _apply_function(function, args)
+
+
+def _apply_function(fn: Object, args: list[Object]) -> Object | None:
+    """Applies a function, catching the returns that unwind out of its body."""
+    while True:
+        if type(fn) is Builtin:
+            result = fn.fn(args, _apply_function)
+            if type(result) is Error:
+                raise _Abort(result)
+            return result
+        if not isinstance(fn, Function):
+            raise _Abort(new_error(f"not a function: {fn.object_type()}"))
+        error = _check_arity(fn, len(args))
+        if error is not None:
+            raise _Abort(error)
+        env = _extend_function_env(fn, args)
+        try:
+            result = _eval_block_statement(fn.body, env)
+        except _Return as unwound:
+            result = unwound.value
+        if type(result) is not _TailCall:
+            return result
+        fn, args = result.fn, result.args
@@ -0,0 +1,208 @@
+from dessa.ast import (
+    Node,
+    Program,
+    Statement,
+    Expression,
+    ExpressionStatement,
+    IntegerLiteral,
+    Boolean,
+    PrefixExpression,
+    InfixExpression,
+    IfExpression,
+    WhileExpression,
+    ForExpression,
+    ReturnStatement,
+    LetStatement,
+    Identifier,
+    FunctionLiteral,
+    CallExpression,
+    ArrayLiteral,
+    HashLiteral,
+    IndexExpression,
+    bound_names,
+    children,
+)
+from dessa.object import ObjectType, VECTORS_AVAILABLE
+
+INTEGER: ObjectType = "INTEGER"
+BOOLEAN: ObjectType = "BOOLEAN"
+
+# Operators that fail unless both operands are integers. `+` also
+# concatenates strings, so it only proves an operand is an integer when
+# the other one is.
+_ARITHMETIC_OPERATORS = {"+", "-", "*", "/"}
+_INTEGER_OPERATORS = {"-", "*", "/", "<", ">"}
+
+# The types known at a point of a function body or the top level, by name.
+_Facts = dict[str, ObjectType]
+
+
+class TypeInferrer:
+    """
+    Proves which operands of prefix and infix expressions are integers
+    or booleans.
+
+    Facts about the names of a function body (or the top level) are
+    gathered in evaluation order: a let binds its name to the type of its
+    value, and since a failed operation aborts the program, a name is an
+    integer from the moment it was an operand of an operation that only
+    accepts integers, such as `n < 2`. When NumPy is installed, infix
+    operators also accept vectors, so only `-n` and range bounds prove
+    it. A nested function cannot rebind
+    the names of the function around it, so facts only change at lets.
+    Where control flow merges, only the facts every path agrees on are
+    kept; a block can also be left early by a return, or by a statement
+    that evaluates to a return value, so each of those points counts as
+    a path out of it.
+
+    Expressions whose operands are proven get their `operand_type` set,
+    which lets the compilers drop the runtime type checks on them.
+    """
+
+    def infer(self, program: Program) -> Program:
+        """Annotates the program in place and returns it."""
+        self._block(program.statements, {})
+        return program
+
+    def _block(self, statements: list[Statement], facts: _Facts) -> tuple[_Facts, ObjectType | None]:
+        """
+        Infers a block's statements, returning the facts that hold wherever
+        it is left and the proven type of its value.
+        """
+        exits: list[_Facts] = []
+        value: ObjectType | None = None
+        for statement in statements:
+            value = None
+            if isinstance(statement, ReturnStatement):
+                self._expression(statement.return_value, facts)
+                exits.append(facts)
+                return _meet(exits), None
+            elif isinstance(statement, LetStatement):
+                bound = self._expression(statement.value, facts)
+                if bound is None:
+                    facts.pop(statement.name.value, None)
+                else:
+                    facts[statement.name.value] = bound
+            elif isinstance(statement, ExpressionStatement):
+                value = self._expression(statement.expression, facts)
+                if value is None:
+                    # It may evaluate to a return value, which ends the block.
+                    exits.append(dict(facts))
+        if exits:
+            value = None
+        exits.append(facts)
+        return _meet(exits), value
+
+    def _expression(self, node: Expression | None, facts: _Facts) -> ObjectType | None:
+        """Infers an expression, refining the facts, and returns its type if it is proven."""
+        if isinstance(node, IntegerLiteral):
+            return INTEGER
+        elif isinstance(node, Boolean):
+            return BOOLEAN
+        elif isinstance(node, Identifier):
+            return facts.get(node.value)
+        elif isinstance(node, PrefixExpression):
+            right = self._expression(node.right, facts)
+            if node.operator == "!":
+                return BOOLEAN
+            if node.operator == "-":
+                node.operand_type = INTEGER if right == INTEGER else None
+                _refine(node.right, INTEGER, facts)
+                return INTEGER
+        elif isinstance(node, InfixExpression):
+            return self._infix_expression(node, facts)
+        elif isinstance(node, IfExpression):
+            return self._if_expression(node, facts)
+        elif isinstance(node, (WhileExpression, ForExpression)):
+            self._loop(node, facts)
+        elif isinstance(node, FunctionLiteral):
+            # The body runs later, when nothing is known about the caller.
+            self._block(node.body.statements, {})
+        elif isinstance(node, CallExpression):
+            self._expression(node.function, facts)
+            for argument in node.arguments:
+                self._expression(argument, facts)
+        elif isinstance(node, (ArrayLiteral, HashLiteral)):
+            for child in children(node):
+                self._expression(child, facts)
+        elif isinstance(node, IndexExpression):
+            self._expression(node.left, facts)
+            self._expression(node.index, facts)
+        return None
+
+    def _infix_expression(self, node: InfixExpression, facts: _Facts) -> ObjectType | None:
+        left = self._expression(node.left, facts)
+        right = self._expression(node.right, facts)
+        if node.operator in _INTEGER_OPERATORS:
+            operand = INTEGER
+        elif node.operator == "+":
+            operand = INTEGER if INTEGER in (left, right) else None
+        elif node.operator in ("==", "!="):
+            # Operands of different types are a type mismatch.
+            operand = left or right
+        else:
+            return None
+        node.operand_type = operand if left == right == operand else None
+        if operand == INTEGER and node.operand_type is None and VECTORS_AVAILABLE:
+            # An operand that is not proven may be a vector, which these
+            # operators also accept and which makes the result a vector.
+            return None
+        if operand is not None:
+            if not bound_names([node.right]):
+                # The left operand still holds the value it was read with.
+                _refine(node.left, operand, facts)
+            _refine(node.right, operand, facts)
+        if node.operator in _ARITHMETIC_OPERATORS:
+            return operand
+        return BOOLEAN
+
+    def _if_expression(self, node: IfExpression, facts: _Facts) -> ObjectType | None:
+        self._expression(node.condition, facts)
+        consequence, value = self._block(node.consequence.statements, dict(facts))
+        if node.alternative:
+            alternative, other = self._block(node.alternative.statements, dict(facts))
+        else:
+            alternative, other = dict(facts), None
+        merged = _meet([consequence, alternative])
+        facts.clear()
+        facts.update(merged)
+        return value if value == other else None
+
+    def _loop(self, node: WhileExpression | ForExpression, facts: _Facts) -> None:
+        if isinstance(node, ForExpression):
+            # Both bounds are evaluated before either is checked.
+            if node.start:
+                self._expression(node.start, facts)
+            self._expression(node.stop, facts)
+            if node.start and not bound_names([node.stop]):
+                _refine(node.start, INTEGER, facts)
+            _refine(node.stop, INTEGER, facts)
+        # The names a loop binds can hold values from any earlier iteration,
+        # and the body may not run at all, so nothing it learns outlives it.
+        for name in bound_names([node]):
+            facts.pop(name, None)
+        if isinstance(node, WhileExpression):
+            self._expression(node.condition, facts)
+        body = dict(facts)
+        if isinstance(node, ForExpression):
+            body[node.name.value] = INTEGER
+        self._block(node.body.statements, body)
+
+
+def infer(program: Program) -> Program:
+    """Annotates a parsed program with the operand types it can prove."""
+    return TypeInferrer().infer(program)
+
+
+def _refine(node: Node, operand: ObjectType, facts: _Facts) -> None:
+    """Records that an identifier operand held a value of the given type."""
+    if isinstance(node, Identifier):
+        facts[node.value] = operand
+
+
+def _meet(paths: list[_Facts]) -> _Facts:
+    """Returns the facts all paths agree on."""
+    facts = dict(paths[0])
+    for path in paths[1:]:
+        facts = {name: value for name, value in facts.items() if path.get(name) == value}
+    return facts
@@ -1,7 +1,11 @@
+import re
+from array import array
+from bisect import bisect_right
+from typing import Callable, Iterator
 from dessa.token import (
-    Token, lookup_ident, ILLEGAL, ASSIGN, SEMICOLON, EOF, INT,
+    Token, TokenType, TOKEN_TYPES, TOKEN_CODES, keywords, lookup_ident, IDENT, ILLEGAL, ASSIGN, SEMICOLON, EOF, INT, STRING,
     PLUS, MINUS, ASTERISK, SLASH, BANG, LT, GT, EQ, NOT_EQ,
-    LPAREN, RPAREN, LBRACE, RBRACE, COMMA
+    LPAREN, RPAREN, LBRACE, RBRACE, LBRACKET, RBRACKET, COMMA, COLON
 )
 
 class Lexer:
@@ -82,8 +86,22 @@ class Lexer:
             token = Token(LBRACE, self.char, token_line, token_column)
         elif self.char == '}':
             token = Token(RBRACE, self.char, token_line, token_column)
+        elif self.char == '[':
+            token = Token(LBRACKET, self.char, token_line, token_column)
+        elif self.char == ']':
+            token = Token(RBRACKET, self.char, token_line, token_column)
         elif self.char == ',':
             token = Token(COMMA, self.char, token_line, token_column)
+        elif self.char == ':':
+            token = Token(COLON, self.char, token_line, token_column)
+        elif self.char == '"':
+            start = self.position
+            self._read_char()
+            while self.char != '"' and self.char != '':
+                self._read_char()
+            if self.char == '':
+                return Token(ILLEGAL, self.source_code[start:], token_line, token_column)
+            token = Token(STRING, self.source_code[start + 1:self.position], token_line, token_column)
         elif self.char == '\x00' or self.char == '' :
             token = Token(EOF, "", token_line, token_column)
         else:
@@ -111,3 +129,258 @@ class Lexer:
         while self.char.isdigit():
             self._read_char()
         return self.source_code[start_position:self.position]
+
+
+# Operator and delimiter literals, longest first where they share a prefix.
+OPERATORS: dict[str, TokenType] = {
+    "==": EQ,
+    "!=": NOT_EQ,
+    "=": ASSIGN,
+    "+": PLUS,
+    "-": MINUS,
+    "!": BANG,
+    "*": ASTERISK,
+    "/": SLASH,
+    "<": LT,
+    ">": GT,
+    ";": SEMICOLON,
+    ",": COMMA,
+    ":": COLON,
+    "(": LPAREN,
+    ")": RPAREN,
+    "{": LBRACE,
+    "}": RBRACE,
+    "[": LBRACKET,
+    "]": RBRACKET,
+}
+
+# Leading whitespace, then an ASCII identifier, number or operator. Anything
+# else (non-ASCII letters and digits, NUL, illegal characters) is handled
+# one character at a time by _slow_span.
+_TOKEN_PATTERN = re.compile(
+    r"(\s*)(?:([A-Za-z_]+)|([0-9]+)|("
+    + "|".join(re.escape(op) for op in OPERATORS)
+    + r')|("[^"]*"))?'
+)
+_SPACE, _IDENT, _NUMBER, _OPERATOR, _STRING = 1, 2, 3, 4, 5
+
+
+class RegexLexer:
+    """
+    A lexer that matches each token with one compiled master regex.
+
+    It produces the same Token stream as Lexer, including line and column
+    numbers, but only does per-character work for newlines and for
+    characters outside the ASCII fast path.
+    """
+
+    def __init__(self, source_code: str):
+        self.source_code = source_code
+        self._tokens = self._scan()
+
+    def next_token(self) -> Token:
+        return next(self._tokens)
+
+    def _scan(self) -> Iterator[Token]:
+        source = self.source_code
+        length = len(source)
+        match_at = _TOKEN_PATTERN.match
+        keywords_get = keywords.get
+        position = 0
+        line = 1
+        line_start = -1  # Index of the last newline seen
+
+        while True:
+            match = match_at(source, position)
+            kind = match.lastindex
+            start = match.end(_SPACE)
+            if start != position:
+                newlines = source.count("\n", position, start)
+                if newlines:
+                    line += newlines
+                    line_start = source.rindex("\n", position, start)
+            position = match.end()
+
+            if kind == _OPERATOR:
+                literal = match.group(_OPERATOR)
+                yield Token(OPERATORS[literal], literal, line, start - line_start)
+            elif kind == _IDENT:
+                if position < length and not source[position].isascii():
+                    position = _extend(source, position, _is_letter)
+                literal = source[start:position]
+                yield Token(keywords_get(literal, IDENT), literal, line, start - line_start)
+            elif kind == _NUMBER:
+                if position < length and not source[position].isascii():
+                    position = _extend(source, position, str.isdigit)
+                yield Token(INT, source[start:position], line, start - line_start)
+            elif kind == _STRING:
+                yield Token(STRING, source[start + 1:position - 1], line, start - line_start)
+                line, line_start = _count_lines(source, start, position, line, line_start)
+            elif position < length:
+                token_type, position = _slow_span(source, position)
+                literal = "" if token_type == EOF else source[start:position]
+                yield Token(token_type, literal, line, start - line_start)
+                line, line_start = _count_lines(source, start, position, line, line_start)
+            else:
+                break
+
+        column = length - line_start
+        while True:
+            yield Token(EOF, "", line, column)
+            column += 1
+
+
+class TokenBuffer:
+    """
+    A whole token stream stored as parallel arrays.
+
+    Token types are small-integer codes into TOKEN_TYPES, and each token is
+    a start/end offset pair into the source. Literals, line and column
+    numbers and Token objects are only built when asked for. The stream
+    ends at the first EOF token.
+    """
+
+    def __init__(self, source_code: str, types: array, starts: array, ends: array):
+        self.source_code = source_code
+        self.types = types
+        self.starts = starts
+        self.ends = ends
+        self._newlines: array | None = None
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def type(self, index: int) -> TokenType:
+        return TOKEN_TYPES[self.types[index]]
+
+    def literal(self, index: int) -> str:
+        if self.types[index] == _STRING_CODE:
+            return self.source_code[self.starts[index] + 1:self.ends[index] - 1]
+        return self.source_code[self.starts[index]:self.ends[index]]
+
+    def position(self, index: int) -> tuple[int, int]:
+        """Returns the line and column of a token."""
+        if self._newlines is None:
+            self._newlines = array("I", (m.start() for m in _NEWLINE.finditer(self.source_code)))
+        start = self.starts[index]
+        line = bisect_right(self._newlines, start)
+        line_start = self._newlines[line - 1] if line else -1
+        return line + 1, start - line_start
+
+    def token(self, index: int) -> Token:
+        line, column = self.position(index)
+        return Token(self.type(index), self.literal(index), line, column)
+
+
+_NEWLINE = re.compile("\n")
+_EOF_CODE = TOKEN_CODES[EOF]
+_IDENT_CODE = TOKEN_CODES[IDENT]
+_INT_CODE = TOKEN_CODES[INT]
+_STRING_CODE = TOKEN_CODES[STRING]
+_OPERATOR_CODES = {literal: TOKEN_CODES[token_type] for literal, token_type in OPERATORS.items()}
+_KEYWORD_CODES = {literal: TOKEN_CODES[token_type] for literal, token_type in keywords.items()}
+
+
+def tokenize(source_code: str) -> TokenBuffer:
+    """Tokenizes source code into a TokenBuffer in one pass."""
+    source = source_code
+    length = len(source)
+    match_at = _TOKEN_PATTERN.match
+    keyword_code = _KEYWORD_CODES.get
+    types = array("B")
+    starts = array("I")
+    ends = array("I")
+    add_type = types.append
+    add_start = starts.append
+    add_end = ends.append
+    position = 0
+
+    while True:
+        match = match_at(source, position)
+        kind = match.lastindex
+        start = match.end(_SPACE)
+        position = match.end()
+
+        if kind == _OPERATOR:
+            add_type(_OPERATOR_CODES[match.group(_OPERATOR)])
+        elif kind == _IDENT:
+            if position < length and not source[position].isascii():
+                position = _extend(source, position, _is_letter)
+            add_type(keyword_code(source[start:position], _IDENT_CODE))
+        elif kind == _NUMBER:
+            if position < length and not source[position].isascii():
+                position = _extend(source, position, str.isdigit)
+            add_type(_INT_CODE)
+        elif kind == _STRING:
+            add_type(_STRING_CODE)
+        elif position < length:
+            token_type, position = _slow_span(source, position)
+            add_type(TOKEN_CODES[token_type])
+            if token_type == EOF:
+                add_start(start)
+                add_end(start)
+                break
+        else:
+            add_type(_EOF_CODE)
+            add_start(start)
+            add_end(start)
+            break
+        add_start(start)
+        add_end(position)
+
+    return TokenBuffer(source_code, types, starts, ends)
+
+
+def _slow_span(source: str, start: int) -> tuple[TokenType, int]:
+    """Reads a token that starts outside the ASCII fast path and returns its type and end."""
+    char = source[start]
+    if char == "\x00":
+        return EOF, start + 1
+    elif _is_letter(char):
+        end = _extend(source, start, _is_letter)
+        return lookup_ident(source[start:end]), end
+    elif char.isdigit():
+        return INT, _extend(source, start, str.isdigit)
+    elif char == '"':
+        # A string with no closing quote runs to the end of the source.
+        return ILLEGAL, len(source)
+    return ILLEGAL, start + 1
+
+
+def _count_lines(source: str, start: int, end: int, line: int, line_start: int) -> tuple[int, int]:
+    """Advances the line number and line start past the newlines inside a token."""
+    newlines = source.count("\n", start, end)
+    if newlines:
+        return line + newlines, source.rindex("\n", start, end)
+    return line, line_start
+
+
+def _extend(source: str, end: int, accepts: Callable[[str], bool]) -> int:
+    """Advances past the characters that continue a token."""
+    while end < len(source) and accepts(source[end]):
+        end += 1
+    return end
+
+
+def _is_letter(char: str) -> bool:
+    return char.isalpha() or char == "_"
+
+
+# The lexers that can feed the parser, keyed by name. Each one takes the
+# source code and returns something Parser accepts.
+LEXERS: dict[str, Callable[[str], Lexer | RegexLexer | TokenBuffer]] = {
+    "char": Lexer,
+    "regex": RegexLexer,
+    "buffer": tokenize,
+}
+
+DEFAULT_LEXER = "buffer"
+
+
+def get_lexer(name: str) -> Callable[[str], Lexer | RegexLexer | TokenBuffer]:
+    """Looks up a lexer by name."""
+    lexer = LEXERS.get(name)
+    if lexer is None:
+        choices = ", ".join(sorted(LEXERS))
+        raise ValueError(f"unknown lexer {name!r}, expected one of: {choices}")
+    return lexer
@@ -0,0 +1,165 @@
+from collections import OrderedDict
+from dessa.ast import Node, Program, BlockStatement, FunctionLiteral, CallExpression, Identifier, walk
+from dessa.environment import Environment
+from dessa.evaluator import (
+    eval,
+    register,
+    _apply_function,
+    _finish_call_expression,
+)
+from dessa.object import Object, Integer, Boolean, Error, Function, NULL
+from dessa.resolver import resolve
+
+MAX_SIZE = 4096
+
+
+class Memoizer:
+    """
+    Evaluates programs, memoizing calls to pure functions.
+
+    A function is pure when its literal creates no closures and every
+    name it reads from outside is an integer, a boolean or another pure
+    function. Calls to it with integer and boolean arguments are looked up
+    in a least recently used cache of `max_size` results, keyed on the
+    function, the values of those outside names and the arguments, so
+    rebinding a name a function depends on never returns a stale result.
+    Only integer, boolean and null results are cached; anything else is
+    recomputed so that identity comparisons stay the same.
+    """
+
+    def __init__(self, max_size: int = MAX_SIZE) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._cache: OrderedDict[tuple, Object] = OrderedDict()
+        # The names read from outside each pure function, keyed by its body.
+        self._free_names: dict[BlockStatement, tuple[str, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def run(self, program: Program, env: Environment) -> Object | None:
+        """Evaluates a program with the calls in it memoized."""
+        if not program.resolved:
+            resolve(program)
+        self._prepare(program.statements)
+        return eval(program, env)
+
+    def call(self, fn: Function, args: list[Object]) -> Object | None:
+        """Applies a function, answering from the cache when the call is pure."""
+        key = self._key(fn, args)
+        if key is None:
+            return _apply_function(fn, args)
+        result = self._cache.get(key)
+        if result is not None:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return result
+        self.misses += 1
+        result = _apply_function(fn, args)
+        if type(result) is Integer or type(result) is Boolean or result is NULL:
+            self._cache[key] = result
+            if len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def clear(self) -> None:
+        """Empties the cache and resets the counters."""
+        self._cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def _prepare(self, statements: list[Node]) -> None:
+        """Finds the pure function literals and routes every call through the cache."""
+        for node in walk(statements):
+            if isinstance(node, CallExpression):
+                node.__class__ = MemoizedCallExpression
+                node.memoizer = self
+            elif isinstance(node, FunctionLiteral):
+                self._prepare(node.body.statements)
+                if not any(isinstance(child, FunctionLiteral) for child in walk(node.body.statements)):
+                    parameters = {param.value for param in node.parameters}
+                    self._free_names[node.body.origin or node.body] = tuple({
+                        child.value
+                        for child in walk(node.body.statements)
+                        if isinstance(child, Identifier) and child.value not in parameters
+                    })
+
+    def _key(self, fn: Function, args: list[Object]) -> tuple | None:
+        """Returns the cache key of a call, or None if it cannot be memoized."""
+        values: list[object] = []
+        for arg in args:
+            if type(arg) is Integer:
+                values.append(arg.value)
+            elif type(arg) is Boolean:
+                values.append(arg)
+            else:
+                return None
+        dependencies = self._dependencies(fn)
+        if dependencies is None:
+            return None
+        return (fn, dependencies, tuple(values))
+
+    def _dependencies(self, fn: Function) -> tuple | None:
+        """Returns the values a function's result depends on besides its arguments."""
+        dependencies: list[object] = []
+        seen = {fn}
+        pending = [fn]
+        while pending:
+            function = pending.pop()
+            names = self._free_names.get(function.body.origin or function.body)
+            if names is None:
+                return None
+            for name in names:
+                value = function.env.get(name)
+                if type(value) is Integer:
+                    dependencies.append(value.value)
+                elif type(value) is Function:
+                    dependencies.append(value)
+                    if value not in seen:
+                        seen.add(value)
+                        pending.append(value)
+                elif value is None or type(value) is Boolean:
+                    dependencies.append(value)
+                else:
+                    return None
+        return tuple(dependencies)
+
+
+class MemoizedCallExpression(CallExpression):
+    """A CallExpression that applies pure functions through a Memoizer."""
+    memoizer: Memoizer
+
+
+@register(MemoizedCallExpression)
+def _eval_memoized_call_expression(node: MemoizedCallExpression, env: Environment) -> Object | None:
+    function = eval(node.function, env)
+    if (
+        node.tail
+        or type(function) is not Function
+        or (function.body.origin or function.body) not in node.memoizer._free_names
+    ):
+        # A tail call is handed back to the caller's loop instead of being
+        # applied here, so it cannot nest Python frames.
+        return _finish_call_expression(node, function, env)
+    args = []
+    for argument in node.arguments:
+        value = eval(argument, env)
+        if isinstance(value, Error):
+            return value
+        args.append(value)
+    return node.memoizer.call(function, args)
+
+
+def _new_memoizer(env: Environment) -> Memoizer:
+    return Memoizer()
+
+
+def memoizer_for(env: Environment) -> Memoizer:
+    """Returns the Memoizer that runs programs against an environment, shared by every run in it."""
+    return env.session(_new_memoizer)
+
+
+def run(program: Program, env: Environment) -> Object | None:
+    """Evaluates a program with calls to pure functions memoized, reusing the environment's cache."""
+    return memoizer_for(env).run(program, env)
@@ -1,11 +1,22 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
+from array import array
+from typing import Callable, Hashable
+
+try:
+    import numpy
+except ImportError:  # Vectors are optional and need NumPy.
+    numpy = None
 
 ObjectType = str
 
+# Whether programs can build vectors, which needs NumPy.
+VECTORS_AVAILABLE = numpy is not None
+
 
 class Object(ABC):
     """The base class for all objects in the language."""
+    __slots__ = ()
 
     @abstractmethod
     def object_type(self) -> ObjectType:
@@ -17,9 +28,18 @@ class Object(ABC):
         """Returns a string representation of the object."""
         pass
 
+    def hash_key(self) -> Hashable | None:
+        """
+        Returns the Python value the object is stored under as a hash key,
+        or None if it cannot be one. Equal objects have equal keys, and
+        keys of different types never compare equal.
+        """
+        return None
+
 
 class Integer(Object):
     """Represents an integer object."""
+    __slots__ = ("value",)
 
     def __init__(self, value: int) -> None:
         self.value = value
@@ -30,9 +50,13 @@ class Integer(Object):
     def inspect(self) -> str:
         return str(self.value)
 
+    def hash_key(self) -> Hashable:
+        return self.value
+
 
 class Boolean(Object):
     """Represents a boolean object."""
+    __slots__ = ("value",)
 
     def __init__(self, value: bool) -> None:
         self.value = value
@@ -43,6 +67,10 @@ class Boolean(Object):
     def inspect(self) -> str:
         return "true" if self.value else "false"
 
+    def hash_key(self) -> Hashable:
+        # The shared instance hashes by identity, so it never equals an int.
+        return TRUE if self.value else FALSE
+
 
 class Null(Object):
     """Represents a null object."""
@@ -56,6 +84,7 @@ class Null(Object):
 
 class ReturnValue(Object):
     """Represents a return value."""
+    __slots__ = ("value",)
 
     def __init__(self, value: Object) -> None:
         self.value = value
@@ -70,6 +99,7 @@ class ReturnValue(Object):
 from dessa.ast import Identifier, BlockStatement
 class Error(Object):
     """Represents an error."""
+    __slots__ = ("message",)
 
     def __init__(self, message: str) -> None:
         self.message = message
@@ -83,25 +113,300 @@ class Error(Object):
 
 class Function(Object):
     """Represents a function."""
+    __slots__ = ("parameters", "body", "env", "slots", "cells", "padding")
 
     def __init__(
         self,
         parameters: list[Identifier],
         body: BlockStatement,
         env: "Environment",
+        slots: dict[str, int] | None = None,
+        cells: dict[str, int] | None = None,
+        padding: list[None] | None = None,
     ) -> None:
         self.parameters = parameters
         self.body = body
         self.env = env
+        self.slots = slots
+        self.cells = cells
+        self.padding = padding
 
     def object_type(self) -> ObjectType:
         return "FUNCTION"
 
     def inspect(self) -> str:
         params = ", ".join(str(p) for p in self.parameters)
-        return f"fn({params}) {{\n{self.body}\n}}"
+        return f"fn({params}) {{\n{self.body.origin or self.body}\n}}"
 
 
 NULL = Null()
 TRUE = Boolean(True)
 FALSE = Boolean(False)
+
+
+class Array(Object):
+    """
+    Represents an array.
+
+    Arrays are never modified once built. An array of integers that all
+    fit in 64 bits keeps their values packed in an array('q'); any other
+    array keeps its objects in a list. Arrays made by appending to another
+    share its storage, holding the first `length` items of it, so building
+    an array one push at a time does not copy it each time.
+    """
+    __slots__ = ("elements", "length", "packed")
+
+    def __init__(self, elements: list[Object] | array, length: int | None = None) -> None:
+        self.elements = elements
+        self.length = len(elements) if length is None else length
+        self.packed = type(elements) is array
+
+    def object_type(self) -> ObjectType:
+        return "ARRAY"
+
+    def inspect(self) -> str:
+        return "[" + ", ".join(e.inspect() for e in self.objects()) + "]"
+
+    def __len__(self) -> int:
+        return self.length
+
+    def get(self, index: int) -> Object:
+        """Returns the element at an index, which must be in range."""
+        if self.packed:
+            return new_integer(self.elements[index])
+        return self.elements[index]
+
+    def values(self) -> list[Object] | array:
+        """Returns the storage holding exactly this array's items, copying it if it is shared."""
+        if self.length == len(self.elements):
+            return self.elements
+        return self.elements[:self.length]
+
+    def objects(self) -> list[Object]:
+        """Returns the elements as a list of objects."""
+        if self.packed:
+            return [new_integer(value) for value in self.values()]
+        return list(self.values())
+
+
+class Hash(Object):
+    """
+    Represents a hash.
+
+    Each pair is stored under the hash key of its key, so a lookup hashes
+    that Python value directly instead of wrapping the key object. Hashes
+    are never modified once built.
+    """
+    __slots__ = ("pairs",)
+
+    def __init__(self, pairs: dict[Hashable, tuple[Object, Object]]) -> None:
+        self.pairs = pairs
+
+    def object_type(self) -> ObjectType:
+        return "HASH"
+
+    def inspect(self) -> str:
+        pairs = ", ".join(f"{key.inspect()}: {value.inspect()}" for key, value in self.pairs.values())
+        return "{" + pairs + "}"
+
+    def __len__(self) -> int:
+        return len(self.pairs)
+
+
+class String(Object):
+    """
+    Represents a string.
+
+    Concatenating two strings copies neither: the result is a rope node
+    holding both, and it is only flattened into a single Python str the
+    first time its text is needed, after which it keeps that str and lets
+    go of the parts. Building a string by repeated concatenation is then
+    linear in its length instead of quadratic.
+    """
+    __slots__ = ("_text", "_left", "_right", "length")
+
+    def __init__(self, text: str) -> None:
+        self._text = text
+        self._left = self._right = None
+        self.length = len(text)
+
+    @property
+    def value(self) -> str:
+        """The text of the string, flattening it on first use."""
+        text = self._text
+        if text is None:
+            text = self._text = self._flatten()
+            self._left = self._right = None
+        return text
+
+    def _flatten(self) -> str:
+        # Iterative, since ropes built in a loop are as deep as they are long.
+        parts = []
+        pending = [self]
+        while pending:
+            node = pending.pop()
+            if node._text is not None:
+                parts.append(node._text)
+            else:
+                pending.append(node._right)
+                pending.append(node._left)
+        return "".join(parts)
+
+    def object_type(self) -> ObjectType:
+        return "STRING"
+
+    def inspect(self) -> str:
+        return self.value
+
+    def hash_key(self) -> Hashable:
+        # Python caches the hash of a str, so it is computed once per string.
+        return self.value
+
+    def __len__(self) -> int:
+        return self.length
+
+
+# Concatenations shorter than this are copied right away, since a rope
+# node costs more than a short copy.
+_MIN_ROPE_LENGTH = 64
+
+
+def concat(left: String, right: String) -> String:
+    """Returns the concatenation of two strings."""
+    if not right.length:
+        return left
+    if not left.length:
+        return right
+    length = left.length + right.length
+    if length < _MIN_ROPE_LENGTH:
+        return String(left.value + right.value)
+    rope = String.__new__(String)
+    rope._text = None
+    rope._left = left
+    rope._right = right
+    rope.length = length
+    return rope
+
+
+class Vector(Object):
+    """
+    Represents a vector: integers packed in a NumPy int64 array.
+
+    Infix operators apply to a vector elementwise in a single NumPy call,
+    with integer operands broadcast to every element. Arithmetic wraps
+    around at 64 bits, as NumPy's does, and comparisons give vectors of
+    1s and 0s. Vectors are never modified once built.
+    """
+    __slots__ = ("values",)
+
+    def __init__(self, values: numpy.ndarray) -> None:
+        self.values = values
+
+    def object_type(self) -> ObjectType:
+        return "VECTOR"
+
+    def inspect(self) -> str:
+        return "vector([" + ", ".join(str(value) for value in self.values.tolist()) + "])"
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+def new_array(elements: list[Object]) -> Array:
+    """Returns an Array of the elements, packing them when they are all 64-bit integers."""
+    if elements and all(type(e) is Integer for e in elements):
+        try:
+            return Array(array("q", [e.value for e in elements]))
+        except OverflowError:
+            pass
+    return Array(elements)
+
+
+class Builtin(Object):
+    """
+    Represents a function implemented in Python.
+
+    `fn` takes the arguments and the engine's function application, which
+    it uses to call the Dessa functions it is given.
+    """
+    __slots__ = ("name", "fn")
+
+    def __init__(self, name: str, fn: Callable[[list[Object], Callable], Object]) -> None:
+        self.name = name
+        self.fn = fn
+
+    def object_type(self) -> ObjectType:
+        return "BUILTIN"
+
+    def inspect(self) -> str:
+        return f"builtin function {self.name}"
+
+# Integers in this range share one preallocated object per value.
+SMALL_INT_MIN = -5
+SMALL_INT_MAX = 1024
+
+_small_ints: dict[int, Integer] = {}
+
+
+def set_small_int_range(low: int, high: int) -> None:
+    """Preallocates the shared Integer objects for values from low to high."""
+    _small_ints.clear()
+    for value in range(low, high + 1):
+        _small_ints[value] = Integer(value=value)
+
+
+def new_integer(value: int) -> Integer:
+    """Returns an Integer, reusing the shared object for small values."""
+    integer = _small_ints.get(value)
+    if integer is None:
+        return Integer(value=value)
+    return integer
+
+
+set_small_int_range(SMALL_INT_MIN, SMALL_INT_MAX)
+
+
+class CompiledFunction(Object):
+    """Represents a function lowered to bytecode by the compiler."""
+
+    def __init__(
+        self,
+        instructions: list[int],
+        num_locals: int,
+        num_parameters: int,
+        cells: list[int],
+        free_sources: list[tuple[bool, int]],
+        source: str,
+        constants: list[Object | CompiledFunction],
+        names: list[str],
+    ) -> None:
+        self.instructions = instructions
+        self.num_locals = num_locals
+        self.num_parameters = num_parameters
+        self.cells = cells
+        self.free_sources = free_sources
+        self.source = source
+        # The pools the instructions index into; a closure keeps them even
+        # after later compilations in the same environment add their own.
+        self.constants = constants
+        self.names = names
+
+    def object_type(self) -> ObjectType:
+        return "COMPILED_FUNCTION"
+
+    def inspect(self) -> str:
+        return self.source
+
+
+class Closure(Object):
+    """Represents a compiled function together with its captured variables."""
+
+    def __init__(self, fn: CompiledFunction, free: list) -> None:
+        self.fn = fn
+        self.free = free
+
+    def object_type(self) -> ObjectType:
+        return "FUNCTION"
+
+    def inspect(self) -> str:
+        return self.fn.source
@@ -0,0 +1,414 @@
+import copy
+from dessa.ast import (
+    Node,
+    Program,
+    Statement,
+    Expression,
+    ExpressionStatement,
+    IntegerLiteral,
+    StringLiteral,
+    Boolean,
+    PrefixExpression,
+    InfixExpression,
+    IfExpression,
+    WhileExpression,
+    ForExpression,
+    BlockStatement,
+    ReturnStatement,
+    LetStatement,
+    Identifier,
+    FunctionLiteral,
+    CallExpression,
+    ArrayLiteral,
+    HashLiteral,
+    IndexExpression,
+    bound_names,
+    walk,
+)
+from dessa.token import Token, INT, TRUE, FALSE
+
+INLINE_BUDGET = 16
+
+# Marks a name whose binding has run but does not hold an inlinable function.
+_BOUND = object()
+
+
+class _Scope:
+    """What the optimizer knows about the bindings of a function body or the top level."""
+
+    def __init__(self, function: FunctionLiteral | None, statements: list[Statement]) -> None:
+        self.function = function
+        parameters = [param.value for param in function.parameters] if function else []
+        lets = bound_names(statements)
+        loops = [node for node in walk(statements) if isinstance(node, (WhileExpression, ForExpression))]
+        looped = set(bound_names(loops))
+        self.declared = set(parameters) | set(lets)
+        # Names that can hold different values over the life of the scope.
+        self.rebound = {name for name in lets if lets.count(name) > 1 or name in parameters or name in looped}
+        # The binding each name has at the statement being optimized: an
+        # inlinable function literal, _BOUND, or None when it is unknown.
+        self.bindings: dict[str, FunctionLiteral | object | None] = dict.fromkeys(parameters, _BOUND)
+
+
+class Optimizer:
+    """
+    Simplifies a program without changing what it evaluates to.
+
+    Constant prefix and infix expressions are folded into literals, if
+    expressions with a constant condition are replaced by the branch that
+    would run, and statements that follow an unconditional return are
+    dropped. Expressions that would produce a runtime error (type
+    mismatches, unknown operators, division by zero) are left in place so
+    they fail exactly as before.
+
+    Calls to let-bound functions whose body is a single expression of at
+    most `inline_budget` nodes are replaced by that expression with the
+    arguments substituted for the parameters, as long as the call always
+    reaches that binding and evaluates to the same thing.
+    """
+
+    def __init__(self, inline_budget: int = INLINE_BUDGET) -> None:
+        self.inline_budget = inline_budget
+        self._scopes: list[_Scope] = []
+        self._inlining: set[FunctionLiteral] = set()
+
+    def optimize(self, program: Program) -> Program:
+        """Optimizes the program in place and returns it."""
+        self._scopes.append(_Scope(None, program.statements))
+        program.statements = self._optimize_statements(program.statements)
+        self._scopes.pop()
+        return program
+
+    def optimize_function(self, node: FunctionLiteral) -> FunctionLiteral:
+        """Optimizes a function literal's body, keeping the body as written as its origin, and returns it."""
+        self._optimize_expression(node)
+        return node
+
+    def _optimize_statements(self, statements: list[Statement]) -> list[Statement]:
+        result: list[Statement] = []
+        for statement in statements:
+            statement = self._optimize_statement(statement)
+            branch = _taken_branch(statement)
+            if branch is not None and branch.statements:
+                # A block shares its enclosing scope and evaluates to its last
+                # statement, so a statement-level branch can be spliced in.
+                result.extend(branch.statements)
+            else:
+                result.append(statement)
+            if isinstance(result[-1], ReturnStatement):
+                break
+        return result
+
+    def _optimize_statement(self, node: Statement) -> Statement:
+        if isinstance(node, ExpressionStatement):
+            node.expression = self._optimize_expression(node.expression)
+        elif isinstance(node, LetStatement):
+            node.value = self._optimize_expression(node.value)
+            self._scopes[-1].bindings[node.name.value] = _binding(node.value, self.inline_budget)
+        elif isinstance(node, ReturnStatement):
+            node.return_value = self._optimize_expression(node.return_value)
+        elif isinstance(node, BlockStatement):
+            node.statements = self._optimize_statements(node.statements)
+        return node
+
+    def _optimize_expression(self, node: Expression | None) -> Expression | None:
+        if isinstance(node, PrefixExpression):
+            node.right = self._optimize_expression(node.right)
+            return _fold_prefix(node) or node
+        elif isinstance(node, InfixExpression):
+            node.left = self._optimize_expression(node.left)
+            node.right = self._optimize_expression(node.right)
+            return _fold_infix(node) or node
+        elif isinstance(node, IfExpression):
+            return self._optimize_if_expression(node)
+        elif isinstance(node, (WhileExpression, ForExpression)):
+            return self._optimize_loop(node)
+        elif isinstance(node, FunctionLiteral):
+            if node.body.origin is None:
+                # Fold a copy of the body, so the function still inspects as
+                # written. A body with an origin is a copy already.
+                original = node.body
+                node.body = copy.deepcopy(original)
+                node.body.origin = original
+            self._scopes.append(_Scope(node, node.body.statements))
+            node.body.statements = self._optimize_statements(node.body.statements)
+            self._scopes.pop()
+        elif isinstance(node, CallExpression):
+            node.function = self._optimize_expression(node.function)
+            node.arguments = [self._optimize_expression(a) for a in node.arguments]
+            return self._inline(node) or node
+        elif isinstance(node, ArrayLiteral):
+            node.elements = [self._optimize_expression(e) for e in node.elements]
+        elif isinstance(node, HashLiteral):
+            node.pairs = [(self._optimize_expression(k), self._optimize_expression(v)) for k, v in node.pairs]
+        elif isinstance(node, IndexExpression):
+            node.left = self._optimize_expression(node.left)
+            node.index = self._optimize_expression(node.index)
+        return node
+
+    def _optimize_if_expression(self, node: IfExpression) -> Expression:
+        node.condition = self._optimize_expression(node.condition)
+        node.consequence.statements = self._optimize_branch(node.consequence.statements)
+        if node.alternative:
+            node.alternative.statements = self._optimize_branch(node.alternative.statements)
+
+        branch = _constant_branch(node)
+        if branch is None:
+            return node
+        # A branch holding a single expression evaluates to that expression.
+        if len(branch.statements) == 1 and isinstance(branch.statements[0], ExpressionStatement):
+            return branch.statements[0].expression
+        # Otherwise keep the if, but drop the branch that can never run.
+        if branch is node.consequence:
+            node.alternative = None
+        return node
+
+    def _optimize_loop(self, node: WhileExpression | ForExpression) -> Expression:
+        if isinstance(node, ForExpression):
+            node.start = self._optimize_expression(node.start)
+            node.stop = self._optimize_expression(node.stop)
+        # A name the loop binds may have been rebound by an earlier iteration
+        # by the time the condition or the body reads it.
+        bindings = self._scopes[-1].bindings
+        for name in bound_names([node]):
+            bindings[name] = None
+        if isinstance(node, WhileExpression):
+            node.condition = self._optimize_expression(node.condition)
+        node.body.statements = self._optimize_branch(node.body.statements)
+        return node
+
+    def _optimize_branch(self, statements: list[Statement]) -> list[Statement]:
+        """Optimizes a block that may not run, forgetting what its lets bound afterwards."""
+        bindings = self._scopes[-1].bindings
+        before = dict(bindings)
+        statements = self._optimize_statements(statements)
+        for name, binding in list(bindings.items()):
+            if name not in before or before[name] is not binding:
+                bindings[name] = None
+        return statements
+
+    def _inline(self, node: CallExpression) -> Expression | None:
+        """Returns the body of the function a call always reaches, with the arguments substituted."""
+        if not isinstance(node.function, Identifier):
+            return None
+        name = node.function.value
+        found = self._lookup(name)
+        if found is None or not isinstance(found[0], FunctionLiteral):
+            return None
+        literal, index = found
+        if literal in self._inlining or len(node.arguments) != len(literal.parameters):
+            return None
+        body = literal.body.statements[0].expression
+        parameters = [param.value for param in literal.parameters]
+
+        # The names the body reads from outside must reach the same bindings
+        # from the call site, and calling itself would never stop inlining.
+        for child in _expressions(body):
+            if isinstance(child, Identifier) and child.value not in parameters:
+                if child.value == name:
+                    return None
+                if self._declaring_scope(child.value) != self._declaring_scope(child.value, index):
+                    return None
+
+        # Arguments that cannot fail or have side effects may be evaluated any
+        # number of times in any order. One other argument may be substituted
+        # when its parameter is used once, as the first thing the body does.
+        uses = [child.value for child in _expressions(body) if isinstance(child, Identifier)]
+        first = _first_evaluated(body)
+        for parameter, argument in zip(parameters, node.arguments):
+            if self._is_constant(argument):
+                continue
+            if not isinstance(argument, (IntegerLiteral, Boolean, Identifier, PrefixExpression, InfixExpression)):
+                return None
+            if uses.count(parameter) != 1 or not isinstance(first, Identifier) or first.value != parameter:
+                return None
+            first = None
+
+        replacements = dict(zip(parameters, node.arguments))
+        self._inlining.add(literal)
+        inlined = self._optimize_expression(_substitute(copy.deepcopy(body), replacements))
+        self._inlining.discard(literal)
+        return inlined
+
+    def _lookup(self, name: str) -> tuple[FunctionLiteral | object, int] | None:
+        """Returns the binding a name is known to have here, and the index of its scope."""
+        index = self._declaring_scope(name)
+        if index is None:
+            return None
+        scope = self._scopes[index]
+        binding = scope.bindings.get(name)
+        if binding is None:
+            return None
+        # Statements of the innermost scope run in order. Bindings further out
+        # are read whenever the function runs, so they must never change, and
+        # top-level names can be rebound by later programs.
+        if index != len(self._scopes) - 1 and (scope.function is None or name in scope.rebound):
+            return None
+        return binding, index
+
+    def _declaring_scope(self, name: str, innermost: int | None = None) -> int | None:
+        """Returns the index of the innermost scope, up to `innermost`, that binds a name."""
+        if innermost is None:
+            innermost = len(self._scopes) - 1
+        for index in range(innermost, -1, -1):
+            if name in self._scopes[index].declared:
+                return index
+        return None
+
+    def _is_constant(self, node: Expression) -> bool:
+        """Reports whether evaluating an expression always succeeds without side effects."""
+        if isinstance(node, (IntegerLiteral, StringLiteral, Boolean)):
+            return True
+        return isinstance(node, Identifier) and self._lookup(node.value) is not None
+
+
+def optimize(program: Program, inline_budget: int = INLINE_BUDGET) -> Program:
+    """Optimizes a parsed program in place."""
+    return Optimizer(inline_budget).optimize(program)
+
+
+def _binding(value: Expression, inline_budget: int) -> FunctionLiteral | object | None:
+    """Returns what a let statement binds its name to, as far as inlining is concerned."""
+    if isinstance(value, FunctionLiteral):
+        statements = value.body.statements
+        if (
+            len(statements) == 1
+            and isinstance(statements[0], ExpressionStatement)
+            and not any(
+                isinstance(node, (LetStatement, ReturnStatement, FunctionLiteral, WhileExpression, ForExpression))
+                for node in walk(statements)
+            )
+            and sum(1 for _ in _expressions(statements[0].expression)) <= inline_budget
+        ):
+            return value
+        return _BOUND
+    # Calls, ifs and indexes may evaluate to nothing, which leaves the name unbound.
+    if isinstance(value, (IntegerLiteral, StringLiteral, Boolean, Identifier, PrefixExpression, InfixExpression, ArrayLiteral, HashLiteral)):
+        return _BOUND
+    return None
+
+
+def _expressions(node: Expression):
+    """Yields the nodes of an expression, including those in the blocks of its ifs."""
+    return walk([node])
+
+
+def _first_evaluated(node: Expression) -> Expression:
+    """Returns the leaf of an expression that is evaluated first."""
+    while True:
+        if isinstance(node, InfixExpression):
+            node = node.left
+        elif isinstance(node, PrefixExpression):
+            node = node.right
+        elif isinstance(node, CallExpression):
+            node = node.function
+        elif isinstance(node, IfExpression):
+            node = node.condition
+        elif isinstance(node, IndexExpression):
+            node = node.left
+        elif isinstance(node, ArrayLiteral) and node.elements:
+            node = node.elements[0]
+        elif isinstance(node, HashLiteral) and node.pairs:
+            node = node.pairs[0][0]
+        else:
+            return node
+
+
+def _substitute(node: Node, replacements: dict[str, Expression]) -> Node:
+    """Replaces parameter identifiers in a copied function body with the arguments."""
+    if isinstance(node, Identifier) and node.value in replacements:
+        return copy.deepcopy(replacements[node.value])
+    if isinstance(node, ExpressionStatement):
+        node.expression = _substitute(node.expression, replacements)
+    elif isinstance(node, PrefixExpression):
+        node.right = _substitute(node.right, replacements)
+    elif isinstance(node, InfixExpression):
+        node.left = _substitute(node.left, replacements)
+        node.right = _substitute(node.right, replacements)
+    elif isinstance(node, IfExpression):
+        node.condition = _substitute(node.condition, replacements)
+        for block in (node.consequence, node.alternative):
+            if block is not None:
+                block.statements = [_substitute(s, replacements) for s in block.statements]
+    elif isinstance(node, CallExpression):
+        node.function = _substitute(node.function, replacements)
+        node.arguments = [_substitute(a, replacements) for a in node.arguments]
+    elif isinstance(node, ArrayLiteral):
+        node.elements = [_substitute(e, replacements) for e in node.elements]
+    elif isinstance(node, HashLiteral):
+        node.pairs = [(_substitute(k, replacements), _substitute(v, replacements)) for k, v in node.pairs]
+    elif isinstance(node, IndexExpression):
+        node.left = _substitute(node.left, replacements)
+        node.index = _substitute(node.index, replacements)
+    return node
+
+
+def _constant_branch(node: IfExpression) -> BlockStatement | None:
+    """Returns the block an if expression with a constant condition runs, if any."""
+    if isinstance(node.condition, (IntegerLiteral, StringLiteral)):
+        return node.consequence
+    elif isinstance(node.condition, Boolean):
+        return node.consequence if node.condition.value else node.alternative
+    return None
+
+
+def _taken_branch(statement: Statement) -> BlockStatement | None:
+    """Returns the block a statement-level constant if expression runs, if any."""
+    if isinstance(statement, ExpressionStatement) and isinstance(statement.expression, IfExpression):
+        return _constant_branch(statement.expression)
+    return None
+
+
+def _fold_prefix(node: PrefixExpression) -> Expression | None:
+    right = node.right
+    if node.operator == "!":
+        if isinstance(right, Boolean):
+            return boolean_literal(node, not right.value)
+        elif isinstance(right, IntegerLiteral):
+            return boolean_literal(node, False)
+    elif node.operator == "-" and isinstance(right, IntegerLiteral):
+        return integer_literal(node, -right.value)
+    return None
+
+
+def _fold_infix(node: InfixExpression) -> Expression | None:
+    left, right, operator = node.left, node.right, node.operator
+    if isinstance(left, IntegerLiteral) and isinstance(right, IntegerLiteral):
+        a, b = left.value, right.value
+        if operator == "+":
+            return integer_literal(node, a + b)
+        elif operator == "-":
+            return integer_literal(node, a - b)
+        elif operator == "*":
+            return integer_literal(node, a * b)
+        elif operator == "/" and b != 0:
+            return integer_literal(node, a // b)
+        elif operator == "<":
+            return boolean_literal(node, a < b)
+        elif operator == ">":
+            return boolean_literal(node, a > b)
+        elif operator == "==":
+            return boolean_literal(node, a == b)
+        elif operator == "!=":
+            return boolean_literal(node, a != b)
+    elif isinstance(left, Boolean) and isinstance(right, Boolean):
+        if operator == "==":
+            return boolean_literal(node, left.value == right.value)
+        elif operator == "!=":
+            return boolean_literal(node, left.value != right.value)
+    return None
+
+
+def integer_literal(node: Node, value: int) -> IntegerLiteral:
+    """Returns an integer literal for a value, placed at a node's position."""
+    token = Token(INT, str(value), node.token.line, node.token.column)
+    return IntegerLiteral(token=token, value=value)
+
+
+def boolean_literal(node: Node, value: bool) -> Boolean:
+    """Returns a boolean literal for a value, placed at a node's position."""
+    if value:
+        token = Token(TRUE, "true", node.token.line, node.token.column)
+    else:
+        token = Token(FALSE, "false", node.token.line, node.token.column)
+    return Boolean(token=token, value=value)
@@ -6,19 +6,26 @@ from dessa.ast import (
     Expression,
     ExpressionStatement,
     IntegerLiteral,
+    StringLiteral,
     PrefixExpression,
     InfixExpression,
     Boolean,
     ReturnStatement,
     IfExpression,
+    WhileExpression,
+    ForExpression,
     BlockStatement,
     FunctionLiteral,
     CallExpression,
+    ArrayLiteral,
+    HashLiteral,
+    IndexExpression,
 )
-from dessa.lexer import Lexer
+from dessa.lexer import Lexer, RegexLexer, TokenBuffer
 from dessa.token import (
     Token,
     TokenType,
+    TOKEN_TYPES,
     EOF,
     LET,
     RETURN,
@@ -26,6 +33,7 @@ from dessa.token import (
     ASSIGN,
     SEMICOLON,
     INT,
+    STRING,
     BANG,
     MINUS,
     PLUS,
@@ -45,6 +53,12 @@ from dessa.token import (
     ELSE,
     FUNCTION,
     COMMA,
+    WHILE,
+    FOR,
+    IN,
+    LBRACKET,
+    RBRACKET,
+    COLON,
 )
 
 
@@ -56,6 +70,7 @@ class Precedence(IntEnum):
     PRODUCT = 5
     PREFIX = 6
     CALL = 7
+    INDEX = 8
 
 
 precedences = {
@@ -68,29 +83,46 @@ precedences = {
     SLASH: Precedence.PRODUCT,
     ASTERISK: Precedence.PRODUCT,
     LPAREN: Precedence.CALL,
+    LBRACKET: Precedence.INDEX,
 }
 
 
 class Parser:
-    def __init__(self, lexer: Lexer) -> None:
-        self._lexer = lexer
+    def __init__(self, lexer: Lexer | RegexLexer | TokenBuffer) -> None:
         self._errors: list[str] = []
 
-        self._curr_token: Token | None = None
-        self._peek_token: Token | None = None
+        self._curr_type: TokenType = EOF
+        self._peek_type: TokenType = EOF
+        if isinstance(lexer, TokenBuffer):
+            # Walk the buffer by index so no Token is built per position.
+            self._buffer = lexer
+            self._types = lexer.types
+            self._index = -2
+            self._advance_tokens = self._advance_buffer
+            self._curr_token = self._buffer_token
+            self._curr_literal = self._buffer_literal
+        else:
+            self._lexer = lexer
+            self._curr: Token | None = None
+            self._peek: Token | None = None
         self._advance_tokens()
         self._advance_tokens()
 
         self._prefix_parse_fns = {
             IDENT: self._parse_identifier,
             INT: self._parse_integer_literal,
+            STRING: self._parse_string_literal,
             BANG: self._parse_prefix_expression,
             MINUS: self._parse_prefix_expression,
             TRUE: self._parse_boolean,
             FALSE: self._parse_boolean,
             LPAREN: self._parse_grouped_expression,
             IF: self._parse_if_expression,
+            WHILE: self._parse_while_expression,
+            FOR: self._parse_for_expression,
             FUNCTION: self._parse_function_literal,
+            LBRACKET: self._parse_array_literal,
+            LBRACE: self._parse_hash_literal,
         }
         self._infix_parse_fns = {
             PLUS: self._parse_infix_expression,
@@ -102,6 +134,7 @@ class Parser:
             LT: self._parse_infix_expression,
             GT: self._parse_infix_expression,
             LPAREN: self._parse_call_expression,
+            LBRACKET: self._parse_index_expression,
         }
 
     @property
@@ -114,7 +147,7 @@ class Parser:
         """
         program = Program()
 
-        while self._curr_token and self._curr_token.type != EOF:
+        while self._curr_type != EOF:
             stmt = self._parse_statement()
             if stmt:
                 program.statements.append(stmt)
@@ -129,36 +162,67 @@ class Parser:
         """
         Advances the tokens by one.
         """
-        self._curr_token = self._peek_token
-        self._peek_token = self._lexer.next_token()
+        self._curr = self._peek
+        self._peek = self._lexer.next_token()
+        self._curr_type = self._peek_type
+        self._peek_type = self._peek.type
+
+    def _advance_buffer(self) -> None:
+        """
+        Advances the tokens by one position in the token buffer.
+        """
+        self._index += 1
+        self._curr_type = self._peek_type
+        peek = self._index + 1
+        if peek < len(self._types):
+            self._peek_type = TOKEN_TYPES[self._types[peek]]
+        else:
+            self._peek_type = EOF
+
+    def _curr_token(self) -> Token:
+        """
+        Returns the current token.
+        """
+        return self._curr
+
+    def _curr_literal(self) -> str:
+        """
+        Returns the literal of the current token.
+        """
+        return self._curr.literal
+
+    def _buffer_token(self) -> Token:
+        """
+        Materializes the current token from the token buffer.
+        """
+        return self._buffer.token(self._index)
+
+    def _buffer_literal(self) -> str:
+        """
+        Returns the literal of the current token in the token buffer.
+        """
+        return self._buffer.literal(self._index)
 
     def _parse_statement(self) -> None:
         """
         Parses a statement.
         """
-        if self._curr_token:
-            if self._curr_token.type == LET:
-                return self._parse_let_statement()
-            elif self._curr_token.type == RETURN:
-                return self._parse_return_statement()
+        if self._curr_type == LET:
+            return self._parse_let_statement()
+        elif self._curr_type == RETURN:
+            return self._parse_return_statement()
         return self._parse_expression_statement()
 
     def _parse_let_statement(self) -> LetStatement | None:
         """
         Parses a let statement.
         """
-        if not self._curr_token:
-            return None
-
-        let_token = self._curr_token
+        let_token = self._curr_token()
 
         if not self._expect_peek(IDENT):
             return None
 
-        if not self._curr_token:
-            return None
-
-        name = Identifier(token=self._curr_token, value=self._curr_token.literal)
+        name = Identifier(token=self._curr_token(), value=self._curr_literal())
 
         if not self._expect_peek(ASSIGN):
             return None
@@ -167,7 +231,7 @@ class Parser:
 
         value = self._parse_expression(Precedence.LOWEST)
 
-        if self._peek_token and self._peek_token.type == SEMICOLON:
+        if self._peek_type == SEMICOLON:
             self._advance_tokens()
 
         return LetStatement(token=let_token, name=name, value=value)
@@ -176,16 +240,13 @@ class Parser:
         """
         Parses a return statement.
         """
-        if not self._curr_token:
-            return None
-
-        stmt = ReturnStatement(token=self._curr_token, return_value=None)
+        stmt = ReturnStatement(token=self._curr_token(), return_value=None)
 
         self._advance_tokens()
 
         stmt.return_value = self._parse_expression(Precedence.LOWEST)
 
-        if self._peek_token and self._peek_token.type == SEMICOLON:
+        if self._peek_type == SEMICOLON:
             self._advance_tokens()
 
         return stmt
@@ -194,12 +255,9 @@ class Parser:
         """
         Parses an expression statement.
         """
-        if not self._curr_token:
-            return None
-
-        stmt = ExpressionStatement(token=self._curr_token, expression=self._parse_expression(Precedence.LOWEST))
+        stmt = ExpressionStatement(token=self._curr_token(), expression=self._parse_expression(Precedence.LOWEST))
 
-        if self._peek_token and self._peek_token.type == SEMICOLON:
+        if self._peek_type == SEMICOLON:
             self._advance_tokens()
 
         return stmt
@@ -208,18 +266,15 @@ class Parser:
         """
         Parses an expression.
         """
-        if not self._curr_token:
-            return None
-
-        prefix = self._prefix_parse_fns.get(self._curr_token.type)
+        prefix = self._prefix_parse_fns.get(self._curr_type)
         if not prefix:
-            self._no_prefix_parse_fn_error(self._curr_token.type)
+            self._no_prefix_parse_fn_error(self._curr_type)
             return None
 
         left_exp = prefix()
 
-        while self._peek_token and self._peek_token.type != SEMICOLON and precedence < self._peek_precedence():
-            infix = self._infix_parse_fns.get(self._peek_token.type)
+        while self._peek_type != SEMICOLON and precedence < self._peek_precedence():
+            infix = self._infix_parse_fns.get(self._peek_type)
             if not infix:
                 return left_exp
 
@@ -236,34 +291,32 @@ class Parser:
         """
         Parses an identifier.
         """
-        if not self._curr_token:
-            return None
-        return Identifier(token=self._curr_token, value=self._curr_token.literal)
+        return Identifier(token=self._curr_token(), value=self._curr_literal())
 
     def _parse_integer_literal(self) -> Expression | None:
         """
         Parses an integer literal.
         """
-        if not self._curr_token:
-            return None
-
         try:
-            value = int(self._curr_token.literal)
+            value = int(self._curr_literal())
         except ValueError:
-            msg = f"could not parse {self._curr_token.literal} as integer"
+            msg = f"could not parse {self._curr_literal()} as integer"
             self._errors.append(msg)
             return None
 
-        return IntegerLiteral(token=self._curr_token, value=value)
+        return IntegerLiteral(token=self._curr_token(), value=value)
+
+    def _parse_string_literal(self) -> Expression | None:
+        """
+        Parses a string literal.
+        """
+        return StringLiteral(token=self._curr_token(), value=self._curr_literal())
 
     def _parse_prefix_expression(self) -> Expression | None:
         """
         Parses a prefix expression.
         """
-        if not self._curr_token:
-            return None
-
-        expression_token = self._curr_token
+        expression_token = self._curr_token()
         self._advance_tokens()
         right = self._parse_expression(Precedence.PREFIX)
 
@@ -276,10 +329,7 @@ class Parser:
         """
         Parses an infix expression.
         """
-        if not self._curr_token:
-            return None
-
-        expression_token = self._curr_token
+        expression_token = self._curr_token()
         precedence = self._curr_precedence()
         self._advance_tokens()
         right = self._parse_expression(precedence)
@@ -293,10 +343,7 @@ class Parser:
         """
         Parses a boolean.
         """
-        if not self._curr_token:
-            return None
-
-        return Boolean(token=self._curr_token, value=self._curr_token.type == TRUE)
+        return Boolean(token=self._curr_token(), value=self._curr_type == TRUE)
 
     def _parse_grouped_expression(self) -> Expression | None:
         """
@@ -315,10 +362,7 @@ class Parser:
         """
         Parses an if expression.
         """
-        if not self._curr_token:
-            return None
-
-        expression_token = self._curr_token
+        expression_token = self._curr_token()
 
         if not self._expect_peek(LPAREN):
             return None
@@ -335,7 +379,7 @@ class Parser:
         consequence = self._parse_block_statement()
 
         alternative = None
-        if self._peek_token and self._peek_token.type == ELSE:
+        if self._peek_type == ELSE:
             self._advance_tokens()
 
             if not self._expect_peek(LBRACE):
@@ -345,19 +389,81 @@ class Parser:
 
         return IfExpression(token=expression_token, condition=condition, consequence=consequence, alternative=alternative)
 
-    def _parse_block_statement(self) -> BlockStatement | None:
+    def _parse_while_expression(self) -> Expression | None:
         """
-        Parses a block statement.
+        Parses a while expression.
         """
-        if not self._curr_token:
+        expression_token = self._curr_token()
+
+        if not self._expect_peek(LPAREN):
+            return None
+
+        self._advance_tokens()
+        condition = self._parse_expression(Precedence.LOWEST)
+
+        if not self._expect_peek(RPAREN):
+            return None
+
+        if not self._expect_peek(LBRACE):
+            return None
+
+        body = self._parse_block_statement()
+
+        return WhileExpression(token=expression_token, condition=condition, body=body)
+
+    def _parse_for_expression(self) -> Expression | None:
+        """
+        Parses a for expression over `range(stop)` or `range(start, stop)`.
+        """
+        expression_token = self._curr_token()
+
+        if not self._expect_peek(LPAREN):
+            return None
+
+        if not self._expect_peek(IDENT):
             return None
 
-        block_token = self._curr_token
+        name = Identifier(token=self._curr_token(), value=self._curr_literal())
+
+        if not self._expect_peek(IN):
+            return None
+
+        if not self._expect_peek(IDENT):
+            return None
+
+        if self._curr_literal() != "range":
+            self._errors.append(f"expected range, got {self._curr_literal()} instead")
+            return None
+
+        if not self._expect_peek(LPAREN):
+            return None
+
+        bounds = self._parse_call_arguments()
+        if len(bounds) not in (1, 2):
+            self._errors.append(f"range takes 1 or 2 arguments, got {len(bounds)}")
+            return None
+
+        if not self._expect_peek(RPAREN):
+            return None
+
+        if not self._expect_peek(LBRACE):
+            return None
+
+        body = self._parse_block_statement()
+
+        start = bounds[0] if len(bounds) == 2 else None
+        return ForExpression(token=expression_token, name=name, start=start, stop=bounds[-1], body=body)
+
+    def _parse_block_statement(self) -> BlockStatement | None:
+        """
+        Parses a block statement.
+        """
+        block_token = self._curr_token()
         statements: list[ExpressionStatement] = []
 
         self._advance_tokens()
 
-        while self._curr_token and self._curr_token.type != RBRACE and self._curr_token.type != EOF:
+        while self._curr_type != RBRACE and self._curr_type != EOF:
             stmt = self._parse_statement()
             if stmt:
                 statements.append(stmt)
@@ -369,10 +475,7 @@ class Parser:
         """
         Parses a function literal.
         """
-        if not self._curr_token:
-            return None
-
-        lit_token = self._curr_token
+        lit_token = self._curr_token()
 
         if not self._expect_peek(LPAREN):
             return None
@@ -392,22 +495,20 @@ class Parser:
         """
         identifiers: list[Identifier] = []
 
-        if self._peek_token and self._peek_token.type == RPAREN:
+        if self._peek_type == RPAREN:
             self._advance_tokens()
             return identifiers
 
         self._advance_tokens()
 
-        if self._curr_token:
-            ident = Identifier(token=self._curr_token, value=self._curr_token.literal)
-            identifiers.append(ident)
+        ident = Identifier(token=self._curr_token(), value=self._curr_literal())
+        identifiers.append(ident)
 
-        while self._peek_token and self._peek_token.type == COMMA:
+        while self._peek_type == COMMA:
             self._advance_tokens()
             self._advance_tokens()
-            if self._curr_token:
-                ident = Identifier(token=self._curr_token, value=self._curr_token.literal)
-                identifiers.append(ident)
+            ident = Identifier(token=self._curr_token(), value=self._curr_literal())
+            identifiers.append(ident)
 
         if not self._expect_peek(RPAREN):
             return []
@@ -418,10 +519,7 @@ class Parser:
         """
         Parses a call expression.
         """
-        if not self._curr_token:
-            return None
-
-        exp = CallExpression(token=self._curr_token, function=function, arguments=None)  # type: ignore
+        exp = CallExpression(token=self._curr_token(), function=function, arguments=None)  # type: ignore
         exp.arguments = self._parse_call_arguments()
         return exp
 
@@ -429,28 +527,75 @@ class Parser:
         """
         Parses the arguments of a call expression.
         """
+        return self._parse_expression_list(RPAREN)
+
+    def _parse_array_literal(self) -> Expression | None:
+        """
+        Parses an array literal.
+        """
+        return ArrayLiteral(token=self._curr_token(), elements=self._parse_expression_list(RBRACKET))
+
+    def _parse_hash_literal(self) -> Expression | None:
+        """
+        Parses a hash literal.
+        """
+        token = self._curr_token()
+        pairs: list[tuple[Expression, Expression]] = []
+
+        while self._peek_type != RBRACE:
+            self._advance_tokens()
+            key = self._parse_expression(Precedence.LOWEST)
+            if not self._expect_peek(COLON):
+                return None
+            self._advance_tokens()
+            value = self._parse_expression(Precedence.LOWEST)
+            pairs.append((key, value))
+            if self._peek_type != RBRACE and not self._expect_peek(COMMA):
+                return None
+
+        if not self._expect_peek(RBRACE):
+            return None
+
+        return HashLiteral(token=token, pairs=pairs)
+
+    def _parse_index_expression(self, left: Expression) -> Expression | None:
+        """
+        Parses an index expression.
+        """
+        expression_token = self._curr_token()
+
+        self._advance_tokens()
+        index = self._parse_expression(Precedence.LOWEST)
+
+        if not self._expect_peek(RBRACKET):
+            return None
+
+        return IndexExpression(token=expression_token, left=left, index=index)
+
+    def _parse_expression_list(self, end: TokenType) -> list[Expression]:
+        """
+        Parses comma separated expressions up to the end token.
+        """
         args: list[Expression] = []
 
-        if self._peek_token and self._peek_token.type == RPAREN:
+        if self._peek_type == end:
             self._advance_tokens()
             return args
 
         self._advance_tokens()
 
-        if self._curr_token:
-            arg = self._parse_expression(Precedence.LOWEST)
-            if arg:
-                args.append(arg)
+        arg = self._parse_expression(Precedence.LOWEST)
+        if arg:
+            args.append(arg)
 
-        while self._peek_token and self._peek_token.type == COMMA:
+        while self._peek_type == COMMA:
             self._advance_tokens()
             self._advance_tokens()
-            if self._curr_token:
-                arg = self._parse_expression(Precedence.LOWEST)
-                if arg:
-                    args.append(arg)
+            arg = self._parse_expression(Precedence.LOWEST)
+            if arg:
+                args.append(arg)
 
-        if not self._expect_peek(RPAREN):
+        if not self._expect_peek(end):
             return []
 
         return args
@@ -459,7 +604,7 @@ class Parser:
         """
         Checks if the peek token is of the expected type.
         """
-        if self._peek_token and self._peek_token.type == token_type:
+        if self._peek_type == token_type:
             self._advance_tokens()
             return True
         else:
@@ -470,9 +615,8 @@ class Parser:
         """
         Adds an error to the parser.
         """
-        if self._peek_token:
-            msg = f"expected next token to be {token_type}, got {self._peek_token.type} instead"
-            self._errors.append(msg)
+        msg = f"expected next token to be {token_type}, got {self._peek_type} instead"
+        self._errors.append(msg)
 
     def _no_prefix_parse_fn_error(self, token_type: TokenType) -> None:
         """
@@ -485,14 +629,14 @@ class Parser:
         """
         Returns the precedence of the peek token.
         """
-        if self._peek_token and self._peek_token.type in precedences:
-            return precedences[self._peek_token.type]
+        if self._peek_type in precedences:
+            return precedences[self._peek_type]
         return Precedence.LOWEST
 
     def _curr_precedence(self) -> Precedence:
         """
         Returns the precedence of the current token.
         """
-        if self._curr_token and self._curr_token.type in precedences:
-            return precedences[self._curr_token.type]
+        if self._curr_type in precedences:
+            return precedences[self._curr_type]
         return Precedence.LOWEST
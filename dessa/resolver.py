@@ -0,0 +1,196 @@
+from dessa.ast import (
+    Node,
+    Program,
+    Expression,
+    ExpressionStatement,
+    BlockStatement,
+    ReturnStatement,
+    LetStatement,
+    Identifier,
+    IfExpression,
+    WhileExpression,
+    ForExpression,
+    FunctionLiteral,
+    CallExpression,
+    bound_names,
+    children,
+    walk,
+)
+
+
+class Resolver:
+    """
+    Assigns lexical addresses to identifiers.
+
+    Every function body gets a frame layout mapping its parameters and
+    the names its lets and for loops bind to slots. Names that nested functions may read are
+    laid out in a separate frame of cells instead, which is the only part
+    of a call that its closures keep alive. Each Identifier read is
+    annotated with the number of frames to hop outward (depth) and, when
+    the name belongs to an enclosing function, its slot there. Names that
+    are not bound by any enclosing function keep slot None and are looked
+    up by name in the environment `depth` hops out.
+
+    Functions whose frames no closure captures get the padding that turns
+    a call's argument list into their frame, and closures get the cells
+    they read that hold parameters no let rebinds, which the evaluator
+    specializes their bodies for.
+
+    Calls whose value is the value of the enclosing function, either as
+    the operand of a return or as the last expression of the body, are
+    marked as tail calls.
+    """
+
+    def __init__(self) -> None:
+        # The slots and cells of each enclosing function, innermost last.
+        self._scopes: list[tuple[dict[str, int], dict[str, int]]] = []
+        self._free: dict[int, set[str]] = {}
+
+    def resolve(self, program: Program) -> Program:
+        """Annotates the program in place and returns it."""
+        for statement in program.statements:
+            self._resolve(statement)
+        program.resolved = True
+        return program
+
+    def _resolve(self, node: Node | None) -> None:
+        if node is None:
+            return
+        if isinstance(node, Identifier):
+            self._resolve_identifier(node)
+        elif isinstance(node, LetStatement):
+            self._resolve(node.value)
+            self._resolve_binding(node.name)
+        elif isinstance(node, ForExpression):
+            self._resolve(node.start)
+            self._resolve(node.stop)
+            self._resolve_binding(node.name)
+            self._resolve(node.body)
+        elif isinstance(node, FunctionLiteral):
+            self._resolve_function_literal(node)
+        else:
+            for child in children(node):
+                self._resolve(child)
+
+    def _resolve_binding(self, name: Identifier) -> None:
+        """Addresses a name bound by a let or a for loop in the innermost function."""
+        if self._scopes:
+            slots, cells = self._scopes[-1]
+            if name.value in cells:
+                name.depth = 1
+                name.slot = cells[name.value]
+            else:
+                name.depth = 0
+                name.slot = slots[name.value]
+
+    def _resolve_identifier(self, node: Identifier) -> None:
+        depth = 0
+        for i, (slots, cells) in enumerate(reversed(self._scopes)):
+            # Only the innermost function's own frame is on the chain; the
+            # enclosing ones are reached through their frames of cells.
+            slot = slots.get(node.value) if not i else None
+            if slot is None and cells:
+                depth += 1
+                slot = cells.get(node.value)
+            if slot is not None:
+                node.depth = depth
+                node.slot = slot
+                return
+        node.depth = depth + 1 if self._scopes else 0
+        node.slot = None
+
+    def _resolve_function_literal(self, node: FunctionLiteral) -> None:
+        names: list[str] = []
+        for param in node.parameters:
+            if param.value not in names:
+                names.append(param.value)
+        for name in bound_names(node.body.statements):
+            if name not in names:
+                names.append(name)
+        captured: set[str] = set()
+        for child in _child_functions(node.body):
+            captured |= self._free_names(child)
+        slots: dict[str, int] = {}
+        cells: dict[str, int] = {}
+        for name in names:
+            layout = cells if name in captured else slots
+            layout[name] = len(layout)
+        node.slots = slots
+        node.cells = cells
+        params = [param.value for param in node.parameters]
+        if not cells and names[:len(params)] == params:
+            # No closure can capture the frame, and the parameters take its
+            # first slots, so a call's argument list can become the frame.
+            node.padding = [None] * (len(slots) - len(node.parameters))
+        if cells and len(set(params)) == len(params):
+            # Captured parameters that no let rebinds keep their values for
+            # as long as the closures created by this call live.
+            lets = set(bound_names(node.body.statements))
+            constant = {name for name in params if name in cells and name not in lets}
+            for child in _child_functions(node.body):
+                read = constant & self._free_names(child)
+                if read:
+                    child.constants = sorted(cells[name] for name in read)
+        _mark_tail_calls(node)
+
+        self._scopes.append((slots, cells))
+        for statement in node.body.statements:
+            self._resolve(statement)
+        self._scopes.pop()
+
+    def _free_names(self, node: FunctionLiteral) -> set[str]:
+        """Returns the names a function, or any function inside it, may read from enclosing scopes."""
+        names = self._free.get(id(node))
+        if names is None:
+            names = {n.value for n in walk(node.body.statements) if isinstance(n, Identifier)}
+            for child in _child_functions(node.body):
+                names |= self._free_names(child)
+            # Let-bound names stay: while unbound they are read from outside.
+            names -= {param.value for param in node.parameters}
+            self._free[id(node)] = names
+        return names
+
+
+def resolve(program: Program) -> Program:
+    """Annotates a parsed program with lexical addresses."""
+    return Resolver().resolve(program)
+
+
+def _child_functions(body: BlockStatement) -> list[FunctionLiteral]:
+    """Returns the function literals directly nested in a function body."""
+    return [node for node in walk(body.statements) if isinstance(node, FunctionLiteral)]
+
+
+def _mark_tail_calls(node: FunctionLiteral) -> None:
+    """Marks the calls in tail position of a function body."""
+    _mark_tail_block(node.body)
+    _mark_tail_returns(node.body)
+
+
+def _mark_tail_returns(block: BlockStatement | None) -> None:
+    """Marks the operands of returns whose value goes straight to the caller."""
+    if block is None:
+        return
+    for statement in block.statements:
+        if isinstance(statement, ReturnStatement):
+            _mark_tail_expression(statement.return_value)
+        elif isinstance(statement, ExpressionStatement) and isinstance(statement.expression, IfExpression):
+            # Returns inside an if used as a value are wrapped into that
+            # value instead, so only statement-level ifs are followed.
+            _mark_tail_returns(statement.expression.consequence)
+            _mark_tail_returns(statement.expression.alternative)
+        elif isinstance(statement, ExpressionStatement) and isinstance(statement.expression, (WhileExpression, ForExpression)):
+            _mark_tail_returns(statement.expression.body)
+
+
+def _mark_tail_block(block: BlockStatement | None) -> None:
+    if block and block.statements and isinstance(block.statements[-1], ExpressionStatement):
+        _mark_tail_expression(block.statements[-1].expression)
+
+
+def _mark_tail_expression(node: Expression | None) -> None:
+    if isinstance(node, CallExpression):
+        node.tail = True
+    elif isinstance(node, IfExpression):
+        _mark_tail_block(node.consequence)
+        _mark_tail_block(node.alternative)
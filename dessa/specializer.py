@@ -0,0 +1,129 @@
+import copy
+from dessa.ast import (
+    Node,
+    Expression,
+    ExpressionStatement,
+    PrefixExpression,
+    InfixExpression,
+    IfExpression,
+    WhileExpression,
+    ForExpression,
+    BlockStatement,
+    ReturnStatement,
+    LetStatement,
+    Identifier,
+    FunctionLiteral,
+    CallExpression,
+    ArrayLiteral,
+    HashLiteral,
+    IndexExpression,
+)
+from dessa.environment import Frame
+from dessa.object import Integer, Boolean
+from dessa.optimizer import Optimizer, integer_literal, boolean_literal
+
+# The most bodies kept for one function literal. Past that, new closures
+# share the generic body, like a megamorphic call site.
+MAX_SPECIALIZATIONS = 8
+
+
+def specialize(node: FunctionLiteral, env: Frame) -> BlockStatement:
+    """
+    Returns the body a closure created from a function literal runs.
+
+    The resolver lists the cells of the enclosing call that the literal
+    reads and that are never rebound. When they all hold integers or
+    booleans, the closure gets a copy of the body with those values
+    substituted and constant folded, shared by every closure of the
+    literal created with the same values, so calls read no variables
+    through the enclosing frames for them.
+    """
+    key = []
+    for slot in node.constants:
+        value = env.slot_value(slot)
+        if type(value) is Integer:
+            key.append(value.value)
+        elif type(value) is Boolean:
+            key.append(value)
+        else:
+            return node.body
+    key = tuple(key)
+    specializations = node.specializations
+    if specializations is None:
+        specializations = node.specializations = {}
+    body = specializations.get(key)
+    if body is None:
+        if len(specializations) >= MAX_SPECIALIZATIONS:
+            return node.body
+        body = specializations[key] = _specialize_body(node, env)
+    return body
+
+
+def _specialize_body(node: FunctionLiteral, env: Frame) -> BlockStatement:
+    literals: dict[int, Expression] = {}
+    for slot in node.constants:
+        value = env.slot_value(slot)
+        if type(value) is Integer:
+            literals[slot] = integer_literal(node, value.value)
+        else:
+            literals[slot] = boolean_literal(node, value.value)
+    # Reads of the cells are addressed from inside the literal, one hop to
+    # its environment plus one for each frame of cells on the way.
+    hops = 2 if node.cells else 1
+    function = copy.copy(node)
+    function.body = _copy(node.body, literals, hops)
+    # Folding never inlines: the body is already resolved, and inlined
+    # code would carry addresses from another function.
+    Optimizer(inline_budget=0).optimize_function(function)
+    return function.body
+
+
+def _copy(node: Node | None, literals: dict[int, Expression], hops: int) -> Node | None:
+    """Copies a resolved function body, replacing reads of the constant cells with literals."""
+    if node is None:
+        return None
+    if isinstance(node, Identifier):
+        if node.depth == hops and node.slot in literals:
+            return copy.copy(literals[node.slot])
+        return node
+    original, node = node, copy.copy(node)
+    if isinstance(node, BlockStatement):
+        node.statements = [_copy(s, literals, hops) for s in node.statements]
+        node.origin = original.origin or original
+    elif isinstance(node, ExpressionStatement):
+        node.expression = _copy(node.expression, literals, hops)
+    elif isinstance(node, LetStatement):
+        node.value = _copy(node.value, literals, hops)
+    elif isinstance(node, ReturnStatement):
+        node.return_value = _copy(node.return_value, literals, hops)
+    elif isinstance(node, PrefixExpression):
+        node.right = _copy(node.right, literals, hops)
+    elif isinstance(node, InfixExpression):
+        node.left = _copy(node.left, literals, hops)
+        node.right = _copy(node.right, literals, hops)
+    elif isinstance(node, IfExpression):
+        node.condition = _copy(node.condition, literals, hops)
+        node.consequence = _copy(node.consequence, literals, hops)
+        node.alternative = _copy(node.alternative, literals, hops)
+    elif isinstance(node, WhileExpression):
+        node.condition = _copy(node.condition, literals, hops)
+        node.body = _copy(node.body, literals, hops)
+    elif isinstance(node, ForExpression):
+        node.start = _copy(node.start, literals, hops)
+        node.stop = _copy(node.stop, literals, hops)
+        node.body = _copy(node.body, literals, hops)
+    elif isinstance(node, CallExpression):
+        node.function = _copy(node.function, literals, hops)
+        node.arguments = [_copy(a, literals, hops) for a in node.arguments]
+        node.cache = None
+    elif isinstance(node, ArrayLiteral):
+        node.elements = [_copy(e, literals, hops) for e in node.elements]
+    elif isinstance(node, HashLiteral):
+        node.pairs = [(_copy(k, literals, hops), _copy(v, literals, hops)) for k, v in node.pairs]
+    elif isinstance(node, IndexExpression):
+        node.left = _copy(node.left, literals, hops)
+        node.index = _copy(node.index, literals, hops)
+    elif isinstance(node, FunctionLiteral):
+        node.body = _copy(node.body, literals, hops + (1 if node.cells else 0))
+        node.specializations = None
+    return node
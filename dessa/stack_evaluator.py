@@ -0,0 +1,465 @@
+from dessa.ast import (
+    Node,
+    Program,
+    ExpressionStatement,
+    IntegerLiteral,
+    StringLiteral,
+    Boolean as astBoolean,
+    PrefixExpression,
+    InfixExpression,
+    IfExpression,
+    WhileExpression,
+    ForExpression,
+    BlockStatement,
+    ReturnStatement,
+    LetStatement,
+    Identifier,
+    FunctionLiteral,
+    CallExpression,
+    ArrayLiteral,
+    HashLiteral,
+    IndexExpression,
+)
+from dessa.builtins import BUILTINS
+from dessa.environment import Environment
+from dessa.evaluator import (
+    new_error,
+    _bind,
+    _unbound,
+    _check_arity,
+    _eval_function_literal,
+    _extend_function_env,
+    _eval_string_literal,
+    _eval_infix_expression,
+    _eval_prefix_expression,
+    _eval_range,
+    _eval_index_expression,
+    _new_hash,
+    _Registry,
+)
+from dessa.object import (
+    Object,
+    Array,
+    new_integer,
+    NULL,
+    TRUE,
+    FALSE,
+    ReturnValue,
+    Error,
+    Function,
+    Builtin,
+    new_array,
+)
+from dessa.resolver import resolve
+
+MAX_DEPTH = 100_000
+
+# Continuation kinds. Each continuation is a tuple whose first item is its
+# kind; the rest is whatever it needs once the pending value arrives.
+_PREFIX = 0           # (kind, node)
+_INFIX_LEFT = 1       # (kind, node, env)
+_INFIX_RIGHT = 2      # (kind, node, left)
+_IF = 3               # (kind, node, env)
+_BLOCK = 4            # (kind, node, next statement index, env)
+_RETURN = 5           # (kind,)
+_LET = 6              # (kind, node, env)
+_CALL_FUNCTION = 7    # (kind, node, env)
+_CALL_ARGUMENTS = 8   # (kind, node, env, function, evaluated arguments)
+_FUNCTION = 9         # (kind,)
+_WHILE_CONDITION = 10 # (kind, node, env)
+_WHILE_BODY = 11      # (kind, node, env)
+_FOR_START = 12       # (kind, node, env)
+_FOR_STOP = 13        # (kind, node, env, start)
+_FOR_BODY = 14        # (kind, node, env, iterator over the range)
+_ARRAY = 15           # (kind, node, env, evaluated elements)
+_INDEX_LEFT = 16      # (kind, node, env)
+_INDEX = 17           # (kind, left)
+_HASH = 18            # (kind, keys and values left to evaluate, env, evaluated keys and values)
+_MAP = 19             # (kind, function, elements, results so far)
+_FILTER = 20          # (kind, function, elements, kept elements, index of the element tested)
+_REDUCE = 21          # (kind, function, elements, index of the element folded in)
+
+# Builtins that call back into Dessa, with their arity. Given a Dessa
+# function they run here as continuations, so each callback counts towards
+# max_depth and nests no Python frames.
+_CALLBACK_BUILTINS: dict[Builtin, tuple[int, int]] = {
+    BUILTINS["map"]: (_MAP, 2),
+    BUILTINS["filter"]: (_FILTER, 2),
+    BUILTINS["reduce"]: (_REDUCE, 3),
+}
+
+# The node type each branch of the descent matches. dessa.evaluator quickens
+# nodes into subclasses of these, so a node is matched by the type it
+# specializes; unknown types resolve to something no branch matches.
+_NODE_TYPES: dict[type, object] = _Registry({
+    node_type: node_type
+    for node_type in (
+        ExpressionStatement,
+        IntegerLiteral,
+        StringLiteral,
+        Identifier,
+        InfixExpression,
+        CallExpression,
+        IfExpression,
+        WhileExpression,
+        ForExpression,
+        BlockStatement,
+        ReturnStatement,
+        LetStatement,
+        PrefixExpression,
+        astBoolean,
+        FunctionLiteral,
+        ArrayLiteral,
+        HashLiteral,
+        IndexExpression,
+    )
+})
+
+
+class StackEvaluator:
+    """
+    Evaluates programs without recursing in Python.
+
+    Pending work is kept as a list of continuations on the heap, so the
+    depth of Dessa recursion is bounded by `max_depth` rather than by
+    Python's recursion limit. Exceeding it produces a Dessa Error. Results
+    and errors are the same as dessa.evaluator.eval, and calls in tail
+    position reuse their caller's frame.
+    """
+
+    def __init__(self, max_depth: int = MAX_DEPTH) -> None:
+        self.max_depth = max_depth
+        # The depth of the evaluation that last called a builtin, for _apply.
+        self._depth = 0
+
+    def run(self, program: Program, env: Environment) -> Object | None:
+        """Evaluates a program and returns its value."""
+        if not program.resolved:
+            resolve(program)
+        result: Object | None = None
+        for statement in program.statements:
+            result = self._eval(statement, env)
+            if isinstance(result, ReturnValue):
+                return result.value
+            elif isinstance(result, Error):
+                return result
+        return result
+
+    def _eval(self, node: Node, env: Environment, depth: int = 0) -> Object | None:
+        """Evaluates a node; with a depth of calls already running, node is the body of one more."""
+        stack: list[tuple] = []
+        push = stack.append
+        pop = stack.pop
+        if depth:
+            push((_FUNCTION,))
+        max_depth = self.max_depth
+
+        while True:
+            # Descend into the node until it produces a value.
+            node_type = _NODE_TYPES[type(node)]
+            if node_type is ExpressionStatement:
+                node = node.expression
+                continue
+            elif node_type is IntegerLiteral:
+                value = node.constant
+                if value is None:
+                    value = node.constant = new_integer(node.value)
+            elif node_type is StringLiteral:
+                value = _eval_string_literal(node, env)
+            elif node_type is Identifier:
+                if not node.depth:
+                    if node.slot is not None:
+                        value = env.get_local(node.slot, node.value)
+                    else:
+                        value = env.get(node.value)
+                else:
+                    value = env.get_at(node.depth, node.slot, node.value)
+                if value is None:
+                    value = _unbound(node.value)
+            elif node_type is InfixExpression:
+                push((_INFIX_LEFT, node, env))
+                node = node.left
+                continue
+            elif node_type is CallExpression:
+                push((_CALL_FUNCTION, node, env))
+                node = node.function
+                continue
+            elif node_type is IfExpression:
+                push((_IF, node, env))
+                node = node.condition
+                continue
+            elif node_type is WhileExpression:
+                push((_WHILE_CONDITION, node, env))
+                node = node.condition
+                continue
+            elif node_type is ForExpression:
+                if node.start:
+                    push((_FOR_START, node, env))
+                    node = node.start
+                else:
+                    push((_FOR_STOP, node, env, new_integer(0)))
+                    node = node.stop
+                continue
+            elif node_type is BlockStatement:
+                if not node.statements:
+                    value = None
+                else:
+                    if len(node.statements) > 1:
+                        push((_BLOCK, node, 1, env))
+                    node = node.statements[0]
+                    continue
+            elif node_type is ReturnStatement:
+                push((_RETURN,))
+                node = node.return_value
+                continue
+            elif node_type is LetStatement:
+                push((_LET, node, env))
+                node = node.value
+                continue
+            elif node_type is PrefixExpression:
+                push((_PREFIX, node))
+                node = node.right
+                continue
+            elif node_type is astBoolean:
+                value = TRUE if node.value else FALSE
+            elif node_type is FunctionLiteral:
+                value = _eval_function_literal(node, env)
+            elif node_type is ArrayLiteral:
+                if not node.elements:
+                    value = new_array([])
+                else:
+                    push((_ARRAY, node, env, []))
+                    node = node.elements[0]
+                    continue
+            elif node_type is HashLiteral:
+                if not node.pairs:
+                    value = _new_hash([])
+                else:
+                    children = [child for pair in node.pairs for child in pair]
+                    push((_HASH, children, env, []))
+                    node = children[0]
+                    continue
+            elif node_type is IndexExpression:
+                push((_INDEX_LEFT, node, env))
+                node = node.left
+                continue
+            else:
+                value = None
+
+            # Hand the value to pending continuations until one of them
+            # has another node to evaluate.
+            while True:
+                if type(value) is Error:
+                    return value
+                if not stack:
+                    return value
+                frame = pop()
+                kind = frame[0]
+
+                if kind == _BLOCK:
+                    if value is not None and isinstance(value, ReturnValue):
+                        continue
+                    block, index, env = frame[1], frame[2], frame[3]
+                    statements = block.statements
+                    if index < len(statements) - 1:
+                        push((_BLOCK, block, index + 1, env))
+                    node = statements[index]
+                    break
+                elif kind == _INFIX_LEFT:
+                    node, env = frame[1], frame[2]
+                    push((_INFIX_RIGHT, node, value))
+                    node = node.right
+                    break
+                elif kind == _INFIX_RIGHT:
+                    value = _eval_infix_expression(frame[1].operator, frame[2], value)
+                elif kind == _FUNCTION:
+                    depth -= 1
+                    if isinstance(value, ReturnValue):
+                        value = value.value
+                elif kind == _CALL_FUNCTION:
+                    call, env = frame[1], frame[2]
+                    if call.arguments:
+                        push((_CALL_ARGUMENTS, call, env, value, []))
+                        node = call.arguments[0]
+                        break
+                    function, args = value, []
+                elif kind == _CALL_ARGUMENTS:
+                    call, env, function, args = frame[1], frame[2], frame[3], frame[4]
+                    args.append(value)
+                    if len(args) < len(call.arguments):
+                        push(frame)
+                        node = call.arguments[len(args)]
+                        break
+                elif kind == _IF:
+                    if_expression, env = frame[1], frame[2]
+                    if value is not NULL and value is not FALSE:
+                        node = if_expression.consequence
+                        break
+                    elif if_expression.alternative:
+                        node = if_expression.alternative
+                        break
+                    value = NULL
+                elif kind == _WHILE_CONDITION:
+                    loop, env = frame[1], frame[2]
+                    if value is not NULL and value is not FALSE:
+                        push((_WHILE_BODY, loop, env))
+                        node = loop.body
+                        break
+                    value = NULL
+                elif kind == _WHILE_BODY:
+                    if value is not None and isinstance(value, ReturnValue):
+                        continue
+                    loop, env = frame[1], frame[2]
+                    push((_WHILE_CONDITION, loop, env))
+                    node = loop.condition
+                    break
+                elif kind == _FOR_START:
+                    loop, env = frame[1], frame[2]
+                    push((_FOR_STOP, loop, env, value))
+                    node = loop.stop
+                    break
+                elif kind == _FOR_STOP:
+                    bounds = _eval_range(frame[3], value)
+                    if type(bounds) is Error:
+                        return bounds
+                    loop, env, iterator = frame[1], frame[2], iter(bounds)
+                elif kind == _FOR_BODY:
+                    if value is not None and isinstance(value, ReturnValue):
+                        continue
+                    loop, env, iterator = frame[1], frame[2], frame[3]
+                elif kind == _ARRAY:
+                    literal, env, elements = frame[1], frame[2], frame[3]
+                    elements.append(value)
+                    if len(elements) < len(literal.elements):
+                        push(frame)
+                        node = literal.elements[len(elements)]
+                        break
+                    value = new_array(elements)
+                elif kind == _HASH:
+                    children, env, items = frame[1], frame[2], frame[3]
+                    items.append(value)
+                    if len(items) < len(children):
+                        push(frame)
+                        node = children[len(items)]
+                        break
+                    value = _new_hash(items)
+                elif kind == _INDEX_LEFT:
+                    node, env = frame[1], frame[2]
+                    push((_INDEX, value))
+                    node = node.index
+                    break
+                elif kind == _INDEX:
+                    value = _eval_index_expression(frame[1], value)
+                elif kind == _MAP:
+                    function, elements, results = frame[1], frame[2], frame[3]
+                    results.append(value)
+                    if len(results) == len(elements):
+                        value = new_array(results)
+                        continue
+                    push(frame)
+                    args = [elements[len(results)]]
+                elif kind == _FILTER:
+                    function, elements, kept, index = frame[1], frame[2], frame[3], frame[4]
+                    if value is not NULL and value is not FALSE:
+                        kept.append(elements[index])
+                    index += 1
+                    if index == len(elements):
+                        value = new_array(kept)
+                        continue
+                    push((_FILTER, function, elements, kept, index))
+                    args = [elements[index]]
+                elif kind == _REDUCE:
+                    function, elements, index = frame[1], frame[2], frame[3] + 1
+                    if index == len(elements):
+                        continue
+                    push((_REDUCE, function, elements, index))
+                    args = [value, elements[index]]
+                elif kind == _RETURN:
+                    value = ReturnValue(value=value)
+                elif kind == _LET:
+                    name, env = frame[1].name, frame[2]
+                    if name.slot is None:
+                        env.set(name.value, value)
+                    elif name.depth:
+                        env.set_at(name.depth, name.slot, value)
+                    else:
+                        env.set_local(name.slot, value)
+                    value = None
+                else:
+                    value = _eval_prefix_expression(frame[1].operator, value)
+
+                if kind == _FOR_STOP or kind == _FOR_BODY:
+                    count = next(iterator, None)
+                    if count is None:
+                        value = NULL
+                        continue
+                    _bind(loop.name, new_integer(count), env)
+                    push((_FOR_BODY, loop, env, iterator))
+                    node = loop.body
+                    break
+                elif kind == _CALL_FUNCTION or kind == _CALL_ARGUMENTS or kind >= _MAP:
+                    tail = kind < _MAP and call.tail
+                    if type(function) is Builtin:
+                        callback = _CALLBACK_BUILTINS.get(function)
+                        if (
+                            callback is None
+                            or len(args) != callback[1]
+                            or type(args[0]) is not Array
+                            or type(args[-1]) is not Function
+                        ):
+                            self._depth = depth
+                            value = function.fn(args, self._apply)
+                            continue
+                        kind, elements, function = callback[0], args[0].objects(), args[-1]
+                        if not elements:
+                            value = args[1] if kind == _REDUCE else new_array([])
+                            continue
+                        if kind == _MAP:
+                            push((_MAP, function, elements, []))
+                            args = [elements[0]]
+                        elif kind == _FILTER:
+                            push((_FILTER, function, elements, [], 0))
+                            args = [elements[0]]
+                        else:
+                            push((_REDUCE, function, elements, 0))
+                            args = [args[1], elements[0]]
+                        tail = False
+                    if not isinstance(function, Function):
+                        return new_error(f"not a function: {function.object_type()}")
+                    error = _check_arity(function, len(args))
+                    if error is not None:
+                        return error
+                    if tail and depth:
+                        # The callee's value is the caller's value, so it can
+                        # take over the caller's frame.
+                        while stack[-1][0] != _FUNCTION:
+                            pop()
+                    else:
+                        if depth >= max_depth:
+                            return new_error("stack overflow")
+                        depth += 1
+                        push((_FUNCTION,))
+                    env = _extend_function_env(function, args)
+                    node = function.body
+                    break
+
+    def _apply(self, fn: Object, args: list[Object]) -> Object | None:
+        """Applies a function for a builtin, evaluating its body on a stack of its own."""
+        if type(fn) is Builtin:
+            return fn.fn(args, self._apply)
+        if not isinstance(fn, Function):
+            return new_error(f"not a function: {fn.object_type()}")
+        error = _check_arity(fn, len(args))
+        if error is not None:
+            return error
+        depth = self._depth
+        if depth >= self.max_depth:
+            return new_error("stack overflow")
+        value = self._eval(fn.body, _extend_function_env(fn, args), depth + 1)
+        self._depth = depth
+        return value
+
+
+def run(program: Program, env: Environment) -> Object | None:
+    """Evaluates a program without recursing in Python."""
+    return StackEvaluator().run(program, env)
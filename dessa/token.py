@@ -9,6 +9,7 @@ EOF     = "EOF"      # End of File
 # Identifiers + literals
 IDENT = "IDENT"  # add, foobar, x, y, ...
 INT   = "INT"    # 1343456
+STRING = "STRING"  # "foo bar", without the quotes
 
 # Operators
 ASSIGN   = "="
@@ -25,10 +26,13 @@ NOT_EQ   = "!="
 # Delimiters
 COMMA     = ","
 SEMICOLON = ";"
+COLON     = ":"
 LPAREN    = "("
 RPAREN    = ")"
 LBRACE    = "{"
 RBRACE    = "}"
+LBRACKET  = "["
+RBRACKET  = "]"
 
 # Keywords
 FUNCTION = "FUNCTION"
@@ -38,6 +42,23 @@ FALSE    = "FALSE"
 IF       = "IF"
 ELSE     = "ELSE"
 RETURN   = "RETURN"
+WHILE    = "WHILE"
+FOR      = "FOR"
+IN       = "IN"
+
+# Every token type in a fixed order. A type's index is its small-integer
+# code in compact token buffers.
+TOKEN_TYPES: list[TokenType] = [
+    ILLEGAL, EOF, IDENT, INT,
+    ASSIGN, PLUS, MINUS, BANG, ASTERISK, SLASH, LT, GT, EQ, NOT_EQ,
+    COMMA, SEMICOLON, LPAREN, RPAREN, LBRACE, RBRACE,
+    FUNCTION, LET, TRUE, FALSE, IF, ELSE, RETURN, WHILE, FOR, IN,
+    LBRACKET, RBRACKET, COLON, STRING,
+]
+
+TOKEN_CODES: dict[TokenType, int] = {
+    token_type: code for code, token_type in enumerate(TOKEN_TYPES)
+}
 
 
 @dataclass
@@ -56,6 +77,9 @@ keywords: dict[str, TokenType] = {
     "if": IF,
     "else": ELSE,
     "return": RETURN,
+    "while": WHILE,
+    "for": FOR,
+    "in": IN,
 }
 
 def lookup_ident(ident: str) -> TokenType:
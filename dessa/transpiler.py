@@ -0,0 +1,767 @@
+from __future__ import annotations
+import ast as pyast
+import hashlib
+from types import CodeType
+from dessa.ast import (
+    Node,
+    Program,
+    ExpressionStatement,
+    IntegerLiteral,
+    StringLiteral,
+    Boolean as astBoolean,
+    PrefixExpression,
+    InfixExpression,
+    IfExpression,
+    WhileExpression,
+    ForExpression,
+    BlockStatement,
+    ReturnStatement,
+    LetStatement,
+    Identifier,
+    FunctionLiteral,
+    CallExpression,
+    ArrayLiteral,
+    HashLiteral,
+    IndexExpression,
+    bound_names,
+    children,
+)
+from dessa.builtins import BUILTINS
+from dessa.environment import Environment
+from dessa.evaluator import (
+    new_error,
+    _apply_function,
+    _eval_infix_expression,
+    _eval_prefix_expression,
+    _eval_range,
+    _eval_index_expression,
+    _new_hash,
+)
+from dessa.inference import INTEGER, BOOLEAN, infer
+from dessa.lexer import Lexer
+from dessa.object import (
+    Object,
+    ObjectType,
+    Integer,
+    new_integer,
+    NULL,
+    TRUE,
+    FALSE,
+    ReturnValue,
+    Error,
+    Function,
+    Builtin,
+    String,
+    new_array,
+)
+from dessa.parser import Parser
+
+# Generated helper names start with "_0". Dessa identifiers cannot contain
+# digits, so they can never collide with the mangled user names below.
+_MAIN = "_0main"
+_CODE_CACHE_SIZE = 128
+
+_CODE_CACHE: dict[str, CodeType] = {}
+
+
+class _Abort(Exception):
+    """Unwinds transpiled code with a Dessa runtime error."""
+
+    def __init__(self, error: Error) -> None:
+        self.error = error
+
+
+class TranspiledFunction(Object):
+    """Represents a Dessa function compiled to a Python function."""
+    __slots__ = ("call", "arity", "source")
+
+    def __init__(self, call, arity: int, source: str) -> None:
+        self.call = call
+        self.arity = arity
+        self.source = source
+
+    def object_type(self) -> ObjectType:
+        return "FUNCTION"
+
+    def inspect(self) -> str:
+        return self.source
+
+
+def _applier(fn: Object):
+    """Returns a callable for a call site that could not take the fast path."""
+    return lambda *args: _call(fn, list(args))
+
+
+def _call(fn: Object, args: list[Object]) -> Object | None:
+    if type(fn) is TranspiledFunction:
+        if len(args) < fn.arity:
+            raise _Abort(new_error(f"wrong number of arguments: want={fn.arity}, got={len(args)}"))
+        return fn.call(*args[:fn.arity])
+    if type(fn) is Builtin:
+        return _check(fn.fn(args, _call))
+    if not isinstance(fn, Function):
+        raise _Abort(new_error(f"not a function: {fn.object_type()}"))
+    return _check(_apply_function(fn, args))
+
+
+def _infix(operator: str, left: Object | None, right: Object | None) -> Object:
+    return _check(_eval_infix_expression(operator, left, right))
+
+
+def _prefix(operator: str, right: Object | None) -> Object:
+    return _check(_eval_prefix_expression(operator, right))
+
+
+def _range(start: Object | None, stop: Object | None) -> range:
+    return _check(_eval_range(start, stop))
+
+
+def _hash(items: list[Object]) -> Object:
+    return _check(_new_hash(items))
+
+
+def _index(left: Object | None, index: Object | None) -> Object:
+    return _check(_eval_index_expression(left, index))
+
+
+def _check(result: Object) -> Object:
+    if isinstance(result, Error):
+        raise _Abort(result)
+    return result
+
+
+_RUNTIME = {
+    "_0Integer": Integer,
+    "_0int": new_integer,
+    "_0str": String,
+    "_0TRUE": TRUE,
+    "_0FALSE": FALSE,
+    "_0NULL": NULL,
+    "_0ReturnValue": ReturnValue,
+    "_0Function": TranspiledFunction,
+    "_0applier": _applier,
+    "_0infix": _infix,
+    "_0prefix": _prefix,
+    "_0range": _range,
+    "_0array": new_array,
+    "_0hash": _hash,
+    "_0index": _index,
+}
+
+_INTEGER_OPERATORS = {
+    "+": pyast.Add,
+    "-": pyast.Sub,
+    "*": pyast.Mult,
+    "/": pyast.FloorDiv,
+}
+
+_COMPARISON_OPERATORS = {
+    "<": pyast.Lt,
+    ">": pyast.Gt,
+    "==": pyast.Eq,
+    "!=": pyast.NotEq,
+}
+
+
+def _mangle(depth: int, name: str) -> str:
+    """Maps a Dessa name bound at a function depth to a Python identifier."""
+    if name.isascii():
+        return f"v{depth}_{name}"
+    return f"w{depth}_{name.encode().hex()}"
+
+
+def _demangle(name: str) -> str | None:
+    """Recovers a Dessa global name from its Python identifier."""
+    if name.startswith("v0_"):
+        return name[3:]
+    if name.startswith("w0_"):
+        return bytes.fromhex(name[3:]).decode()
+    return None
+
+
+class _Context:
+    """Where the value of a block goes and what a return statement does."""
+
+    def __init__(self, sink: str | None, returns: str | None) -> None:
+        # sink: None returns the value from the Python function, "" discards
+        # it, anything else names the temporary that receives it.
+        self.sink = sink
+        # returns: None returns from the Python function, otherwise the
+        # temporary that receives a ReturnValue before breaking out.
+        self.returns = returns
+
+    def discarding(self) -> _Context:
+        return _Context("", self.returns)
+
+
+class _Scope:
+    """The Python function that a Dessa function body becomes."""
+
+    def __init__(self, outer: _Scope | None, depth: int) -> None:
+        self.outer = outer
+        self.depth = depth
+        self.declared: set[str] = set()
+        self.parameters: set[str] = set()
+        self.prelude: list[pyast.stmt] = []
+        self.temps = 0
+
+
+class _Transpiler:
+    """Translates a Dessa Program into a Python module."""
+
+    def __init__(self) -> None:
+        self._scope = _Scope(None, 0)
+        self._constants: dict[int | str, str] = {}
+        self._functions = 0
+
+    def transpile(self, program: Program) -> pyast.Module:
+        body = self._block(program.statements, _Context(None, None))
+        constants = [
+            _assign(name, _call_expr("_0int" if type(value) is int else "_0str", pyast.Constant(value)))
+            for value, name in self._constants.items()
+        ]
+        main = pyast.FunctionDef(
+            name=_MAIN,
+            args=_arguments([]),
+            body=constants + self._scope.prelude + body,
+            decorator_list=[],
+            returns=None,
+        )
+        module = pyast.Module(body=[main], type_ignores=[])
+        return pyast.fix_missing_locations(module)
+
+    def _temp(self) -> str:
+        self._scope.temps += 1
+        return f"_0t{self._scope.temps}"
+
+    def _block(self, statements: list, ctx: _Context) -> list[pyast.stmt]:
+        """Translates statements whose last value goes to the context's sink."""
+        out: list[pyast.stmt] = []
+        if not statements:
+            return self._sink(ctx, pyast.Constant(None))
+        last = len(statements) - 1
+        for i, statement in enumerate(statements):
+            if isinstance(statement, ExpressionStatement):
+                expression = statement.expression
+                if isinstance(expression, IfExpression):
+                    out += self._if_statement(expression, ctx if i == last else ctx.discarding())
+                    continue
+                if isinstance(expression, (WhileExpression, ForExpression)):
+                    out += self._loop_statement(expression, ctx if i == last else ctx.discarding())
+                    continue
+                pre, value = self._expression(expression)
+                out += pre
+                sink = ctx if i == last else ctx.discarding()
+                if _may_be_return_value(expression):
+                    out += self._statement_value(sink, value)
+                else:
+                    out += self._sink(sink, value)
+            elif isinstance(statement, LetStatement):
+                pre, value = self._expression(statement.value)
+                out += pre
+                out += self._store(statement.name.value, value)
+                if i == last:
+                    out += self._sink(ctx, pyast.Constant(None))
+            elif isinstance(statement, ReturnStatement):
+                pre, value = self._expression(statement.return_value)
+                out += pre
+                if ctx.returns is None:
+                    out.append(pyast.Return(value))
+                else:
+                    wrapped = _call_expr("_0ReturnValue", value)
+                    out += [_assign(ctx.returns, wrapped), pyast.Break()]
+                break
+            else:
+                raise TypeError(f"cannot transpile {type(statement).__name__}")
+        return out
+
+    def _sink(self, ctx: _Context, value: pyast.expr) -> list[pyast.stmt]:
+        if ctx.sink is None:
+            return [pyast.Return(value)]
+        if ctx.sink == "":
+            return [pyast.Expr(value)]
+        return [_assign(ctx.sink, value)]
+
+    def _statement_value(self, ctx: _Context, value: pyast.expr) -> list[pyast.stmt]:
+        """Sinks a statement's value, passing a ReturnValue on as the tree-walker does."""
+        if ctx.sink:
+            # The value of an if or loop used as a value, ReturnValue or not.
+            return [_assign(ctx.sink, value)]
+        temp = self._temp()
+        test = _is(_call_expr("type", _walrus(temp, value)), _load("_0ReturnValue"))
+        if ctx.sink is None:
+            return [pyast.Return(pyast.IfExp(test=test, body=_value(temp), orelse=_load(temp)))]
+        if ctx.returns is None:
+            passed: list[pyast.stmt] = [pyast.Return(_value(temp))]
+        else:
+            passed = [_assign(ctx.returns, _load(temp)), pyast.Break()]
+        return [pyast.If(test=test, body=passed, orelse=[])]
+
+    def _if_statement(self, node: IfExpression, ctx: _Context) -> list[pyast.stmt]:
+        pre, condition = self._expression(node.condition)
+        consequence = self._block(node.consequence.statements, ctx)
+        if node.alternative:
+            alternative = self._block(node.alternative.statements, ctx)
+        else:
+            alternative = self._sink(ctx, _load("_0NULL"))
+        return pre + [pyast.If(test=self._falsy(condition), body=alternative, orelse=consequence)]
+
+    def _loop_statement(self, node: WhileExpression | ForExpression, ctx: _Context) -> list[pyast.stmt]:
+        # Returns leave the Python function directly unless they go to a
+        # temporary, in which case they break out of every loop on the way.
+        body = self._block(node.body.statements, ctx.discarding())
+        out: list[pyast.stmt] = []
+        if isinstance(node, WhileExpression):
+            pre, condition = self._expression(node.condition)
+            if pre:
+                body = pre + [pyast.If(test=self._falsy(condition), body=[pyast.Break()], orelse=[])] + body
+                test: pyast.expr = pyast.Constant(True)
+            else:
+                test = pyast.UnaryOp(pyast.Not(), self._falsy(condition))
+            loop: pyast.stmt = pyast.While(test=test, body=body, orelse=[])
+        else:
+            start = node.start or IntegerLiteral(token=node.token, value=0)
+            out, (start, stop) = self._expressions([start, node.stop])
+            temp = self._temp()
+            body = self._store(node.name.value, _call_expr("_0int", _load(temp))) + body
+            loop = pyast.For(
+                target=_store_name(temp),
+                iter=_call_expr("_0range", start, stop),
+                body=body,
+                orelse=[],
+            )
+        if ctx.returns is not None and _may_return(node):
+            out.append(_assign(ctx.returns, pyast.Constant(None)))
+            out.append(loop)
+            returned = pyast.Compare(_load(ctx.returns), [pyast.IsNot()], [pyast.Constant(None)])
+            out.append(pyast.If(test=returned, body=[pyast.Break()], orelse=[]))
+        else:
+            out.append(loop)
+        return out + self._sink(ctx, _load("_0NULL"))
+
+    def _falsy(self, condition: pyast.expr) -> pyast.expr:
+        """Builds a test that is true when the condition is FALSE or NULL."""
+        temp = self._temp()
+        return pyast.BoolOp(op=pyast.Or(), values=[
+            _is(_walrus(temp, condition), _load("_0FALSE")),
+            _is(_load(temp), _load("_0NULL")),
+        ])
+
+    def _store(self, name: str, value: pyast.expr) -> list[pyast.stmt]:
+        if self._scope.depth == 0:
+            return [pyast.Expr(_call_expr("_0set", pyast.Constant(name), value))]
+        return [_assign(_mangle(self._scope.depth, name), value)]
+
+    def _expression(self, node: Node) -> tuple[list[pyast.stmt], pyast.expr]:
+        """Translates an expression into the statements it needs and its value."""
+        if isinstance(node, IntegerLiteral):
+            return [], _load(self._constant(node.value))
+        elif isinstance(node, StringLiteral):
+            return [], _load(self._constant(node.value))
+        elif isinstance(node, astBoolean):
+            return [], _load("_0TRUE" if node.value else "_0FALSE")
+        elif isinstance(node, Identifier):
+            return [], self._load_identifier(node.value)
+        elif isinstance(node, PrefixExpression):
+            pre, right = self._expression(node.right)
+            return pre, self._prefix(node.operator, right, node.operand_type)
+        elif isinstance(node, InfixExpression):
+            pre, (left, right) = self._expressions([node.left, node.right])
+            return pre, self._infix(node.operator, left, right, node.operand_type)
+        elif isinstance(node, IfExpression):
+            return self._if_expression(node)
+        elif isinstance(node, (WhileExpression, ForExpression)):
+            return self._loop_expression(node)
+        elif isinstance(node, FunctionLiteral):
+            return [], self._function_literal(node)
+        elif isinstance(node, CallExpression):
+            pre, values = self._expressions([node.function] + node.arguments)
+            return pre, self._call(values[0], values[1:])
+        elif isinstance(node, ArrayLiteral):
+            pre, values = self._expressions(node.elements)
+            return pre, _call_expr("_0array", pyast.List(values, pyast.Load()))
+        elif isinstance(node, HashLiteral):
+            pre, values = self._expressions([child for pair in node.pairs for child in pair])
+            return pre, _call_expr("_0hash", pyast.List(values, pyast.Load()))
+        elif isinstance(node, IndexExpression):
+            pre, (left, index) = self._expressions([node.left, node.index])
+            return pre, _call_expr("_0index", left, index)
+        raise TypeError(f"cannot transpile {type(node).__name__}")
+
+    def _expressions(self, nodes: list) -> tuple[list[pyast.stmt], list[pyast.expr]]:
+        """
+        Translates sibling expressions, spilling earlier siblings to
+        temporaries when a later one needs statements, so that evaluation
+        order matches the tree-walker.
+        """
+        translated = [self._expression(node) for node in nodes]
+        last_with_statements = max(
+            (i for i, (pre, _) in enumerate(translated) if pre), default=-1
+        )
+        out: list[pyast.stmt] = []
+        values: list[pyast.expr] = []
+        for i, (pre, value) in enumerate(translated):
+            out += pre
+            if i < last_with_statements and not isinstance(value, pyast.Constant):
+                temp = self._temp()
+                out.append(_assign(temp, value))
+                value = _load(temp)
+            values.append(value)
+        return out, values
+
+    def _constant(self, value: int | str) -> str:
+        name = self._constants.get(value)
+        if name is None:
+            name = f"_0k{len(self._constants)}"
+            self._constants[value] = name
+        return name
+
+    def _load_identifier(self, name: str) -> pyast.expr:
+        """
+        Mirrors Environment.get: the innermost bound name wins. Parameters
+        are always bound; let bindings may not have run yet, so they fall
+        back to enclosing scopes and finally to the globals.
+        """
+        candidates: list[str] = []
+        scope = self._scope
+        definite = False
+        while scope is not None and scope.depth > 0:
+            if name in scope.declared:
+                candidates.append(_mangle(scope.depth, name))
+                if name in scope.parameters:
+                    definite = True
+                    break
+            scope = scope.outer
+        if not definite:
+            candidates.append(_mangle(0, name))
+
+        value: pyast.expr = _load(candidates[-1])
+        for candidate in reversed(candidates[:-1]):
+            value = pyast.IfExp(
+                test=pyast.Compare(_load(candidate), [pyast.IsNot()], [pyast.Constant(None)]),
+                body=_load(candidate),
+                orelse=value,
+            )
+        return value
+
+    def _prefix(self, operator: str, right: pyast.expr, operand_type: str | None) -> pyast.expr:
+        if operator == "!":
+            return pyast.IfExp(
+                test=self._falsy(right),
+                body=_load("_0TRUE"),
+                orelse=_load("_0FALSE"),
+            )
+        if operator == "-" and operand_type == INTEGER:
+            return _call_expr("_0int", pyast.UnaryOp(pyast.USub(), _attribute(right, "value")))
+        if operator == "-":
+            temp = self._temp()
+            return pyast.IfExp(
+                test=_is(_call_expr("type", _walrus(temp, right)), _load("_0Integer")),
+                body=_call_expr("_0int", pyast.UnaryOp(pyast.USub(), _value(temp))),
+                orelse=_call_expr("_0prefix", pyast.Constant(operator), _load(temp)),
+            )
+        return _call_expr("_0prefix", pyast.Constant(operator), right)
+
+    def _infix(self, operator: str, left: pyast.expr, right: pyast.expr, operand_type: str | None) -> pyast.expr:
+        if operand_type == INTEGER:
+            # Both operands are proven integers, so they need no type test.
+            return _integer_infix(operator, _attribute(left, "value"), _attribute(right, "value"))
+        if operand_type == BOOLEAN:
+            test = pyast.Compare(left, [pyast.Is() if operator == "==" else pyast.IsNot()], [right])
+            return pyast.IfExp(test=test, body=_load("_0TRUE"), orelse=_load("_0FALSE"))
+        if operator not in _INTEGER_OPERATORS and operator not in _COMPARISON_OPERATORS:
+            return _call_expr("_0infix", pyast.Constant(operator), left, right)
+        left_temp = self._temp()
+        right_temp = self._temp()
+        fast = _integer_infix(operator, _value(left_temp), _value(right_temp))
+        # type(a) is type(b) is Integer evaluates both operands before the
+        # chained comparison can short-circuit.
+        test = pyast.Compare(
+            _call_expr("type", _walrus(left_temp, left)),
+            [pyast.Is(), pyast.Is()],
+            [_call_expr("type", _walrus(right_temp, right)), _load("_0Integer")],
+        )
+        slow = _call_expr("_0infix", pyast.Constant(operator), _load(left_temp), _load(right_temp))
+        return pyast.IfExp(test=test, body=fast, orelse=slow)
+
+    def _if_expression(self, node: IfExpression) -> tuple[list[pyast.stmt], pyast.expr]:
+        pre, condition = self._expression(node.condition)
+        if not _needs_statements(node):
+            branches = [self._expression(node.consequence.statements[0].expression)[1]]
+            if node.alternative:
+                branches.append(self._expression(node.alternative.statements[0].expression)[1])
+            else:
+                branches.append(_load("_0NULL"))
+            return pre, pyast.IfExp(
+                test=self._falsy(condition),
+                body=branches[1],
+                orelse=branches[0],
+            )
+
+        temp = self._temp()
+        statements: list[pyast.stmt] = [pyast.If(
+            test=self._falsy(condition),
+            body=self._value_block(node.alternative, temp),
+            orelse=self._value_block(node.consequence, temp),
+        )]
+        if _may_return(node):
+            # A return inside an if used as a value does not leave the
+            # function in the tree-walker; the ReturnValue becomes the value.
+            statements = [pyast.While(
+                test=pyast.Constant(True),
+                body=statements + [pyast.Break()],
+                orelse=[],
+            )]
+        return pre + statements, _load(temp)
+
+    def _loop_expression(self, node: WhileExpression | ForExpression) -> tuple[list[pyast.stmt], pyast.expr]:
+        temp = self._temp()
+        statements = self._loop_statement(node, _Context(temp, temp))
+        if _may_return(node):
+            # Like an if, a loop used as a value evaluates to the return value.
+            statements = [pyast.While(
+                test=pyast.Constant(True),
+                body=statements + [pyast.Break()],
+                orelse=[],
+            )]
+        return statements, _load(temp)
+
+    def _value_block(self, block: BlockStatement | None, temp: str) -> list[pyast.stmt]:
+        if block is None:
+            return [_assign(temp, _load("_0NULL"))]
+        return self._block(block.statements, _Context(temp, temp))
+
+    def _function_literal(self, node: FunctionLiteral) -> pyast.expr:
+        outer = self._scope
+        scope = _Scope(outer, outer.depth + 1)
+        names = [param.value for param in node.parameters]
+        scope.parameters = set(names)
+        scope.declared = set(names) | set(_declared_names(node.body.statements))
+
+        self._scope = scope
+        body = self._block(node.body.statements, _Context(None, None))
+        self._scope = outer
+
+        prologue: list[pyast.stmt] = []
+        if len(set(names)) == len(names):
+            arg_names = [_mangle(scope.depth, name) for name in names]
+        else:
+            arg_names = [f"_0p{i}" for i in range(len(names))]
+            for i, name in enumerate(names):
+                prologue.append(_assign(_mangle(scope.depth, name), _load(arg_names[i])))
+        lets = sorted(scope.declared - scope.parameters)
+        if lets:
+            targets = [_store_name(_mangle(scope.depth, name)) for name in lets]
+            prologue.append(pyast.Assign(targets=targets, value=pyast.Constant(None)))
+
+        self._functions += 1
+        name = f"_0f{self._functions}"
+        outer.prelude.append(pyast.FunctionDef(
+            name=name,
+            args=_arguments(arg_names),
+            body=prologue + scope.prelude + body,
+            decorator_list=[],
+            returns=None,
+        ))
+        params = ", ".join(str(p) for p in node.parameters)
+        source = f"fn({params}) {{\n{node.body.origin or node.body}\n}}"
+        return _call_expr("_0Function", _load(name), pyast.Constant(len(names)), pyast.Constant(source))
+
+    def _call(self, function: pyast.expr, arguments: list[pyast.expr]) -> pyast.expr:
+        # The callee is picked before the arguments are evaluated, and the
+        # argument code appears once no matter which path is taken.
+        temp = self._temp()
+        test = pyast.BoolOp(op=pyast.And(), values=[
+            _is(_call_expr("type", _walrus(temp, function)), _load("_0Function")),
+            pyast.Compare(
+                pyast.Attribute(_load(temp), "arity", pyast.Load()),
+                [pyast.Eq()],
+                [pyast.Constant(len(arguments))],
+            ),
+        ])
+        callee = pyast.IfExp(
+            test=test,
+            body=pyast.Attribute(_load(temp), "call", pyast.Load()),
+            orelse=_call_expr("_0applier", _load(temp)),
+        )
+        return pyast.Call(callee, arguments, [])
+
+
+def _declared_names(statements: list) -> list[str]:
+    """Returns the names bound in a function body, excluding nested functions."""
+    return bound_names(statements)
+
+
+def _needs_statements(node: Node) -> bool:
+    """Reports whether an expression can only be translated with statements."""
+    if isinstance(node, IfExpression):
+        for block in (node.consequence, node.alternative):
+            if block is None:
+                continue
+            if len(block.statements) != 1 or not isinstance(block.statements[0], ExpressionStatement):
+                return True
+            if _needs_statements(block.statements[0].expression):
+                return True
+        return _needs_statements(node.condition)
+    if isinstance(node, (WhileExpression, ForExpression)):
+        return True
+    if isinstance(node, FunctionLiteral):
+        return False
+    return any(_needs_statements(child) for child in children(node))
+
+
+def _may_be_return_value(node: Node) -> bool:
+    """Reports whether an expression can evaluate to a ReturnValue held in a variable, element or result."""
+    return isinstance(node, (Identifier, IndexExpression, CallExpression))
+
+
+def _may_return(node: IfExpression | WhileExpression | ForExpression) -> bool:
+    """Reports whether a return can leave the blocks of an if expression or a loop."""
+    if isinstance(node, IfExpression):
+        blocks = [node.consequence, node.alternative]
+    else:
+        blocks = [node.body]
+    for block in blocks:
+        if block is None:
+            continue
+        for statement in block.statements:
+            if isinstance(statement, ReturnStatement):
+                return True
+            if not isinstance(statement, ExpressionStatement):
+                continue
+            expression = statement.expression
+            if isinstance(expression, (IfExpression, WhileExpression, ForExpression)):
+                if _may_return(expression):
+                    return True
+            elif _may_be_return_value(expression):
+                return True
+    return False
+
+
+def _load(name: str) -> pyast.Name:
+    return pyast.Name(id=name, ctx=pyast.Load())
+
+
+def _store_name(name: str) -> pyast.Name:
+    return pyast.Name(id=name, ctx=pyast.Store())
+
+
+def _assign(name: str, value: pyast.expr) -> pyast.Assign:
+    return pyast.Assign(targets=[_store_name(name)], value=value)
+
+
+def _walrus(name: str, value: pyast.expr) -> pyast.NamedExpr:
+    return pyast.NamedExpr(target=_store_name(name), value=value)
+
+
+def _value(name: str) -> pyast.Attribute:
+    return _attribute(_load(name), "value")
+
+
+def _attribute(value: pyast.expr, name: str) -> pyast.Attribute:
+    return pyast.Attribute(value, name, pyast.Load())
+
+
+def _integer_infix(operator: str, left: pyast.expr, right: pyast.expr) -> pyast.expr:
+    """Builds the operation on two Python ints, boxed as a Dessa object."""
+    if operator in _INTEGER_OPERATORS:
+        return _call_expr("_0int", pyast.BinOp(left, _INTEGER_OPERATORS[operator](), right))
+    return pyast.IfExp(
+        test=pyast.Compare(left, [_COMPARISON_OPERATORS[operator]()], [right]),
+        body=_load("_0TRUE"),
+        orelse=_load("_0FALSE"),
+    )
+
+
+def _is(left: pyast.expr, right: pyast.expr) -> pyast.Compare:
+    return pyast.Compare(left, [pyast.Is()], [right])
+
+
+def _call_expr(name: str, *args: pyast.expr) -> pyast.Call:
+    return pyast.Call(_load(name), list(args), [])
+
+
+def _arguments(names: list[str]) -> pyast.arguments:
+    return pyast.arguments(
+        posonlyargs=[],
+        args=[pyast.arg(arg=name) for name in names],
+        kwonlyargs=[],
+        kw_defaults=[],
+        defaults=[],
+    )
+
+
+def transpile(program: Program) -> pyast.Module:
+    """Translates a program into an equivalent Python module."""
+    return _Transpiler().transpile(infer(program))
+
+
+def compile_program(program: Program) -> CodeType:
+    """Translates a program and compiles it to a Python code object."""
+    return compile(transpile(program), "<dessa>", "exec")
+
+
+def compile_source(source: str) -> CodeType:
+    """Compiles source code, reusing the code object for identical sources."""
+    key = hashlib.sha256(source.encode()).hexdigest()
+    code = _CODE_CACHE.get(key)
+    if code is None:
+        code = compile_program(Parser(Lexer(source)).parse_program())
+        if len(_CODE_CACHE) >= _CODE_CACHE_SIZE:
+            del _CODE_CACHE[next(iter(_CODE_CACHE))]
+        _CODE_CACHE[key] = code
+    return code
+
+
+def _new_namespace(env: Environment) -> dict:
+    """Builds the Python globals for runs against an environment."""
+    namespace = dict(_RUNTIME)
+    for name, builtin in BUILTINS.items():
+        namespace[_mangle(0, name)] = builtin
+
+    def set_global(name: str, value: Object | None) -> None:
+        env.set(name, value)
+        if value is None:
+            # An unbound name falls back to the builtin it shadowed.
+            value = BUILTINS.get(name)
+        if value is None:
+            namespace.pop(_mangle(0, name), None)
+        else:
+            namespace[_mangle(0, name)] = value
+
+    namespace["_0set"] = set_global
+    return namespace
+
+
+def _namespace(env: Environment) -> dict:
+    """Returns the Python globals that mirror an environment's bindings."""
+    namespace = env.session(_new_namespace)
+    for name, value in env.bindings().items():
+        if value is not None:
+            namespace[_mangle(0, name)] = value
+    return namespace
+
+
+def execute(code: CodeType, env: Environment) -> Object | None:
+    """Runs a transpiled code object against an environment."""
+    namespace = _namespace(env)
+    exec(code, namespace)
+    try:
+        return namespace[_MAIN]()
+    except _Abort as abort:
+        return abort.error
+    except NameError as error:
+        name = _demangle(error.name or "")
+        if name is None:
+            raise
+        return new_error(f"identifier not found: {name}")
+
+
+def run(program: Program, env: Environment) -> Object | None:
+    """Transpiles a program to Python and runs it."""
+    return execute(compile_program(program), env)
+
+
+def run_source(source: str, env: Environment) -> Object | None:
+    """Runs source code through the per-source code object cache."""
+    return execute(compile_source(source), env)
@@ -0,0 +1,350 @@
+from __future__ import annotations
+from dessa.compiler import Bytecode, OpCode, compile_program
+from dessa.ast import Program
+from dessa.environment import Environment
+from dessa.evaluator import (
+    new_error,
+    _unbound,
+    _eval_index_expression,
+    _eval_infix_expression,
+    _new_hash,
+    _eval_prefix_expression,
+    _eval_range,
+)
+from dessa.object import (
+    Object,
+    Integer,
+    new_integer,
+    NULL,
+    TRUE,
+    FALSE,
+    Error,
+    ReturnValue,
+    Closure,
+    CompiledFunction,
+    Builtin,
+    new_array,
+)
+
+MAX_FRAMES = 100_000
+
+# Plain ints keep the dispatch loop free of enum attribute lookups.
+_CONSTANT = int(OpCode.CONSTANT)
+_TRUE = int(OpCode.TRUE)
+_FALSE = int(OpCode.FALSE)
+_NULL = int(OpCode.NULL)
+_NOTHING = int(OpCode.NOTHING)
+_POP = int(OpCode.POP)
+_ADD = int(OpCode.ADD)
+_SUB = int(OpCode.SUB)
+_MUL = int(OpCode.MUL)
+_DIV = int(OpCode.DIV)
+_EQ = int(OpCode.EQ)
+_NOT_EQ = int(OpCode.NOT_EQ)
+_LT = int(OpCode.LT)
+_GT = int(OpCode.GT)
+_MINUS = int(OpCode.MINUS)
+_BANG = int(OpCode.BANG)
+_JUMP = int(OpCode.JUMP)
+_JUMP_NOT_TRUTHY = int(OpCode.JUMP_NOT_TRUTHY)
+_GET_GLOBAL = int(OpCode.GET_GLOBAL)
+_SET_GLOBAL = int(OpCode.SET_GLOBAL)
+_GET_LOCAL = int(OpCode.GET_LOCAL)
+_SET_LOCAL = int(OpCode.SET_LOCAL)
+_TRY_LOCAL = int(OpCode.TRY_LOCAL)
+_GET_DEREF = int(OpCode.GET_DEREF)
+_SET_DEREF = int(OpCode.SET_DEREF)
+_TRY_DEREF = int(OpCode.TRY_DEREF)
+_GET_FREE = int(OpCode.GET_FREE)
+_TRY_FREE = int(OpCode.TRY_FREE)
+_CLOSURE = int(OpCode.CLOSURE)
+_CALL = int(OpCode.CALL)
+_RETURN_VALUE = int(OpCode.RETURN_VALUE)
+_RANGE = int(OpCode.RANGE)
+_FOR_ITER = int(OpCode.FOR_ITER)
+_ARRAY = int(OpCode.ARRAY)
+_INDEX = int(OpCode.INDEX)
+_HASH = int(OpCode.HASH)
+_WRAP_RETURN = int(OpCode.WRAP_RETURN)
+_RETURN_RESULT = int(OpCode.RETURN_RESULT)
+
+_INFIX_OPERATORS = {
+    OpCode.ADD: "+",
+    OpCode.SUB: "-",
+    OpCode.MUL: "*",
+    OpCode.DIV: "/",
+    OpCode.EQ: "==",
+    OpCode.NOT_EQ: "!=",
+    OpCode.LT: "<",
+    OpCode.GT: ">",
+}
+
+
+class Cell:
+    """A mutable box for a local variable captured by a closure."""
+    __slots__ = ("value",)
+
+    def __init__(self, value: Object | None = None) -> None:
+        self.value = value
+
+
+class _Abort(Exception):
+    """Unwinds the VM with a Dessa runtime error."""
+
+    def __init__(self, error: Error) -> None:
+        self.error = error
+
+
+class VM:
+    """A stack machine that runs bytecode produced by dessa.compiler."""
+
+    def __init__(self, bytecode: Bytecode, env: Environment, max_frames: int = MAX_FRAMES) -> None:
+        self._bytecode = bytecode
+        self._env = env
+        self._max_frames = max_frames
+
+    def run(self) -> Object | None:
+        """Runs the bytecode and returns the value of the program."""
+        main = self._bytecode.main
+        try:
+            return self._run(main, [None] * main.num_locals, [])
+        except _Abort as abort:
+            return abort.error
+
+    def _call(self, callee: Object, args: list[Object]) -> Object | None:
+        """Calls a function for a builtin, running a closure until its frame returns."""
+        if type(callee) is Builtin:
+            return callee.fn(args, self._call)
+        if not isinstance(callee, Closure):
+            raise _Abort(new_error(f"not a function: {callee.object_type()}"))
+        fn = callee.fn
+        if len(args) < fn.num_parameters:
+            raise _Abort(new_error(
+                f"wrong number of arguments: want={fn.num_parameters}, got={len(args)}"
+            ))
+        frame_locals = args[:fn.num_parameters] + [None] * (fn.num_locals - fn.num_parameters)
+        for slot in fn.cells:
+            frame_locals[slot] = Cell(frame_locals[slot])
+        return self._run(fn, frame_locals, callee.free)
+
+    def _run(self, fn: CompiledFunction, locals_: list, free: list) -> Object | None:
+        """Runs a function's instructions until the frame they start in returns."""
+        code = fn.instructions
+        constants = fn.constants
+        names = fn.names
+        env = self._env
+        max_frames = self._max_frames
+
+        stack: list = []
+        push = stack.append
+        pop = stack.pop
+        frames: list = []
+        ip = 0
+
+        while True:
+            op = code[ip]
+            ip += 1
+
+            if op == _GET_LOCAL:
+                push(locals_[code[ip]])
+                ip += 1
+            elif op == _CONSTANT:
+                push(constants[code[ip]])
+                ip += 1
+            elif op == _GET_GLOBAL:
+                name = names[code[ip]]
+                ip += 1
+                value = env.get(name)
+                if value is None:
+                    value = _unbound(name)
+                    if type(value) is Error:
+                        raise _Abort(value)
+                push(value)
+            elif op == _CALL:
+                argc = code[ip]
+                ip += 1
+                base = len(stack) - argc - 1
+                callee = stack[base]
+                if type(callee) is Builtin:
+                    args = stack[base + 1:]
+                    del stack[base:]
+                    result = callee.fn(args, self._call)
+                    if isinstance(result, Error):
+                        raise _Abort(result)
+                    push(result)
+                    continue
+                if not isinstance(callee, Closure):
+                    raise _Abort(new_error(f"not a function: {callee.object_type()}"))
+                fn = callee.fn
+                if argc < fn.num_parameters:
+                    raise _Abort(new_error(
+                        f"wrong number of arguments: want={fn.num_parameters}, got={argc}"
+                    ))
+                if len(frames) >= max_frames:
+                    raise _Abort(new_error("stack overflow"))
+                frame_locals = stack[base + 1:base + 1 + fn.num_parameters]
+                del stack[base:]
+                if fn.num_locals > fn.num_parameters:
+                    frame_locals.extend([None] * (fn.num_locals - fn.num_parameters))
+                for slot in fn.cells:
+                    frame_locals[slot] = Cell(frame_locals[slot])
+                frames.append((code, ip, locals_, free, constants, names))
+                code = fn.instructions
+                constants = fn.constants
+                names = fn.names
+                ip = 0
+                locals_ = frame_locals
+                free = callee.free
+            elif op == _RETURN_VALUE or op == _RETURN_RESULT:
+                if op == _RETURN_RESULT and stack and type(stack[-1]) is ReturnValue:
+                    stack[-1] = stack[-1].value
+                if not frames:
+                    return pop() if stack else None
+                code, ip, locals_, free, constants, names = frames.pop()
+            elif op == _JUMP_NOT_TRUTHY:
+                value = pop()
+                if value is FALSE or value is NULL:
+                    ip = code[ip]
+                else:
+                    ip += 1
+            elif op == _JUMP:
+                ip = code[ip]
+            elif op == _FOR_ITER:
+                count = next(locals_[code[ip]], None)
+                if count is None:
+                    ip = code[ip + 1]
+                else:
+                    push(new_integer(count))
+                    ip += 2
+            elif _ADD <= op <= _GT:
+                right = pop()
+                left = stack[-1]
+                if type(left) is Integer and type(right) is Integer:
+                    if op == _ADD:
+                        stack[-1] = new_integer(left.value + right.value)
+                    elif op == _SUB:
+                        stack[-1] = new_integer(left.value - right.value)
+                    elif op == _MUL:
+                        stack[-1] = new_integer(left.value * right.value)
+                    elif op == _DIV:
+                        stack[-1] = new_integer(left.value // right.value)
+                    elif op == _LT:
+                        stack[-1] = TRUE if left.value < right.value else FALSE
+                    elif op == _GT:
+                        stack[-1] = TRUE if left.value > right.value else FALSE
+                    elif op == _EQ:
+                        stack[-1] = TRUE if left.value == right.value else FALSE
+                    else:
+                        stack[-1] = TRUE if left.value != right.value else FALSE
+                else:
+                    result = _eval_infix_expression(_INFIX_OPERATORS[op], left, right)
+                    if isinstance(result, Error):
+                        raise _Abort(result)
+                    stack[-1] = result
+            elif op == _POP:
+                value = pop()
+                if type(value) is not ReturnValue:
+                    ip += 1
+                elif code[ip]:
+                    # A return inside an if or loop used as a value stops there.
+                    push(value)
+                    ip = code[ip]
+                elif not frames:
+                    return value.value
+                else:
+                    push(value.value)
+                    code, ip, locals_, free, constants, names = frames.pop()
+            elif op == _WRAP_RETURN:
+                stack[-1] = ReturnValue(value=stack[-1])
+            elif op == _TRY_LOCAL:
+                value = locals_[code[ip]]
+                if value is None:
+                    ip += 2
+                else:
+                    push(value)
+                    ip = code[ip + 1]
+            elif op == _SET_LOCAL:
+                locals_[code[ip]] = pop()
+                ip += 1
+            elif op == _GET_FREE:
+                push(free[code[ip]].value)
+                ip += 1
+            elif op == _TRY_FREE:
+                value = free[code[ip]].value
+                if value is None:
+                    ip += 2
+                else:
+                    push(value)
+                    ip = code[ip + 1]
+            elif op == _GET_DEREF:
+                push(locals_[code[ip]].value)
+                ip += 1
+            elif op == _TRY_DEREF:
+                value = locals_[code[ip]].value
+                if value is None:
+                    ip += 2
+                else:
+                    push(value)
+                    ip = code[ip + 1]
+            elif op == _SET_DEREF:
+                locals_[code[ip]].value = pop()
+                ip += 1
+            elif op == _SET_GLOBAL:
+                env.set(names[code[ip]], pop())
+                ip += 1
+            elif op == _TRUE:
+                push(TRUE)
+            elif op == _FALSE:
+                push(FALSE)
+            elif op == _NULL:
+                push(NULL)
+            elif op == _NOTHING:
+                push(None)
+            elif op == _MINUS or op == _BANG:
+                right = stack[-1]
+                if op == _MINUS and type(right) is Integer:
+                    stack[-1] = new_integer(-right.value)
+                else:
+                    result = _eval_prefix_expression("-" if op == _MINUS else "!", right)
+                    if isinstance(result, Error):
+                        raise _Abort(result)
+                    stack[-1] = result
+            elif op == _RANGE:
+                stop = pop()
+                bounds = _eval_range(pop(), stop)
+                if type(bounds) is Error:
+                    raise _Abort(bounds)
+                locals_[code[ip]] = iter(bounds)
+                ip += 1
+            elif op == _ARRAY:
+                count = code[ip]
+                ip += 1
+                elements = stack[len(stack) - count:]
+                del stack[len(stack) - count:]
+                push(new_array(elements))
+            elif op == _HASH:
+                count = code[ip]
+                ip += 1
+                result = _new_hash(stack[len(stack) - count:])
+                if isinstance(result, Error):
+                    raise _Abort(result)
+                del stack[len(stack) - count:]
+                push(result)
+            elif op == _INDEX:
+                index = pop()
+                result = _eval_index_expression(stack[-1], index)
+                if isinstance(result, Error):
+                    raise _Abort(result)
+                stack[-1] = result
+            elif op == _CLOSURE:
+                fn = constants[code[ip]]
+                ip += 1
+                captured = [locals_[index] if is_local else free[index] for is_local, index in fn.free_sources]
+                push(Closure(fn=fn, free=captured))
+            else:
+                raise RuntimeError(f"unknown opcode {op}")
+
+
+def run(program: Program, env: Environment) -> Object | None:
+    """Compiles a program and runs it on the VM."""
+    return VM(compile_program(program), env).run()
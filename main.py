@@ -1,15 +1,19 @@
+import argparse
 import sys
-from dessa.lexer import Lexer
+from dessa.lexer import LEXERS, DEFAULT_LEXER, get_lexer
 from dessa.parser import Parser
-from dessa.evaluator import eval
+from dessa.engine import ENGINES, DEFAULT_ENGINE, get_engine
 from dessa.object import Object
+from dessa.optimizer import optimize
 from dessa.environment import Environment
 
 PROMPT = ">> "
 
 
-def main():
+def main(engine_name: str = DEFAULT_ENGINE, lexer_name: str = DEFAULT_LEXER, optimize_programs: bool = False):
     """Starts the REPL."""
+    engine = get_engine(engine_name)
+    new_lexer = get_lexer(lexer_name)
     env = Environment()
     while True:
         sys.stdout.write(PROMPT)
@@ -17,18 +21,39 @@ def main():
         line = sys.stdin.readline()
         if not line:
             break
-        lexer = Lexer(line)
+        lexer = new_lexer(line)
         parser = Parser(lexer)
         program = parser.parse_program()
         if parser.errors:
             for error in parser.errors:
                 sys.stderr.write(f"\t{error}\n")
             continue
-        evaluated = eval(program, env)
+        if optimize_programs:
+            optimize(program)
+        evaluated = engine(program, env)
         if evaluated is not None:
             sys.stdout.write(evaluated.inspect())
             sys.stdout.write("\n")
 
 
 if __name__ == "__main__":
-    main()
+    arg_parser = argparse.ArgumentParser(description="The Dessa REPL.")
+    arg_parser.add_argument(
+        "--engine",
+        choices=sorted(ENGINES),
+        default=DEFAULT_ENGINE,
+        help="the engine used to run programs",
+    )
+    arg_parser.add_argument(
+        "--lexer",
+        choices=sorted(LEXERS),
+        default=DEFAULT_LEXER,
+        help="the lexer used to tokenize input",
+    )
+    arg_parser.add_argument(
+        "--optimize",
+        action="store_true",
+        help="fold constants and prune dead branches before running",
+    )
+    args = arg_parser.parse_args()
+    main(args.engine, args.lexer, args.optimize)
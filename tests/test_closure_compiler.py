@@ -0,0 +1,48 @@
+import unittest
+from dessa import closure_compiler
+from dessa.environment import Environment
+from dessa.evaluator import eval
+from dessa.lexer import Lexer
+from dessa.object import Integer, ReturnValue
+from dessa.parser import Parser
+from tests import test_evaluator
+
+
+class ClosureCompilerTest(test_evaluator.EvaluatorTest):
+    """Runs the evaluator suite against the closure-compiled backend."""
+
+    def test_compiled_program_can_be_rerun(self):
+        program = Parser(Lexer("let x = 2; x * 21")).parse_program()
+        code = closure_compiler.compile_program(program)
+        for _ in range(2):
+            evaluated = code(Environment())
+            self.assertIsInstance(evaluated, Integer)
+            self.assertEqual(evaluated.value, 42)
+
+    def test_calls_functions_created_by_eval(self):
+        env = Environment()
+        eval(Parser(Lexer("let double = fn(x) { x * 2 };")).parse_program(), env)
+        program = Parser(Lexer("double(21)")).parse_program()
+        evaluated = closure_compiler.run(program, env)
+        self.assertIsInstance(evaluated, Integer)
+        self.assertEqual(evaluated.value, 42)
+
+    def test_recursive_fibonacci(self):
+        input_code = """
+        let fib = fn(n) { if (n < 2) { return n; } fib(n - 1) + fib(n - 2) };
+        fib(15);
+        """
+        evaluated = self._test_eval(input_code)
+        self.assertIsInstance(evaluated, Integer)
+        self.assertEqual(evaluated.value, 610)
+
+    def _test_eval(self, input_code: str):
+        program = Parser(Lexer(input_code)).parse_program()
+        evaluated = closure_compiler.run(program, Environment())
+        if isinstance(evaluated, ReturnValue):
+            return evaluated.value
+        return evaluated
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+import unittest
+from dessa.compiler import OpCode, compile_program, disassemble
+from dessa.lexer import Lexer
+from dessa.object import Integer, CompiledFunction
+from dessa.parser import Parser
+
+
+class CompilerTest(unittest.TestCase):
+    def test_integer_arithmetic(self):
+        bytecode = self._compile("1 + 2")
+        self.assertEqual(
+            bytecode.main.instructions,
+            [OpCode.CONSTANT, 0, OpCode.CONSTANT, 1, OpCode.ADD, OpCode.RETURN_RESULT],
+        )
+        self.assertEqual([c.value for c in bytecode.constants], [1, 2])
+
+    def test_integer_constants_are_shared(self):
+        bytecode = self._compile("1 + 1; 1")
+        self.assertEqual(len(bytecode.constants), 1)
+        self.assertIsInstance(bytecode.constants[0], Integer)
+        self.assertEqual(len(self._compile('"a" + "a"; "a"').constants), 1)
+
+    def test_conditionals(self):
+        bytecode = self._compile("if (true) { 10 }; 3333;")
+        self.assertEqual(
+            disassemble(bytecode.main.instructions),
+            "\n".join([
+                "0000 TRUE",
+                "0001 JUMP_NOT_TRUTHY 7",
+                "0003 CONSTANT 0",
+                "0005 JUMP 8",
+                "0007 NULL",
+                "0008 POP 0",
+                "0010 CONSTANT 1",
+                "0012 RETURN_RESULT",
+            ]),
+        )
+
+    def test_for_loops_keep_the_iterator_in_a_hidden_local(self):
+        bytecode = self._compile("for (i in range(3)) { i }")
+        self.assertEqual(bytecode.main.num_locals, 1)
+        self.assertEqual(
+            disassemble(bytecode.main.instructions),
+            "\n".join([
+                "0000 CONSTANT 0",
+                "0002 CONSTANT 1",
+                "0004 RANGE 0",
+                "0006 FOR_ITER 0 17",
+                "0009 SET_GLOBAL 0",
+                "0011 GET_GLOBAL 0",
+                "0013 POP 0",
+                "0015 JUMP 6",
+                "0017 NULL",
+                "0018 RETURN_RESULT",
+            ]),
+        )
+
+    def test_arrays_and_indexes(self):
+        bytecode = self._compile("[1, 2 + 3][0]")
+        self.assertEqual(
+            disassemble(bytecode.main.instructions),
+            "\n".join([
+                "0000 CONSTANT 0",
+                "0002 CONSTANT 1",
+                "0004 CONSTANT 2",
+                "0006 ADD",
+                "0007 ARRAY 2",
+                "0009 CONSTANT 3",
+                "0011 INDEX",
+                "0012 RETURN_RESULT",
+            ]),
+        )
+
+    def test_hash_literals(self):
+        bytecode = self._compile("{1: 2, 3: 4}")
+        self.assertEqual(
+            disassemble(bytecode.main.instructions),
+            "\n".join([
+                "0000 CONSTANT 0",
+                "0002 CONSTANT 1",
+                "0004 CONSTANT 2",
+                "0006 CONSTANT 3",
+                "0008 HASH 4",
+                "0010 RETURN_RESULT",
+            ]),
+        )
+
+    def test_global_let_statements(self):
+        bytecode = self._compile("let one = 1; one;")
+        self.assertEqual(
+            bytecode.main.instructions,
+            [OpCode.CONSTANT, 0, OpCode.SET_GLOBAL, 0, OpCode.GET_GLOBAL, 0, OpCode.RETURN_RESULT],
+        )
+        self.assertEqual(bytecode.names, ["one"])
+
+    def test_function_locals(self):
+        bytecode = self._compile("fn(a) { let b = a; b }")
+        fn = bytecode.constants[0]
+        self.assertIsInstance(fn, CompiledFunction)
+        self.assertEqual(fn.num_parameters, 1)
+        self.assertEqual(fn.num_locals, 2)
+        self.assertEqual(
+            disassemble(fn.instructions),
+            "\n".join([
+                "0000 GET_LOCAL 0",
+                "0002 SET_LOCAL 1",
+                "0004 TRY_LOCAL 1 9",
+                "0007 GET_GLOBAL 0",
+                "0009 RETURN_RESULT",
+            ]),
+        )
+
+    def test_closures_capture_cells(self):
+        bytecode = self._compile("fn(a) { fn(b) { a + b } }")
+        inner, outer = bytecode.constants
+        self.assertEqual(outer.cells, [0])
+        self.assertEqual(inner.free_sources, [(True, 0)])
+        self.assertEqual(
+            inner.instructions,
+            [OpCode.GET_FREE, 0, OpCode.GET_LOCAL, 0, OpCode.ADD, OpCode.RETURN_RESULT],
+        )
+
+    def test_return_inside_an_if_used_as_a_value(self):
+        bytecode = self._compile("1 + if (true) { return 2; 3 }")
+        self.assertEqual(
+            disassemble(bytecode.main.instructions),
+            "\n".join([
+                "0000 CONSTANT 0",
+                "0002 TRUE",
+                "0003 JUMP_NOT_TRUTHY 12",
+                "0005 CONSTANT 1",
+                "0007 WRAP_RETURN",
+                "0008 JUMP 13",
+                "0010 JUMP 13",
+                "0012 NULL",
+                "0013 ADD",
+                "0014 RETURN_RESULT",
+            ]),
+        )
+
+    def test_functions_keep_their_pools(self):
+        bytecode = self._compile("fn(a) { a + 1 }")
+        fn = bytecode.constants[1]
+        self.assertIs(fn.constants, bytecode.constants)
+        self.assertIs(fn.names, bytecode.names)
+
+    def _compile(self, input_code: str):
+        program = Parser(Lexer(input_code)).parse_program()
+        return compile_program(program)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,11 @@
 import unittest
 from dessa.lexer import Lexer
 from dessa.parser import Parser
-from dessa.evaluator import eval
-from dessa.object import Integer, Boolean, NULL, ReturnValue, Error, Function
+from dessa.ast import IntegerLiteral
+from dessa.evaluator import EVALUATORS, eval, register
+from dessa.object import Integer, Boolean, NULL, ReturnValue, Error, Function, Array, Hash, String, new_array, new_integer
 from dessa.environment import Environment
+from dessa.engine import ENGINES, run
 
 
 class EvaluatorTest(unittest.TestCase):
@@ -165,6 +167,183 @@ class EvaluatorTest(unittest.TestCase):
                 "unknown operator: BOOLEAN + BOOLEAN",
             ),
             ("foobar", "identifier not found: foobar"),
+            ("let f = fn(a, b) { a }; f(1)", "wrong number of arguments: want=2, got=1"),
+            ("let g = fn(a, b) { a }; let f = fn() { g(1) }; f()", "wrong number of arguments: want=2, got=1"),
+            ("let f = fn(a) { a }; let call = fn(g) { g() }; call(f)", "wrong number of arguments: want=1, got=0"),
+        ]
+
+        for input_code, expected_message in tests:
+            with self.subTest(input_code=input_code):
+                evaluated = self._test_eval(input_code)
+                self.assertIsInstance(evaluated, Error)
+                self.assertEqual(evaluated.message, expected_message)
+
+    def test_loops(self):
+        tests = [
+            ("let i = 0; let s = 0; while (i < 5) { let i = i + 1; let s = s + i }; s", 15),
+            ("let s = 0; for (i in range(5)) { let s = s + i }; s", 10),
+            ("let s = 0; for (i in range(3, 6)) { let s = s * 10 + i }; s", 345),
+            ("let s = 7; for (i in range(3, 0)) { let s = 0 }; s", 7),
+            ("for (i in range(1, 4)) { }; i", 3),
+            ("let f = fn(n) { let s = 0; for (i in range(n)) { for (j in range(i)) { let s = s + 1 } }; s }; f(5)", 10),
+            ("let f = fn(n) { for (i in range(2, n)) { if (n / i * i == n) { return i } }; n }; f(91)", 7),
+            ("let f = fn() { while (true) { return 4 }; 9 }; f()", 4),
+            ("let f = fn() { let x = for (i in range(3)) { return i }; 5 }; f()", 5),
+            ("let f = fn() { let g = 0; for (i in range(3)) { let g = fn() { i } }; g() }; f()", 2),
+        ]
+
+        for input_code, expected in tests:
+            with self.subTest(input_code=input_code):
+                evaluated = self._test_eval(input_code)
+                self.assertIsInstance(evaluated, Integer)
+                self.assertEqual(evaluated.value, expected)
+
+    def test_loops_evaluate_to_null(self):
+        for input_code in ("while (false) { 1 }", "let i = 0; while (i < 2) { let i = i + 1; i }", "for (i in range(2)) { i }"):
+            with self.subTest(input_code=input_code):
+                self.assertIs(self._test_eval(input_code), NULL)
+
+    def test_loop_errors(self):
+        tests = [
+            ("for (i in range(true)) { }", "range bounds must be INTEGER, got BOOLEAN"),
+            ("for (i in range(1, fn() { 1 })) { }", "range bounds must be INTEGER, got FUNCTION"),
+            ("while (1 + true) { }", "type mismatch: INTEGER + BOOLEAN"),
+            ("for (i in range(3)) { if (i == 2) { i + true } }", "type mismatch: INTEGER + BOOLEAN"),
+        ]
+
+        for input_code, expected_message in tests:
+            with self.subTest(input_code=input_code):
+                evaluated = self._test_eval(input_code)
+                self.assertIsInstance(evaluated, Error)
+                self.assertEqual(evaluated.message, expected_message)
+
+    def test_arrays(self):
+        evaluated = self._test_eval("[1, 2 * 2, 3 + 3]")
+        self.assertIsInstance(evaluated, Array)
+        self.assertEqual(evaluated.inspect(), "[1, 4, 6]")
+
+        tests = [
+            ("[1, 2, 3][0]", 1),
+            ("[1, 2, 3][1 + 1]", 3),
+            ("let i = 0; [1][i]", 1),
+            ("let myArray = [1, 2, 3]; myArray[0] + myArray[1] + myArray[2]", 6),
+            ("[[1, true], [fn(x) { x }]][1][0](5)", 5),
+            ("[1, 2, 3][3]", None),
+            ("[1, 2, 3][-1]", None),
+        ]
+
+        for input_code, expected in tests:
+            with self.subTest(input_code=input_code):
+                evaluated = self._test_eval(input_code)
+                if expected is None:
+                    self.assertIs(evaluated, NULL)
+                else:
+                    self.assertEqual(evaluated.value, expected)
+
+    def test_hashes(self):
+        evaluated = self._test_eval("let two = 2; {1: 10 - 9, two: 1 + 1, 1 + 2: 3, true: 4, 1 > 2: 5, 1: 6}")
+        self.assertIsInstance(evaluated, Hash)
+        self.assertEqual(evaluated.inspect(), "{1: 6, 2: 2, 3: 3, true: 4, false: 5}")
+
+        tests = [
+            ('{1: 5}[1]', 5),
+            ('let key = 100000; {key: 5}[99999 + 1]', 5),
+            ('{true: 5}[1 < 2]', 5),
+            ('let h = {1: {2: [7]}}; h[1][2][0]', 7),
+            ('let f = fn(n) { {n: fn(x) { x * n }} }; f(3)[3](4)', 12),
+            ('len({1: 1, 2: 2, 1: 3})', 2),
+            ('{1: 5}[2]', None),
+            ('{}[true]', None),
+            ('{1: 5}[true]', None),
+        ]
+
+        for input_code, expected in tests:
+            with self.subTest(input_code=input_code):
+                evaluated = self._test_eval(input_code)
+                if expected is None:
+                    self.assertIs(evaluated, NULL)
+                else:
+                    self.assertEqual(evaluated.value, expected)
+
+    def test_strings(self):
+        tests = [
+            ('"Hello World!"', "Hello World!"),
+            ('"Hello" + " " + "World!"', "Hello World!"),
+            ('let greet = fn(name) { "Hi, " + name }; greet("Bob")', "Hi, Bob"),
+            ('let s = ""; for (i in range(100)) { let s = s + "ab" }; s == s + ""', "true"),
+            ('let f = fn(n) { if (n == 0) { "" } else { f(n - 1) + "ab" } }; len(f(40))', "80"),
+            ('let s = ""; for (i in range(50)) { let s = "xy" + s }; {s: 1}["xy" + s]', "null"),
+            ('{"a" + "b": 1}["ab"]', "1"),
+            ('"ab" == "a" + "b"', "true"),
+            ('"ab" != "ba"', "true"),
+            ('[len(""), len("four")]', "[0, 4]"),
+            ('"a" - "b"', "Error: unknown operator: STRING - STRING"),
+            ('"a" + 1', "Error: type mismatch: STRING + INTEGER"),
+        ]
+
+        for input_code, expected in tests:
+            with self.subTest(input_code=input_code):
+                self.assertEqual(self._test_eval(input_code).inspect(), expected)
+
+    def test_string_literals_are_built_once(self):
+        evaluated = self._test_eval('let a = []; for (i in range(2)) { let a = push(a, "same") }; a')
+        self.assertIsInstance(evaluated.get(0), String)
+        self.assertIs(evaluated.get(0), evaluated.get(1))
+
+    def test_equality_of_other_objects(self):
+        tests = [
+            ("100000 == 99999 + 1", True),
+            ("let a = [1]; a == a", True),
+            ("[1] == [1]", False),
+            ("let h = {}; h != h", False),
+            ("{} != {}", True),
+            ("let f = fn() { 1 }; f == f", True),
+        ]
+
+        for input_code, expected in tests:
+            with self.subTest(input_code=input_code):
+                evaluated = self._test_eval(input_code)
+                self.assertIsInstance(evaluated, Boolean)
+                self.assertEqual(evaluated.value, expected)
+
+    def test_builtin_functions(self):
+        tests = [
+            ("len([])", 0),
+            ("len([1, true, [2]])", 3),
+            ("let a = [1, 2]; let b = push(a, 3); len(a) * 10 + len(b)", 23),
+            ("let a = push([1], 2); let b = push(a, 3); let c = push(a, 4); b[2] * 10 + c[2]", 34),
+            ("sum([])", 0),
+            ("sum([1, 2, 3, 9223372036854775807])", 9223372036854775813),
+            ("sum(map([1, 2, 3], fn(x) { x * x }))", 14),
+            ("let n = 10; sum(map([1, 2], fn(x) { x + n }))", 23),
+            ("len(filter([1, 2, 3, 4], fn(x) { x > 2 }))", 2),
+            ("reduce([1, 2, 3], 10, fn(acc, x) { acc * x })", 60),
+            ("let f = fn(n) { if (n < 2) { n } else { f(n - 1) + f(n - 2) } }; sum(map([10, 20], f))", 6820),
+            ("let a = []; for (i in range(1000)) { let a = push(a, i) }; sum(a)", 499500),
+            ("let len = fn(a) { 7 }; len([])", 7),
+        ]
+
+        for input_code, expected in tests:
+            with self.subTest(input_code=input_code):
+                evaluated = self._test_eval(input_code)
+                self.assertIsInstance(evaluated, Integer)
+                self.assertEqual(evaluated.value, expected)
+
+    def test_array_errors(self):
+        tests = [
+            ("1[0]", "index operator not supported: INTEGER"),
+            ("[1][true]", "array index must be INTEGER, got BOOLEAN"),
+            ("len(1)", "argument to `len` not supported, got INTEGER"),
+            ("len([1], [2])", "wrong number of arguments: want=1, got=2"),
+            ("sum([1, true])", "type mismatch: INTEGER + BOOLEAN"),
+            ("push(1, 1)", "first argument to `push` must be ARRAY, got INTEGER"),
+            ("map([1, 2], fn(x) { x + true })", "type mismatch: INTEGER + BOOLEAN"),
+            ("filter([1], 2)", "not a function: INTEGER"),
+            ("reduce([1], 0, fn(a, b, c) { 1 })", "wrong number of arguments: want=3, got=2"),
+            ("[1, 2 + true, 3]", "type mismatch: INTEGER + BOOLEAN"),
+            ("{[1]: 2}", "unusable as hash key: ARRAY"),
+            ("{1: 2}[fn(x) { x }]", "unusable as hash key: FUNCTION"),
+            ("{1: 2 + true}", "type mismatch: INTEGER + BOOLEAN"),
         ]
 
         for input_code, expected_message in tests:
@@ -203,6 +382,8 @@ class EvaluatorTest(unittest.TestCase):
             ("let add = fn(x, y) { x + y; }; add(5, 5);", 10),
             ("let add = fn(x, y) { x + y; }; add(5 + 5, add(5, 5));", 20),
             ("fn(x) { x; }(5)", 5),
+            ("let first = fn(x) { x; }; first(1, 2);", 1),
+            ("let add = fn(n) { fn(x) { x + n } }; let call = fn(f) { f(10) }; call(add(1)) * call(add(2));", 132),
         ]
 
         for input_code, expected in tests:
@@ -223,6 +404,20 @@ class EvaluatorTest(unittest.TestCase):
         self.assertIsInstance(evaluated, Integer)
         self.assertEqual(evaluated.value, 4)
 
+    def test_captured_variables(self):
+        tests = [
+            ("let f = fn(n) { let fact = fn(n) { if (n < 2) { 1 } else { n * fact(n - 1) } }; fact(n) }; f(5)", 120),
+            ("let f = fn() { let even = fn(n) { if (n == 0) { true } else { odd(n - 1) } }; let odd = fn(n) { if (n == 0) { false } else { even(n - 1) } }; even(10) }; f()", True),
+            ("let f = fn() { let x = 1; let g = fn() { x }; let x = 2; g() }; f()", 2),
+            ("let f = fn(a) { fn(b) { fn(c) { a * 100 + b * 10 + c } } }; f(1)(2)(3)", 123),
+            ("let f = fn(a, b) { let c = a + b; let g = fn() { c * b }; g() }; f(1, 2)", 6),
+            ("let x = 5; let f = fn() { let g = fn() { x }; g() }; f()", 5),
+        ]
+
+        for input_code, expected in tests:
+            with self.subTest(input_code=input_code):
+                evaluated = self._test_eval(input_code)
+                self.assertEqual(evaluated.value, expected)
 
     def _test_eval(self, input_code: str):
         lexer = Lexer(input_code)
@@ -235,6 +430,43 @@ class EvaluatorTest(unittest.TestCase):
         return evaluated
 
 
+class BuiltinsTest(unittest.TestCase):
+    def test_bulk_builtins_do_not_recurse(self):
+        for engine in ENGINES:
+            with self.subTest(engine=engine):
+                env = Environment()
+                env.set("a", new_array([new_integer(i) for i in range(100_000)]))
+                env.set("b", new_array([new_integer(i) for i in range(5_000)]))
+                evaluated = run("[len(a), sum(a), reduce(b, 0, fn(s, x) { s + x })]", env, engine=engine)
+                self.assertEqual(evaluated.inspect(), "[100000, 4999950000, 12497500]")
+
+
+class DispatchTest(unittest.TestCase):
+    def test_register_new_node_type(self):
+        class Answer(IntegerLiteral):
+            pass
+
+        class Question(IntegerLiteral):
+            pass
+
+        self.addCleanup(EVALUATORS.update, dict(EVALUATORS))
+        self.addCleanup(EVALUATORS.clear)
+
+        @register(Answer)
+        def eval_answer(node, env):
+            return Integer(42)
+
+        self.assertEqual(eval(Answer(token=None, value=1), Environment()).value, 42)
+        # Unregistered subclasses fall back to their base class's evaluator.
+        self.assertEqual(eval(Question(token=None, value=7), Environment()).value, 7)
+
+    def test_dispatch_does_not_limit_recursion_depth(self):
+        evaluated = eval(Parser(Lexer("let f = fn(n) { if (n == 0) { 0 } else { 1 + f(n - 1) } }; f(100)")).parse_program(), Environment())
+        self.assertEqual(evaluated.value, 100)
+
+    def test_unknown_nodes_evaluate_to_none(self):
+        self.assertIsNone(eval(object(), Environment()))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+from dessa import exception_evaluator
+from dessa.environment import Environment
+from dessa.evaluator import eval
+from dessa.lexer import Lexer
+from dessa.parser import Parser
+from tests import test_evaluator
+
+
+class ExceptionEvaluatorTest(test_evaluator.EvaluatorTest):
+    """Runs the evaluator suite with exception-based propagation."""
+
+    def test_same_results_as_eval(self):
+        tests = [
+            "1 + if (true) { return 2 }",
+            "if (true) { return 5 }; 6",
+            "let x = if (true) { return 1 }; x; 7",
+            "let f = fn() { let x = if (true) { return 1 }; x; 5 }; f()",
+            "let f = fn() { let x = if (true) { return 1 }; x == if (true) { x } }; f()",
+            "let f = fn() { return if (true) { return 1 } }; f() + 1",
+            "let f = fn(a) { if (a) { return 1; } 2 }; f(false) * 10 + f(true)",
+            "let f = fn() { if (false) { 1 } }; f()",
+            "let f = fn() { }; f()",
+            "let f = fn() { g() }; let g = 5; f()",
+            "let f = fn(x) { x + y }; f(1)",
+        ]
+
+        for input_code in tests:
+            with self.subTest(input_code=input_code):
+                expected = eval(Parser(Lexer(input_code)).parse_program(), Environment())
+                evaluated = self._test_eval(input_code)
+                if expected is None:
+                    self.assertIsNone(evaluated)
+                else:
+                    self.assertEqual(evaluated.object_type(), expected.object_type())
+                    self.assertEqual(evaluated.inspect(), expected.inspect())
+
+    def test_deep_tail_recursion(self):
+        evaluated = self._test_eval("let c = fn(n) { if (n == 0) { return 0; } c(n - 1) }; c(20000)")
+        self.assertEqual(evaluated.value, 0)
+
+    def _test_eval(self, input_code: str):
+        return exception_evaluator.run(Parser(Lexer(input_code)).parse_program(), Environment())
+
+
+if __name__ == '__main__':
+    unittest.main()
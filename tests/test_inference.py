@@ -0,0 +1,107 @@
+import unittest
+from unittest import mock
+from dessa import closure_compiler, inference, transpiler
+from dessa.ast import InfixExpression, PrefixExpression, FunctionLiteral, children
+from dessa.environment import Environment
+from dessa.evaluator import eval
+from dessa.inference import INTEGER, BOOLEAN, infer
+from dessa.lexer import Lexer
+from dessa.parser import Parser
+
+
+class InferenceTest(unittest.TestCase):
+    @mock.patch.object(inference, "VECTORS_AVAILABLE", False)
+    def test_operand_types(self):
+        tests = [
+            ("1 + 2 * 3", [INTEGER, INTEGER]),
+            ("-5; !true", [INTEGER, None]),
+            ("true == !false", [BOOLEAN, None]),
+            ("let x = 5; let y = x * 2; y - x", [INTEGER, INTEGER]),
+            ("let x = 5; let x = true; x == false", [BOOLEAN]),
+            ("fn(n) { if (n < 2) { n } else { n - 1 } }", [None, INTEGER]),
+            ("fn(n) { -n; n * 2 }", [None, INTEGER]),
+            ("fn(a, b) { a == b; a + 1 }", [None, None]),
+            ("fn(a) { a == 1; a + 1 }", [None, INTEGER]),
+            ("fn(a) { let b = if (a) { 1 } else { 2 * 3 }; b + 1 }", [INTEGER, INTEGER]),
+            ("fn(a) { let b = if (a) { 1 }; b + 1 }", [None]),
+            ("fn(a) { let b = if (a) { return 1 } else { 2 }; b + 1 }", [None]),
+            ("fn(a) { if (a) { let x = 1 } else { let x = 2 }; x + 1 }", [INTEGER]),
+            ("fn(a) { let x = 1; if (a) { let x = true }; x + 1 }", [None]),
+            ("fn(a) { let x = 1; a; x + 1 }", [INTEGER]),
+            ("fn(x) { (x + if (true) { let x = true; 1 } else { 2 }) + (x + 1) }", [INTEGER, None, None]),
+            ("let x = 1; x + if (true) { let x = true; 1 } else { 2 }; x + 1", [INTEGER, None]),
+            ("let y = 1; fn() { y + 1 }", [None]),
+            ("fn(n) { for (i in range(n)) { i * 2 }; n + 1 }", [INTEGER, INTEGER]),
+            ("fn(n) { let s = 0; for (i in range(n)) { let s = s + i }; s + 1 }", [None, None]),
+            ("fn(a) { let x = 1; while (a) { x + 1; let x = true }; 0 }", [None]),
+            ("fn(n) { let i = 0; while (i < n) { let i = i + 1 }; i - 1 }", [None, INTEGER, INTEGER]),
+            ('fn(s) { s + "!"; s + s }', [None, None]),
+            ("fn(a, b) { let c = a + b; a + 1; c * 2 }", [None, None, None]),
+            ("fn(a) { a + 1; a + a }", [None, INTEGER]),
+        ]
+
+        for input_code, expected in tests:
+            with self.subTest(input_code=input_code):
+                program = infer(Parser(Lexer(input_code)).parse_program())
+                self.assertEqual([node.operand_type for node in _operators(program)], expected)
+
+    @mock.patch.object(inference, "VECTORS_AVAILABLE", True)
+    def test_operand_types_with_vectors(self):
+        # Any operand that is not proven may be a vector, so operators that
+        # accept vectors prove nothing about them.
+        tests = [
+            ("1 + 2 * 3", [INTEGER, INTEGER]),
+            ("fn(n) { if (n < 2) { n } else { n - 1 } }", [None, None]),
+            ("fn(n) { let m = n * 2; m + 1 }", [None, None]),
+            ("fn(n) { -n; n * 2 }", [None, INTEGER]),
+            ("fn(a) { a == true; a != false }", [None, BOOLEAN]),
+        ]
+
+        for input_code, expected in tests:
+            with self.subTest(input_code=input_code):
+                program = infer(Parser(Lexer(input_code)).parse_program())
+                self.assertEqual([node.operand_type for node in _operators(program)], expected)
+
+    def test_early_exit_from_a_block(self):
+        # r may hold a return value, which would leave the branch before the
+        # let runs, so x is not known to be an integer after the if.
+        program = infer(Parser(Lexer("""
+        fn(a, r) { let x = true; if (a) { r; let x = 1 } else { let x = 2 }; x + 1 }
+        """)).parse_program())
+        self.assertEqual([node.operand_type for node in _operators(program)], [None])
+
+    def test_compiled_code_runs_proven_operations(self):
+        tests = [
+            ("let fib = fn(n) { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } }; fib(15)", "610"),
+            ("let f = fn(n) { -n * n }; f(7)", "-49"),
+            ("let f = fn(a, b) { a == true; a == b }; f(true, false)", "false"),
+            ("let f = fn(a) { let b = 1; if (a) { let b = true; }; b + 1 }; f(false)", "2"),
+            ("let f = fn(a) { a < 1; a + true }; f(1)", "Error: type mismatch: INTEGER + BOOLEAN"),
+            ("let f = fn(a) { a + 1 }; f(true)", "Error: type mismatch: BOOLEAN + INTEGER"),
+            ('let f = fn(s) { s + "!"; s + s }; f("a")', "aa"),
+            ('let f = fn(s) { let t = s + "!"; -t }; f("a")', "Error: unknown operator: -STRING"),
+        ]
+
+        for engine in (closure_compiler.run, transpiler.run):
+            for input_code, expected in tests:
+                with self.subTest(engine=engine.__module__, input_code=input_code):
+                    evaluated = engine(Parser(Lexer(input_code)).parse_program(), Environment())
+                    self.assertEqual(evaluated.inspect(), expected)
+                    reference = eval(Parser(Lexer(input_code)).parse_program(), Environment())
+                    self.assertEqual(reference.inspect(), expected)
+
+
+def _operators(node):
+    """Returns the prefix and infix expressions of a tree, including function bodies, in order."""
+    found = []
+    if isinstance(node, (InfixExpression, PrefixExpression)):
+        found.append(node)
+    nodes = node.body.statements if isinstance(node, FunctionLiteral) else children(node)
+    for child in nodes:
+        if child is not None:
+            found += _operators(child)
+    return found
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,8 +2,8 @@ import unittest
 from dessa.token import (
     Token, LET, IDENT, ASSIGN, INT, SEMICOLON, EOF,
     PLUS, MINUS, ASTERISK, SLASH, BANG, LT, GT, EQ, NOT_EQ,
-    LPAREN, RPAREN, LBRACE, RBRACE, COMMA, ILLEGAL, FUNCTION,
-    TRUE, FALSE, IF, ELSE, RETURN
+    LPAREN, RPAREN, LBRACE, RBRACE, LBRACKET, RBRACKET, COLON, COMMA, ILLEGAL, FUNCTION,
+    TRUE, FALSE, IF, ELSE, RETURN, STRING
 )
 from dessa.lexer import Lexer
 
@@ -51,6 +51,28 @@ class LexerTest(unittest.TestCase):
             self.assertEqual(token.line, expected_token.line)
             self.assertEqual(token.column, expected_token.column)
 
+    def test_brackets_and_colons(self):
+        input_code = "a[1]{:}"
+        expected_tokens = [
+            Token(IDENT, "a", 1, 1),
+            Token(LBRACKET, "[", 1, 2),
+            Token(INT, "1", 1, 3),
+            Token(RBRACKET, "]", 1, 4),
+            Token(LBRACE, "{", 1, 5),
+            Token(COLON, ":", 1, 6),
+            Token(RBRACE, "}", 1, 7),
+            Token(EOF, "", 1, 8),
+        ]
+
+        lexer = Lexer(input_code)
+
+        for expected_token in expected_tokens:
+            token = lexer.next_token()
+            self.assertEqual(token.type, expected_token.type)
+            self.assertEqual(token.literal, expected_token.literal)
+            self.assertEqual(token.line, expected_token.line)
+            self.assertEqual(token.column, expected_token.column)
+
     def test_all_operators(self):
         input_code = "-/* !<>==!="
         expected_tokens = [
@@ -90,6 +112,27 @@ class LexerTest(unittest.TestCase):
             self.assertEqual(token.line, expected_token.line)
             self.assertEqual(token.column, expected_token.column)
 
+    def test_strings(self):
+        input_code = '"foo bar" + "";\n"a\nb" "open'
+        expected_tokens = [
+            Token(STRING, "foo bar", 1, 1),
+            Token(PLUS, "+", 1, 11),
+            Token(STRING, "", 1, 13),
+            Token(SEMICOLON, ";", 1, 15),
+            Token(STRING, "a\nb", 2, 1),
+            Token(ILLEGAL, '"open', 3, 4),
+            Token(EOF, "", 3, 9),
+        ]
+
+        lexer = Lexer(input_code)
+
+        for expected_token in expected_tokens:
+            token = lexer.next_token()
+            self.assertEqual(token.type, expected_token.type)
+            self.assertEqual(token.literal, expected_token.literal)
+            self.assertEqual(token.line, expected_token.line)
+            self.assertEqual(token.column, expected_token.column)
+
     def test_complex_statement(self):
         input_code = '''
         let five = 5;
@@ -0,0 +1,79 @@
+import gc
+import unittest
+import weakref
+from dessa.environment import Environment
+from dessa.lexer import Lexer
+from dessa.memoizer import Memoizer, memoizer_for, run
+from dessa.parser import Parser
+from tests import test_evaluator
+
+
+class MemoizerTest(test_evaluator.EvaluatorTest):
+    """Runs the evaluator suite with calls to pure functions memoized."""
+
+    def test_recursion_hits_the_cache(self):
+        memoizer = Memoizer()
+        evaluated = self._run(memoizer, "let fib = fn(n) { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } }; fib(30)")
+        self.assertEqual(evaluated.value, 832040)
+        self.assertEqual(memoizer.misses, 31)
+        self.assertEqual(memoizer.hits, 28)
+
+    def test_cache_is_bounded(self):
+        memoizer = Memoizer(max_size=3)
+        evaluated = self._run(memoizer, "let sq = fn(n) { n * n }; sq(1) + sq(2) + sq(3) + sq(4) + sq(1)")
+        self.assertEqual(evaluated.value, 31)
+        self.assertEqual(len(memoizer), 3)
+        self.assertEqual((memoizer.hits, memoizer.misses), (0, 5))
+
+    def test_rebinding_a_dependency_invalidates_results(self):
+        memoizer = Memoizer()
+        env = Environment()
+        self.assertEqual(self._run(memoizer, "let k = 2; let g = fn(n) { n * k }; let f = fn(n) { g(n) + 1 }; f(5)", env).value, 11)
+        self.assertEqual(self._run(memoizer, "f(5)", env).value, 11)
+        self.assertEqual(memoizer.hits, 1)
+        self.assertEqual(self._run(memoizer, "let k = 3; f(5)", env).value, 16)
+        self.assertEqual(self._run(memoizer, "let g = fn(n) { n }; f(5)", env).value, 6)
+
+    def test_impure_calls_are_not_cached(self):
+        tests = [
+            "let f = fn(n) { fn() { n } }; f(1) == f(1)",
+            "let f = fn(n) { if (n) { f } else { 1 } }; f(true) == f(true)",
+            "let x = fn() { 1 }; let f = fn(n) { x }; f(1) == f(1)",
+        ]
+        for input_code in tests:
+            with self.subTest(input_code=input_code):
+                memoizer = Memoizer()
+                self._run(memoizer, input_code)
+                self.assertEqual(memoizer.hits, 0)
+                self.assertEqual(len(memoizer), 0)
+
+    def test_tail_calls_do_not_nest(self):
+        evaluated = self._run(Memoizer(), "let f = fn(n) { if (n == 0) { 0 } else { f(n - 1) } }; f(3000)")
+        self.assertEqual(evaluated.value, 0)
+
+    def test_runs_in_one_environment_share_a_cache(self):
+        env = Environment()
+        run(Parser(Lexer("let sq = fn(n) { n * n }; sq(3)")).parse_program(), env)
+        evaluated = run(Parser(Lexer("sq(3)")).parse_program(), env)
+        self.assertEqual(evaluated.value, 9)
+        memoizer = memoizer_for(env)
+        self.assertEqual((memoizer.hits, memoizer.misses), (1, 1))
+        self.assertIsNot(memoizer_for(Environment()), memoizer)
+
+    def test_cache_is_freed_with_its_environment(self):
+        env = Environment()
+        run(Parser(Lexer("let sq = fn(n) { n * n }; sq(3)")).parse_program(), env)
+        memoizer = weakref.ref(memoizer_for(env))
+        del env
+        gc.collect()
+        self.assertIsNone(memoizer())
+
+    def _run(self, memoizer: Memoizer, input_code: str, env: Environment | None = None):
+        return memoizer.run(Parser(Lexer(input_code)).parse_program(), env or Environment())
+
+    def _test_eval(self, input_code: str):
+        return self._run(Memoizer(), input_code)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import unittest
+from dessa.engine import run
+from dessa.environment import Environment
+from dessa.object import (
+    Array,
+    Boolean,
+    Error,
+    Function,
+    Integer,
+    ReturnValue,
+    SMALL_INT_MAX,
+    SMALL_INT_MIN,
+    String,
+    concat,
+    new_array,
+    new_integer,
+    set_small_int_range,
+)
+
+
+class SmallIntegerCacheTest(unittest.TestCase):
+    def tearDown(self):
+        set_small_int_range(SMALL_INT_MIN, SMALL_INT_MAX)
+
+    def test_small_integers_are_shared(self):
+        self.assertIs(new_integer(SMALL_INT_MIN), new_integer(SMALL_INT_MIN))
+        self.assertIs(new_integer(SMALL_INT_MAX), new_integer(SMALL_INT_MAX))
+        self.assertIsNot(new_integer(SMALL_INT_MAX + 1), new_integer(SMALL_INT_MAX + 1))
+        self.assertEqual(new_integer(SMALL_INT_MAX + 1).value, SMALL_INT_MAX + 1)
+
+    def test_configurable_range(self):
+        set_small_int_range(0, 10)
+        self.assertIs(new_integer(10), new_integer(10))
+        self.assertIsNot(new_integer(11), new_integer(11))
+        self.assertIsNot(new_integer(-1), new_integer(-1))
+
+    def test_arithmetic_results_are_shared(self):
+        for engine in ("eval", "stack", "vm", "closures", "python"):
+            with self.subTest(engine=engine):
+                self.assertIs(run("3 * 4", engine=engine), new_integer(12))
+                self.assertIs(run("-5", engine=engine), new_integer(-5))
+
+    def test_literals_are_built_once(self):
+        for engine in ("eval", "stack"):
+            with self.subTest(engine=engine):
+                env = Environment()
+                run("let f = fn() { 100000 }; let a = f(); let b = f();", env, engine=engine)
+                self.assertEqual(env.get("a").value, 100000)
+                self.assertIs(env.get("a"), env.get("b"))
+
+    def test_objects_use_slots(self):
+        objects = [
+            Array([]),
+            String("a"),
+            Integer(value=1),
+            Boolean(True),
+            ReturnValue(value=None),
+            Error(message="boom"),
+            Function(parameters=[], body=None, env=None),
+        ]
+
+        for obj in objects:
+            with self.subTest(type=type(obj).__name__):
+                self.assertFalse(hasattr(obj, "__dict__"))
+
+
+class HashKeyTest(unittest.TestCase):
+    def test_equal_values_have_equal_keys(self):
+        self.assertEqual(Integer(100000).hash_key(), new_integer(100000).hash_key())
+        self.assertEqual(Boolean(True).hash_key(), Boolean(True).hash_key())
+        self.assertNotEqual(Integer(1).hash_key(), Boolean(True).hash_key())
+        self.assertNotEqual(Integer(0).hash_key(), Boolean(False).hash_key())
+        self.assertEqual(String("ab").hash_key(), concat(String("a"), String("b")).hash_key())
+        self.assertNotEqual(String("1").hash_key(), Integer(1).hash_key())
+        self.assertIsNone(Array([]).hash_key())
+
+
+class ArrayTest(unittest.TestCase):
+    def test_integer_arrays_are_packed(self):
+        self.assertTrue(new_array([new_integer(1), new_integer(2)]).packed)
+        self.assertFalse(new_array([new_integer(1), Boolean(True)]).packed)
+        self.assertFalse(new_array([new_integer(2 ** 63)]).packed)
+        self.assertEqual(new_array([new_integer(2 ** 63)]).inspect(), "[9223372036854775808]")
+
+    def test_push_shares_storage_without_changing_arrays(self):
+        env = Environment()
+        run("let a = push(push([], 1), 2); let b = push(a, 3); let c = push(a, 4);", env)
+        a, b, c = env.get("a"), env.get("b"), env.get("c")
+        self.assertIs(a.elements, b.elements)
+        self.assertIsNot(a.elements, c.elements)
+        self.assertEqual([a.inspect(), b.inspect(), c.inspect()], ["[1, 2]", "[1, 2, 3]", "[1, 2, 4]"])
+
+
+class StringTest(unittest.TestCase):
+    def test_concatenation_is_flattened_lazily(self):
+        left, right = String("a" * 100), String("b" * 100)
+        rope = concat(left, right)
+        self.assertEqual(len(rope), 200)
+        self.assertIsNone(rope._text)
+        self.assertEqual(rope.value, "a" * 100 + "b" * 100)
+        self.assertIsNone(rope._left)
+        self.assertIs(concat(rope, String("")), rope)
+        self.assertEqual(concat(String("x"), String("y"))._text, "xy")
+
+    def test_deep_ropes_flatten_without_recursion(self):
+        string = String("")
+        for _ in range(100_000):
+            string = concat(string, String("x" * 64))
+        self.assertEqual(string.value, "x" * 6_400_000)
+
+
+if __name__ == '__main__':
+    unittest.main()
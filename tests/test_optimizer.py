@@ -0,0 +1,174 @@
+import unittest
+from dessa.ast import Boolean, IfExpression, IntegerLiteral
+from dessa.engine import ENGINES
+from dessa.environment import Environment
+from dessa.evaluator import eval
+from dessa.lexer import Lexer
+from dessa.optimizer import optimize
+from dessa.parser import Parser
+from tests import test_evaluator
+
+
+class OptimizerTest(test_evaluator.EvaluatorTest):
+    """Runs the evaluator suite on optimized programs."""
+
+    def test_folds_constant_expressions(self):
+        tests = [
+            ("60 * 60 * 24", "86400"),
+            ("-(2 + 3) * 2", "-10"),
+            ("!true", "false"),
+            ("!5", "false"),
+            ("1 < 2 == true", "true"),
+            ("(1 > 2) != false", "false"),
+            ("x + 2 * 3", "(x + 6)"),
+        ]
+
+        for input_code, expected in tests:
+            with self.subTest(input_code=input_code):
+                self.assertEqual(str(self._optimize(input_code)), expected)
+
+    def test_keeps_expressions_that_fail(self):
+        tests = [
+            "5 + true",
+            "-true",
+            "true + false",
+            "1 / 0",
+            "5 == true",
+        ]
+
+        for input_code in tests:
+            with self.subTest(input_code=input_code):
+                self.assertEqual(
+                    str(self._optimize(input_code)),
+                    str(Parser(Lexer(input_code)).parse_program()),
+                )
+
+    def test_prunes_constant_branches(self):
+        tests = [
+            ("if (1 < 2) { 10 } else { 20 }", "10"),
+            ("if (false) { 10 } else { 20 }", "20"),
+            ("if (1) { 10 }", "10"),
+            ("let x = if (true) { let y = 1; y } else { 2 };", "let x = if true { let y = 1;y };"),
+            ("if (true) { let y = 1; y }", "let y = 1;y"),
+        ]
+
+        for input_code, expected in tests:
+            with self.subTest(input_code=input_code):
+                self.assertEqual(str(self._optimize(input_code)), expected)
+
+        # Without an else branch a false condition still evaluates to null.
+        program = self._optimize("if (false) { 10 }")
+        self.assertIsInstance(program.statements[0].expression, IfExpression)
+
+    def test_drops_statements_after_return(self):
+        program = self._optimize("fn() { 1; return 2; 3; 4 }")
+        body = program.statements[0].expression.body
+        self.assertEqual(str(body), "1return 2;")
+
+        program = self._optimize("fn() { if (true) { return 1; } 2 }")
+        body = program.statements[0].expression.body
+        self.assertEqual(str(body), "return 1;")
+
+    def test_inlines_small_functions(self):
+        tests = [
+            ("let add = fn(a, b) { a + b }; add(1, 2)", "let add = fn(a, b) { (a + b) };3"),
+            ("let add = fn(a, b) { a + b }; let x = 5; add(x * 2, x)", "let add = fn(a, b) { (a + b) };let x = 5;((x * 2) + x)"),
+            ("let f = fn(n) { let sq = fn(x) { x * x }; sq(n) }", "let f = fn(n) { let sq = fn(x) { (x * x) };(n * n) };"),
+            ("let f = fn(x) { g(x) + 1 }; let g = fn(y) { y * 2 }; f(3)", "let f = fn(x) { (g(x) + 1) };let g = fn(y) { (y * 2) };7"),
+            ("let neg = fn(a) { -a }; let twice = fn(b) { neg(neg(b)) }; twice(4)", "let neg = fn(a) { (-a) };let twice = fn(b) { neg(neg(b)) };4"),
+            (
+                "let f = fn() { let g = fn(x) { x }; let h = fn() { g(1) }; let g = fn(x) { x * 2 }; h() }",
+                "let f = fn() { let g = fn(x) { x };let h = fn() { g(1) };let g = fn(x) { (x * 2) };2 };",
+            ),
+        ]
+
+        for input_code, expected in tests:
+            with self.subTest(input_code=input_code):
+                self.assertEqual(str(self._optimize(input_code)), expected)
+
+    def test_keeps_calls_that_cannot_be_inlined(self):
+        tests = [
+            # Recursive.
+            "let f = fn(n) { if (n < 1) { 0 } else { f(n - 1) } }; f(3)",
+            # Top-level names can be rebound by a later program.
+            "let g = fn(x) { x }; let h = fn() { g(1) }",
+            # Bound more than once, so it depends on when h is called.
+            "let f = fn() { let g = fn(x) { x }; let h = fn() { g(1) }; let g = fn(x) { x * 2 }; h }",
+            # An argument could fail before the body runs.
+            "let first = fn(a, b) { a }; first(1, x + 1)",
+            "let swap = fn(a, b) { b - a }; swap(x + 1, y + 1)",
+            "let sq = fn(a) { a * a }; sq(x + 1)",
+            # The body reads a name the call site shadows.
+            "let f = fn() { let k = 1; let add = fn(x) { x + k }; let g = fn(k) { add(k) }; g }",
+            # The binding may not have run.
+            "if (c) { let g = fn(x) { x }; } g(1)",
+            # A later iteration of the loop rebinds it.
+            "let f = fn(n) { let g = fn(x) { x }; for (i in range(n)) { g(1); let g = fn(x) { x * 2 } }; 0 }",
+        ]
+
+        for input_code in tests:
+            with self.subTest(input_code=input_code):
+                self.assertEqual(
+                    str(self._optimize(input_code)),
+                    str(Parser(Lexer(input_code)).parse_program()),
+                )
+
+    def test_inline_budget(self):
+        input_code = "let f = fn(a) { a * 2 + a * 3 }; f(1)"
+        program = optimize(Parser(Lexer(input_code)).parse_program(), inline_budget=4)
+        self.assertEqual(str(program), "let f = fn(a) { ((a * 2) + (a * 3)) };f(1)")
+        self.assertEqual(str(self._optimize(input_code)), "let f = fn(a) { ((a * 2) + (a * 3)) };5")
+
+    def test_folded_literals(self):
+        program = self._optimize("2 * 3; 2 < 3")
+        self.assertIsInstance(program.statements[0].expression, IntegerLiteral)
+        self.assertIsInstance(program.statements[1].expression, Boolean)
+
+    def test_functions_keep_their_body_as_written(self):
+        program = self._optimize("fn(a) { let c = !!false; }")
+        body = program.statements[0].expression.body
+        self.assertEqual(str(body), "let c = false;")
+        self.assertEqual(str(body.origin), "let c = (!(!false));")
+        self.assertEqual(eval(program, Environment()).inspect(), "fn(a) {\nlet c = (!(!false));\n}")
+
+    def test_same_results_on_every_engine(self):
+        tests = [
+            "let f = fn(x) { if (1 < 2) { return x * (60 * 60); } 0 }; f(2)",
+            "let f = fn() { if (true) { let a = 3; } a }; let a = 7; f()",
+            "if (true) { } ",
+            "let x = 1; if (false) { 10 }",
+            "5; if (true) { 7; return 1 + true; 8 }",
+            "if (1 < 2) { 10 } else { 20 } + (2 * 3 > 5)",
+            "let f = fn() { return 1; f(); }; f()",
+            "let add = fn(a, b) { a + b }; let r = add(1, 2); let add = fn(a, b) { a * b }; r * 10 + add(2, 3)",
+            "let f = fn() { let k = 1; let add = fn(x) { x + k }; let g = fn(k) { add(k) }; g(5) }; f()",
+            "let first = fn(a, b) { a }; first(1, true + 1)",
+            "let sub = fn(a, b) { a - b }; sub(true + 1, 2)",
+            "let pick = fn(c, a, b) { if (c) { a } else { b } }; pick(1 < 2, 10, 20) + pick(false, 1, 2)",
+            "let f = fn(n) { let g = fn(x) { n + x }; let h = fn(y) { g(y * 2) }; h(n) }; f(3)",
+            "let f = fn(n) { let g = fn(x) { x }; let s = 0; for (i in range(n)) { let s = s + g(i); let g = fn(x) { x * 2 } }; s }; f(4)",
+            "let sq = fn(x) { x * x }; let s = 0; for (i in range(2 * 2)) { let s = s + sq(i) }; s",
+            "fn(a) { let c = !!false; }",
+            "let f = fn(n) { let g = fn(x) { x + 1 + 2 }; g(n) * (2 * 3) }; [f, f(1)]",
+        ]
+
+        for input_code in tests:
+            for name, engine in ENGINES.items():
+                with self.subTest(input_code=input_code, engine=name):
+                    expected = engine(Parser(Lexer(input_code)).parse_program(), Environment())
+                    evaluated = engine(self._optimize(input_code), Environment())
+                    self.assertEqual(_describe(evaluated), _describe(expected))
+
+    def _optimize(self, input_code: str):
+        return optimize(Parser(Lexer(input_code)).parse_program())
+
+    def _test_eval(self, input_code: str):
+        return eval(self._optimize(input_code), Environment())
+
+
+def _describe(obj):
+    return None if obj is None else (obj.object_type(), obj.inspect())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,5 @@
 import unittest
-from dessa.ast import IntegerLiteral, ExpressionStatement, PrefixExpression, InfixExpression, IfExpression, BlockStatement, FunctionLiteral, CallExpression
+from dessa.ast import IntegerLiteral, StringLiteral, ExpressionStatement, PrefixExpression, InfixExpression, IfExpression, WhileExpression, ForExpression, BlockStatement, FunctionLiteral, CallExpression, ArrayLiteral, HashLiteral, IndexExpression
 from dessa.lexer import Lexer
 from dessa.parser import Parser
 
@@ -19,6 +19,14 @@ class ParserExpressionsTest(unittest.TestCase):
         self.assertEqual(expression.value, 5)
         self.assertEqual(expression.token_literal(), "5")
 
+    def test_parse_string_literal_expression(self):
+        program = Parser(Lexer('"hello world" + x')).parse_program()
+
+        expression = program.statements[0].expression
+        self.assertIsInstance(expression.left, StringLiteral)
+        self.assertEqual(expression.left.value, "hello world")
+        self.assertEqual(str(expression), '("hello world" + x)')
+
 
     def test_parse_prefix_expression(self):
         prefix_tests = [
@@ -94,6 +102,10 @@ class ParserExpressionsTest(unittest.TestCase):
             ("2 / (5 + 5)", "(2 / (5 + 5))"),
             ("-(5 + 5)", "(-(5 + 5))"),
             ("!(true == true)", "(!(true == true))"),
+            ("a * [1, 2, 3, 4][b * c] * d", "((a * ([1, 2, 3, 4][(b * c)])) * d)"),
+            ("add(a * b[2], b[1], 2 * [1, 2][1])", "add((a * (b[2])), (b[1]), (2 * ([1, 2][1])))"),
+            ("-a[0]", "(-(a[0]))"),
+            ("f(x)[1][2]", "((f(x)[1])[2])"),
         ]
 
         for input_code, expected_str in precedence_tests:
@@ -149,6 +161,99 @@ class ParserExpressionsTest(unittest.TestCase):
         self.assertIsInstance(alternative_stmt, ExpressionStatement)
         self.assertEqual(str(alternative_stmt), "y")
 
+    def test_parse_while_expression(self):
+        program = Parser(Lexer("while (x < y) { let x = x + 1; }")).parse_program()
+
+        self.assertEqual(len(program.statements), 1)
+        expression = program.statements[0].expression
+        self.assertIsInstance(expression, WhileExpression)
+        self.assertEqual(str(expression.condition), "(x < y)")
+        self.assertEqual(len(expression.body.statements), 1)
+        self.assertEqual(str(expression.body.statements[0]), "let x = (x + 1);")
+
+    def test_parse_for_expression(self):
+        tests = [
+            ("for (i in range(10)) { i }", None, "10"),
+            ("for (i in range(n - 1, n * 2)) { i }", "(n - 1)", "(n * 2)"),
+        ]
+
+        for input_code, expected_start, expected_stop in tests:
+            with self.subTest(input_code=input_code):
+                program = Parser(Lexer(input_code)).parse_program()
+                expression = program.statements[0].expression
+                self.assertIsInstance(expression, ForExpression)
+                self.assertEqual(expression.name.value, "i")
+                if expected_start is None:
+                    self.assertIsNone(expression.start)
+                else:
+                    self.assertEqual(str(expression.start), expected_start)
+                self.assertEqual(str(expression.stop), expected_stop)
+                self.assertEqual(str(expression.body), "i")
+
+    def test_parse_for_expression_errors(self):
+        tests = [
+            ("for (i in items) { i }", "expected range, got items instead"),
+            ("for (i in list(3)) { i }", "expected range, got list instead"),
+            ("for (i in range(1, 2, 3)) { i }", "range takes 1 or 2 arguments, got 3"),
+            ("for (1 in range(3)) { 1 }", "expected next token to be IDENT, got INT instead"),
+        ]
+
+        for input_code, expected_error in tests:
+            with self.subTest(input_code=input_code):
+                parser = Parser(Lexer(input_code))
+                with self.assertRaises(Exception):
+                    parser.parse_program()
+                self.assertEqual(parser.errors[0], expected_error)
+
+    def test_parse_array_literal(self):
+        tests = [
+            ("[1, 2 * 2, 3 + 3]", ["1", "(2 * 2)", "(3 + 3)"]),
+            ("[]", []),
+            ("[[x], fn(y) { y }]", ["[x]", "fn(y) { y }"]),
+        ]
+
+        for input_code, expected_elements in tests:
+            with self.subTest(input_code=input_code):
+                program = Parser(Lexer(input_code)).parse_program()
+                expression = program.statements[0].expression
+                self.assertIsInstance(expression, ArrayLiteral)
+                self.assertEqual([str(e) for e in expression.elements], expected_elements)
+
+    def test_parse_hash_literal(self):
+        tests = [
+            ("{}", []),
+            ('{1: 2, true: x + 1}', [("1", "2"), ("true", "(x + 1)")]),
+            ("{a * b: {1: 2}[1], [1][0]: fn() { 1 }}", [("(a * b)", "({1: 2}[1])"), ("([1][0])", "fn() { 1 }")]),
+        ]
+
+        for input_code, expected_pairs in tests:
+            with self.subTest(input_code=input_code):
+                program = Parser(Lexer(input_code)).parse_program()
+                expression = program.statements[0].expression
+                self.assertIsInstance(expression, HashLiteral)
+                self.assertEqual([(str(k), str(v)) for k, v in expression.pairs], expected_pairs)
+
+    def test_parse_hash_literal_errors(self):
+        tests = [
+            ("{1 2}", "expected next token to be :, got INT instead"),
+            ("{1: 2 3: 4}", "expected next token to be ,, got INT instead"),
+        ]
+
+        for input_code, expected_error in tests:
+            with self.subTest(input_code=input_code):
+                parser = Parser(Lexer(input_code))
+                with self.assertRaises(Exception):
+                    parser.parse_program()
+                self.assertEqual(parser.errors[0], expected_error)
+
+    def test_parse_index_expression(self):
+        program = Parser(Lexer("myArray[1 + 1]")).parse_program()
+
+        expression = program.statements[0].expression
+        self.assertIsInstance(expression, IndexExpression)
+        self.assertEqual(str(expression.left), "myArray")
+        self.assertEqual(str(expression.index), "(1 + 1)")
+
     def test_parse_function_literal(self):
         input_code = "fn(x, y) { x + y; }"
         lexer = Lexer(input_code)
@@ -0,0 +1,93 @@
+import unittest
+from dessa.ast import CallExpression, InfixExpression
+from dessa.engine import ENGINES
+from dessa.environment import Environment
+from dessa.evaluator import eval
+from dessa.lexer import Lexer
+from dessa.parser import Parser
+
+
+class QuickeningTest(unittest.TestCase):
+
+    def test_infix_specializes_for_integers(self):
+        program = Parser(Lexer("let add = fn(a, b) { a + b }; add(1, 2)")).parse_program()
+        env = Environment()
+        eval(program, env)
+        node = program.statements[0].value.body.statements[0].expression
+        self.assertIsInstance(node, InfixExpression)
+        self.assertIsNot(type(node), InfixExpression)
+        self.assertEqual(str(node), "(a + b)")
+
+    def test_infix_deoptimizes_when_guard_fails(self):
+        tests = [
+            ("let eq = fn(a, b) { a == b }; eq(1, 1); eq(true, true)", "true"),
+            ("let eq = fn(a, b) { a == b }; eq(1, 1); eq(1, true)", "Error: type mismatch: INTEGER == BOOLEAN"),
+            ("let add = fn(a, b) { a + b }; add(1, 2); add(true, 2)", "Error: type mismatch: BOOLEAN + INTEGER"),
+            ("let add = fn(a, b) { a + b }; add(1, 2); add(1, 2) + add(3, 4)", "10"),
+            ("let lt = fn(a, b) { a < b }; lt(1, 2); lt(true, false)", "Error: unknown operator: BOOLEAN < BOOLEAN"),
+        ]
+        for input_code, expected in tests:
+            with self.subTest(input_code=input_code):
+                self.assertEqual(self._test_eval(input_code).inspect(), expected)
+
+    def test_deoptimized_infix_is_generic_again(self):
+        program = Parser(Lexer(
+            "let f = fn(a, b) { a + b }; f(1, 2); f(true, 1)"
+        )).parse_program()
+        env = Environment()
+        self.assertEqual(eval(program, env).inspect(), "Error: type mismatch: BOOLEAN + INTEGER")
+        node = program.statements[0].value.body.statements[0].expression
+        self.assertIs(type(node), InfixExpression)
+
+    def test_identifier_falls_back_while_unbound(self):
+        evaluated = self._test_eval("let x = 1; let f = fn() { let y = x; let x = 2; y + x }; f() + f()")
+        self.assertEqual(evaluated.value, 6)
+
+    def test_call_specializes_and_deoptimizes(self):
+        program = Parser(Lexer(
+            "let apply = fn(f, x) { f(x) }; apply(fn(x) { x + 1 }, 1); apply(5, 1)"
+        )).parse_program()
+        env = Environment()
+        self.assertEqual(eval(program, env).inspect(), "Error: not a function: INTEGER")
+        call = program.statements[0].value.body.statements[0].expression
+        self.assertIs(type(call), CallExpression)
+
+    def test_call_caches_the_callee_frame_shape(self):
+        program = Parser(Lexer(
+            "let f = fn(a, b) { let c = a + b; c }; let g = fn() { f(1, 2) }; g(); g()"
+        )).parse_program()
+        env = Environment()
+        self.assertEqual(eval(program, env).value, 3)
+        call = program.statements[1].value.body.statements[0].expression
+        self.assertIs(call.cache.body, program.statements[0].value.body)
+        self.assertEqual(call.cache.padding, [None])
+
+    def test_call_cache_follows_the_callee(self):
+        tests = [
+            ("let call = fn(f) { f(1, 2) }; call(fn(a, b) { a - b }); call(fn(a) { a })", 1),
+            ("let call = fn(f) { f(1, 2) }; call(fn(a) { a }); call(fn(a, b) { let c = b; a - c })", -1),
+            ("let call = fn(f) { f(1, 2) }; call(fn(a, a) { a }); call(fn(a, a) { a })", 2),
+        ]
+        for input_code, expected in tests:
+            with self.subTest(input_code=input_code):
+                self.assertEqual(self._test_eval(input_code).value, expected)
+
+    def test_call_cache_checks_arity(self):
+        evaluated = self._test_eval("let call = fn(f) { f(1) }; call(fn(a) { a }); call(fn(a, b) { a })")
+        self.assertEqual(evaluated.message, "wrong number of arguments: want=2, got=1")
+
+    def test_quickened_program_runs_on_every_engine(self):
+        program = Parser(Lexer(
+            "let fib = fn(n) { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } }; fib(12)"
+        )).parse_program()
+        self.assertEqual(eval(program, Environment()).value, 144)
+        for name, engine in ENGINES.items():
+            with self.subTest(engine=name):
+                self.assertEqual(engine(program, Environment()).value, 144)
+
+    def _test_eval(self, input_code: str):
+        return eval(Parser(Lexer(input_code)).parse_program(), Environment())
+
+
+if __name__ == '__main__':
+    unittest.main()
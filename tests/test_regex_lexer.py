@@ -0,0 +1,58 @@
+import unittest
+from unittest import mock
+from dessa.lexer import Lexer, RegexLexer, get_lexer
+from dessa.token import EOF
+from tests import test_lexer
+
+
+class RegexLexerTest(test_lexer.LexerTest):
+    """Runs the lexer tests against RegexLexer."""
+
+    def setUp(self):
+        patcher = mock.patch.object(test_lexer, "Lexer", RegexLexer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class RegexLexerEquivalenceTest(unittest.TestCase):
+    def test_same_tokens_as_lexer(self):
+        tests = [
+            "",
+            "   \n\t\r\n  ",
+            "let add = fn(x, y) {\n  x + y;\n};\nadd(1, 2) == 3 != !true",
+            "if (5 < 10) { return true; } else { return false; }",
+            "a\x00b",
+            "x@#$y",
+            "_foo bar_baz\n\n\n   12345",
+            "überfn naïve_x ٣٤ 9²9 é1",
+            'let s = "a b\n c" + "";\n"x\x00" "unterminated\n1',
+            "a b c",
+        ]
+
+        for input_code in tests:
+            with self.subTest(input_code=input_code):
+                self.assertEqual(
+                    self._tokens(RegexLexer, input_code),
+                    self._tokens(Lexer, input_code),
+                )
+
+    def test_repeated_eof(self):
+        lexer = RegexLexer("x\n ")
+        lexer.next_token()
+        columns = [lexer.next_token().column for _ in range(3)]
+        self.assertEqual(columns, [2, 3, 4])
+
+    def test_get_lexer(self):
+        self.assertIs(get_lexer("regex"), RegexLexer)
+        self.assertIs(get_lexer("char"), Lexer)
+        with self.assertRaises(ValueError):
+            get_lexer("unknown")
+
+    def _tokens(self, lexer_class, input_code):
+        lexer = lexer_class(input_code)
+        tokens = []
+        while True:
+            token = lexer.next_token()
+            tokens.append(token)
+            if token.type == EOF and len(tokens) > len(input_code):
+                return tokens
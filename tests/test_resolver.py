@@ -0,0 +1,124 @@
+import unittest
+from dessa.ast import LetStatement, Identifier, walk
+from dessa.environment import Environment, Frame
+from dessa.evaluator import eval
+from dessa.lexer import Lexer
+from dessa.object import Integer
+from dessa.parser import Parser
+from dessa.resolver import resolve
+
+
+class ResolverTest(unittest.TestCase):
+    def test_function_frame_layout(self):
+        program = self._resolve("fn(a, b) { let c = a; if (c) { let d = b; } }")
+        function = program.statements[0].expression
+        self.assertEqual(function.slots, {"a": 0, "b": 1, "c": 2, "d": 3})
+
+    def test_captured_variables_get_cells(self):
+        program = self._resolve("fn(a, b) { let c = a; let d = 1; fn() { b + c } }")
+        function = program.statements[0].expression
+        self.assertEqual(function.slots, {"a": 0, "d": 1})
+        self.assertEqual(function.cells, {"b": 0, "c": 1})
+        let_c = function.body.statements[0]
+        self.assertEqual((let_c.name.depth, let_c.name.slot), (1, 1))
+
+    def test_closures_keep_only_captured_variables(self):
+        env = Environment()
+        eval(Parser(Lexer("""
+        let make = fn(big) { let n = big + 1; let unused = big * 2; fn() { n } };
+        let f = make(10);
+        """)).parse_program(), env)
+        captured = env.get("f").env.bindings()
+        self.assertEqual(captured["n"].value, 11)
+        self.assertNotIn("big", captured)
+        self.assertNotIn("unused", captured)
+
+    def test_frames_that_cannot_escape_take_the_arguments(self):
+        program = self._resolve("""
+        let f = fn(a, b) { let c = a + b; c };
+        let g = fn(a) { let c = a; fn() { c } };
+        let h = fn(a, a) { let c = a; c };
+        """)
+        self.assertEqual(program.statements[0].value.padding, [None])
+        self.assertIsNone(program.statements[1].value.padding)
+        self.assertIsNone(program.statements[2].value.padding)
+
+    def test_closures_know_the_captured_parameters_that_never_change(self):
+        program = self._resolve("""
+        fn(a, b, c) { let c = 1; fn() { a + c }; fn() { b }; fn(a) { a } }
+        """)
+        first, second, third = [s.expression for s in program.statements[0].expression.body.statements[1:]]
+        self.assertEqual(first.constants, [0])
+        self.assertEqual(second.constants, [1])
+        self.assertIsNone(third.constants)
+
+    def test_identifier_addresses(self):
+        program = self._resolve("""
+        let g = 1;
+        let newAdder = fn(x) {
+          fn(y) { x + y + g };
+        };
+        """)
+        addresses = {
+            node.value: (node.depth, node.slot)
+            for node in self._identifiers(program)
+        }
+        self.assertEqual(addresses["x"], (1, 0))
+        self.assertEqual(addresses["y"], (0, 0))
+        self.assertEqual(addresses["g"], (2, None))
+
+    def test_let_targets_get_slots(self):
+        program = self._resolve("let top = fn() { let a = 1; a };")
+        top_level = program.statements[0]
+        self.assertIsNone(top_level.name.slot)
+        inner = program.statements[0].value.body.statements[0]
+        self.assertIsInstance(inner, LetStatement)
+        self.assertEqual((inner.name.depth, inner.name.slot), (0, 0))
+
+    def test_program_is_resolved_once(self):
+        program = Parser(Lexer("1")).parse_program()
+        self.assertFalse(program.resolved)
+        resolve(program)
+        self.assertTrue(program.resolved)
+
+    def test_function_calls_use_frames(self):
+        env = Environment()
+        eval(Parser(Lexer("let f = fn(a) { let b = a * 2; b };")).parse_program(), env)
+        frame = Frame(env, env.get("f").slots, [Integer(1), None])
+        self.assertEqual(frame.get("a").value, 1)
+        self.assertIs(frame.get("f"), env.get("f"))
+        frame.set("b", Integer(2))
+        self.assertEqual(frame.get_at(0, 1, "b").value, 2)
+
+    def test_unbound_slot_falls_back_outward(self):
+        tests = [
+            ("let x = 1; let f = fn() { let y = x; let x = 2; y * 10 + x }; f()", 12),
+            ("let f = fn() { let g = fn() { x }; let x = 7; g() }; f()", 7),
+            ("let x = 3; let f = fn(n) { if (n) { let x = 4; } x }; f(false) * 10 + f(true)", 34),
+            ("let f = fn(x, x) { x }; f(1, 2)", 2),
+            ("let f = fn(x, x) { let y = 3; x * y }; f(1, 2)", 6),
+        ]
+
+        for input_code, expected in tests:
+            with self.subTest(input_code=input_code):
+                evaluated = eval(Parser(Lexer(input_code)).parse_program(), Environment())
+                self.assertIsInstance(evaluated, Integer)
+                self.assertEqual(evaluated.value, expected)
+
+    def _resolve(self, input_code: str):
+        return resolve(Parser(Lexer(input_code)).parse_program())
+
+    def _identifiers(self, program):
+        nodes = list(walk(program.statements))
+        identifiers = []
+        while nodes:
+            node = nodes.pop()
+            if isinstance(node, Identifier):
+                identifiers.append(node)
+            elif hasattr(node, "body"):
+                nodes.extend(walk(node.body.statements))
+        return identifiers
+
+
+if __name__ == '__main__':
+    unittest.main()
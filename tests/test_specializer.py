@@ -0,0 +1,71 @@
+import unittest
+from dessa.environment import Environment
+from dessa.evaluator import eval
+from dessa.lexer import Lexer
+from dessa.object import Integer
+from dessa.parser import Parser
+from dessa.specializer import MAX_SPECIALIZATIONS
+
+
+class SpecializerTest(unittest.TestCase):
+    def test_closures_get_folded_bodies(self):
+        env = self._run("""
+        let newAdder = fn(x) { fn(y) { y + x * 2 } };
+        let a = newAdder(3);
+        let b = newAdder(3);
+        let c = newAdder(4);
+        """)
+        a, b, c = env.get("a"), env.get("b"), env.get("c")
+        self.assertIs(a.body, b.body)
+        self.assertIsNot(a.body, c.body)
+        self.assertEqual(str(a.body), "(y + 6)")
+        self.assertEqual(str(c.body), "(y + 8)")
+        self.assertEqual(a.inspect(), "fn(y) {\n(y + (x * 2))\n}")
+
+    def test_only_unchanging_integers_and_booleans_are_substituted(self):
+        env = self._run("""
+        let f = fn(x) { fn() { x } };
+        let g = fn(x) { let h = fn() { x }; let x = 2; h };
+        let flag = f(true);
+        let fun = f(fn() { 1 });
+        let rebound = g(1);
+        """)
+        self.assertEqual(str(env.get("flag").body), "true")
+        self.assertEqual(str(env.get("fun").body), "x")
+        self.assertEqual(str(env.get("rebound").body), "x")
+
+    def test_specializations_are_bounded(self):
+        env = self._run(f"""
+        let newAdder = fn(x) {{ fn(y) {{ x + y }} }};
+        let make = fn(n) {{ if (n == 0) {{ newAdder(0) }} else {{ make(n - 1); newAdder(n) }} }};
+        let last = make({MAX_SPECIALIZATIONS + 2});
+        """)
+        self.assertEqual(str(env.get("last").body), "(x + y)")
+
+    def test_specialized_results(self):
+        tests = [
+            ("let newAdder = fn(x) { fn(y) { x + y } }; newAdder(2)(3)", 5),
+            ("let f = fn(x) { fn(y) { fn(z) { x + y + z } } }; f(1)(2)(3) + f(1)(2)(4)", 13),
+            ("let f = fn(x) { fn(x) { x } }; f(1)(2)", 2),
+            ("let f = fn(x) { fn(y) { let x = y; x } }; f(1)(2)", 2),
+            ("let f = fn(x) { fn(y) { let z = x; let x = y; z * 10 + x } }; f(1)(2)", 12),
+            ("let f = fn(b) { fn(y) { if (b) { y } else { 0 - y } } }; f(true)(5) + f(false)(2)", 3),
+            ("let f = fn(x) { fn(y) { fn() { x + y } } }; f(1)(2)() + f(1)(5)()", 9),
+            ("let f = fn(x) { fn(y) { if (x == 1) { return y; }; 0 } }; f(1)(7) + f(2)(7)", 7),
+            ("let f = fn(x) { fn(n) { if (n == 0) { x } else { f(x + 1)(n - 1) } } }; f(0)(20)", 20),
+        ]
+
+        for input_code, expected in tests:
+            with self.subTest(input_code=input_code):
+                evaluated = eval(Parser(Lexer(input_code)).parse_program(), Environment())
+                self.assertIsInstance(evaluated, Integer)
+                self.assertEqual(evaluated.value, expected)
+
+    def _run(self, input_code: str) -> Environment:
+        env = Environment()
+        eval(Parser(Lexer(input_code)).parse_program(), env)
+        return env
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+from dessa.environment import Environment
+from dessa.lexer import Lexer
+from dessa.object import Error, Integer
+from dessa.parser import Parser
+from dessa.stack_evaluator import StackEvaluator, run
+from tests import test_evaluator
+
+
+class StackEvaluatorTest(test_evaluator.EvaluatorTest):
+    """Runs the evaluator suite against the explicit-stack evaluator."""
+
+    def test_deep_recursion(self):
+        input_code = """
+        let sum = fn(n) { if (n == 0) { return 0; } n + sum(n - 1) };
+        sum(20000);
+        """
+        evaluated = self._test_eval(input_code)
+        self.assertIsInstance(evaluated, Integer)
+        self.assertEqual(evaluated.value, 200010000)
+
+    def test_tail_calls_do_not_count_toward_depth(self):
+        input_code = "let c = fn(n) { if (n == 0) { 0 } else { c(n - 1) } }; c(5000)"
+        program = Parser(Lexer(input_code)).parse_program()
+        evaluated = StackEvaluator(max_depth=10).run(program, Environment())
+        self.assertIsInstance(evaluated, Integer)
+        self.assertEqual(evaluated.value, 0)
+
+    def test_max_depth(self):
+        input_code = "let f = fn(n) { 1 + f(n + 1) }; f(0)"
+        program = Parser(Lexer(input_code)).parse_program()
+        evaluated = StackEvaluator(max_depth=500).run(program, Environment())
+        self.assertIsInstance(evaluated, Error)
+        self.assertEqual(evaluated.message, "stack overflow")
+
+    def test_deep_recursion_through_builtin_callbacks(self):
+        tests = [
+            ("let f = fn(n) { if (n == 0) { 0 } else { 1 + map([n], fn(x) { f(x - 1) })[0] } }; f(3000)", 3000),
+            ("let f = fn(n) { if (n == 0) { 0 } else { 1 + len(filter([n], fn(x) { f(x - 1) > 0 })) } }; f(3000)", 2),
+            ("let f = fn(n) { if (n == 0) { 0 } else { 1 + reduce([n], 0, fn(a, x) { f(x - 1) }) } }; f(3000)", 3000),
+        ]
+
+        for input_code, expected in tests:
+            with self.subTest(input_code=input_code):
+                evaluated = self._test_eval(input_code)
+                self.assertIsInstance(evaluated, Integer)
+                self.assertEqual(evaluated.value, expected)
+
+    def test_builtin_callbacks_count_toward_depth(self):
+        tests = [
+            "let f = fn(n) { if (n == 0) { 0 } else { 1 + map([n], fn(x) { f(x - 1) })[0] } }; f(200)",
+            "let f = fn(n) { if (n == 0) { 0 } else { 1 + map([n], fn(x) { f(x - 1) })[0] } }; map([200], f)",
+            "let f = fn(n) { if (n == 0) { 0 } else { 1 + reduce([n], 0, fn(a, x) { f(x - 1) }) } }; f(200)",
+        ]
+
+        for input_code in tests:
+            with self.subTest(input_code=input_code):
+                program = Parser(Lexer(input_code)).parse_program()
+                evaluated = StackEvaluator(max_depth=10).run(program, Environment())
+                self.assertIsInstance(evaluated, Error)
+                self.assertEqual(evaluated.message, "stack overflow")
+
+    def _test_eval(self, input_code: str):
+        return run(Parser(Lexer(input_code)).parse_program(), Environment())
+
+
+if __name__ == '__main__':
+    unittest.main()
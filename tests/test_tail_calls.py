@@ -0,0 +1,75 @@
+import unittest
+from dessa.ast import CallExpression, FunctionLiteral, walk
+from dessa.engine import run
+from dessa.lexer import Lexer
+from dessa.object import Boolean, Error, Integer
+from dessa.parser import Parser
+from dessa.resolver import resolve
+
+
+class TailCallTest(unittest.TestCase):
+    def test_marks_tail_calls(self):
+        input_code = """
+        let f = fn(n) {
+          if (n == 0) { return g(1); }
+          let x = g(2);
+          let y = if (n) { return g(7); } else { 0 };
+          if (x) { return if (n) { return g(8); } else { g(9) }; }
+          if (n) { g(3) } else { g(4) + g(5) }
+        };
+        g(6);
+        """
+        program = resolve(Parser(Lexer(input_code)).parse_program())
+        calls = [node for node in _all_nodes(program) if isinstance(node, CallExpression)]
+        tail = sorted(call.arguments[0].value for call in calls if call.tail)
+        self.assertEqual(tail, [1, 3, 9])
+
+    def test_deep_tail_recursion(self):
+        tests = [
+            ("let c = fn(n) { if (n == 0) { return 0; } c(n - 1) }; c(20000)", 0),
+            ("let c = fn(n, acc) { if (n == 0) { acc } else { return c(n - 1, acc + n); } }; c(20000, 0)", 200010000),
+        ]
+
+        for input_code, expected in tests:
+            with self.subTest(input_code=input_code):
+                evaluated = run(input_code)
+                self.assertIsInstance(evaluated, Integer)
+                self.assertEqual(evaluated.value, expected)
+
+    def test_mutual_tail_recursion(self):
+        input_code = """
+        let even = fn(n) { if (n == 0) { true } else { odd(n - 1) } };
+        let odd = fn(n) { if (n == 0) { false } else { even(n - 1) } };
+        even(20001);
+        """
+        evaluated = run(input_code)
+        self.assertIsInstance(evaluated, Boolean)
+        self.assertFalse(evaluated.value)
+
+    def test_tail_call_errors(self):
+        tests = [
+            ("let f = fn() { g() }; let g = 5; f()", "not a function: INTEGER"),
+            ("let f = fn() { return h(); }; f()", "identifier not found: h"),
+            ("let f = fn(n) { if (n == 0) { 1 + true } else { f(n - 1) } }; f(5000)", "type mismatch: INTEGER + BOOLEAN"),
+        ]
+
+        for input_code, expected in tests:
+            with self.subTest(input_code=input_code):
+                evaluated = run(input_code)
+                self.assertIsInstance(evaluated, Error)
+                self.assertEqual(evaluated.message, expected)
+
+
+def _all_nodes(program):
+    # walk stops at function literals, so descend into their bodies too.
+    pending = list(program.statements)
+    while pending:
+        node = pending.pop()
+        for child in walk([node]):
+            yield child
+            if isinstance(child, FunctionLiteral):
+                pending.extend(child.body.statements)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+from unittest import mock
+from dessa.lexer import Lexer, tokenize
+from dessa.parser import Parser
+from dessa.token import Token, TOKEN_TYPES, LET, IDENT, ASSIGN, INT, SEMICOLON, EOF
+from tests import test_parser, test_parser_expressions, test_parser_statements
+
+
+class TokenBufferTest(unittest.TestCase):
+    def test_tokenize(self):
+        buffer = tokenize("let x = 5;\n  x")
+
+        self.assertEqual(buffer.types.typecode, "B")
+        self.assertEqual(buffer.starts.typecode, "I")
+        self.assertEqual(buffer.ends.typecode, "I")
+        self.assertEqual(
+            [TOKEN_TYPES[code] for code in buffer.types],
+            [LET, IDENT, ASSIGN, INT, SEMICOLON, IDENT, EOF],
+        )
+        self.assertEqual(list(buffer.starts), [0, 4, 6, 8, 9, 13, 14])
+        self.assertEqual(list(buffer.ends), [3, 5, 7, 9, 10, 14, 14])
+        self.assertEqual(buffer.literal(0), "let")
+        self.assertEqual(buffer.token(5), Token(IDENT, "x", 2, 3))
+        self.assertEqual(buffer.token(6), Token(EOF, "", 2, 4))
+
+    def test_same_tokens_as_lexer(self):
+        tests = [
+            "",
+            "let add = fn(x, y) {\n  x + y;\n};\nadd(1, 2) == 3 != !true",
+            "if (5 < 10) { return true; } else { return false; }",
+            "x@#$y\n\n   12345",
+            "überfn naïve_x ٣٤ 9²9 é1",
+            'let s = "a b\n c" + "";\n"x\x00" "unterminated\n1',
+        ]
+
+        for input_code in tests:
+            with self.subTest(input_code=input_code):
+                buffer = tokenize(input_code)
+                lexer = Lexer(input_code)
+                tokens = [buffer.token(i) for i in range(len(buffer))]
+                self.assertEqual(tokens, [lexer.next_token() for _ in tokens])
+
+    def test_stops_at_nul(self):
+        buffer = tokenize("a\x00b")
+        self.assertEqual([buffer.type(i) for i in range(len(buffer))], [IDENT, EOF])
+        self.assertEqual(buffer.token(1), Token(EOF, "", 1, 2))
+
+    def test_parser_reads_buffer(self):
+        input_code = "let f = fn(a, b) { if (a < b) { return a; } a * -b }; f(1, 2 + 3)"
+        self.assertEqual(
+            str(Parser(tokenize(input_code)).parse_program()),
+            str(Parser(Lexer(input_code)).parse_program()),
+        )
+
+
+class _BufferParserMixin:
+    """Runs a parser test case with tokenize in place of Lexer."""
+
+    module = None
+
+    def setUp(self):
+        patcher = mock.patch.object(self.module, "Lexer", tokenize)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class BufferParserTest(_BufferParserMixin, test_parser.ParserTest):
+    module = test_parser
+
+
+class BufferParserExpressionsTest(_BufferParserMixin, test_parser_expressions.ParserExpressionsTest):
+    module = test_parser_expressions
+
+
+class BufferParserStatementsTest(_BufferParserMixin, test_parser_statements.ParserStatementsTest):
+    module = test_parser_statements
@@ -0,0 +1,105 @@
+import gc
+import unittest
+import weakref
+from dessa import transpiler
+from dessa.environment import Environment
+from dessa.lexer import Lexer
+from dessa.object import Integer, Error, ReturnValue
+from dessa.parser import Parser
+from tests import test_evaluator
+
+
+class TranspilerTest(test_evaluator.EvaluatorTest):
+    """Runs the evaluator suite against the Python transpiler."""
+
+    def test_function_object(self):
+        evaluated = self._test_eval("fn(x) { x + 2; };")
+        self.assertIsInstance(evaluated, transpiler.TranspiledFunction)
+        self.assertEqual(evaluated.arity, 1)
+        self.assertEqual(evaluated.inspect(), "fn(x) {\n(x + 2)\n}")
+
+    def test_evaluation_order_with_hoisted_blocks(self):
+        tests = [
+            ("let x = 1; x + if (true) { let x = 5; x }", 6),
+            ("let x = 1; let f = fn() { let y = x; let x = 2; y * 10 + x }; f()", 12),
+            ("let f = fn() { let g = fn() { x }; let x = 7; g() }; f()", 7),
+            ("let f = fn(x, x) { x }; f(1, 2)", 2),
+        ]
+
+        for input_code, expected in tests:
+            with self.subTest(input_code=input_code):
+                evaluated = self._test_eval(input_code)
+                self.assertIsInstance(evaluated, Integer)
+                self.assertEqual(evaluated.value, expected)
+
+    def test_return_inside_if_value(self):
+        input_code = "let f = fn() { let x = if (true) { return 5; } else { 2 }; x }; f()"
+        evaluated = transpiler.run(Parser(Lexer(input_code)).parse_program(), Environment())
+        self.assertIsInstance(evaluated, Integer)
+        self.assertEqual(evaluated.value, 5)
+
+    def test_statements_pass_on_a_held_return_value(self):
+        tests = [
+            ("let x = if (true) { return 1 }; x; 7", 1),
+            ("let x = if (true) { return 1 }; if (true) { x }; 7", 1),
+            ("let x = [if (true) { return 4 }]; x[0]; 7", 4),
+            ("let f = fn() { let a = while (true) { return 4 }; a; 9 }; f()", 4),
+            ("let f = fn(x) { x }; f(if (true) { return 3 }); 9", 9),
+        ]
+
+        for input_code, expected in tests:
+            with self.subTest(input_code=input_code):
+                self.assertEqual(self._test_eval(input_code).value, expected)
+
+    def test_namespace_is_freed_with_its_environment(self):
+        env = Environment()
+        transpiler.run(Parser(Lexer("let f = fn() { 1 }; f()")).parse_program(), env)
+        namespace = weakref.ref(transpiler._namespace(env)["_0set"])
+        del env
+        gc.collect()
+        self.assertIsNone(namespace())
+
+    def test_errors(self):
+        tests = [
+            ("foo + if (true) { bar } else { 1 }", "identifier not found: foo"),
+            ("1(2)", "not a function: INTEGER"),
+        ]
+
+        for input_code, expected_message in tests:
+            with self.subTest(input_code=input_code):
+                evaluated = self._test_eval(input_code)
+                self.assertIsInstance(evaluated, Error)
+                self.assertEqual(evaluated.message, expected_message)
+
+    def test_deep_recursion(self):
+        input_code = """
+        let count = fn(n) { if (n == 0) { 0 } else { 1 + count(n - 1) } };
+        count(500);
+        """
+        evaluated = self._test_eval(input_code)
+        self.assertEqual(evaluated.value, 500)
+
+    def test_globals_persist_across_runs(self):
+        env = Environment()
+        transpiler.run_source("let add = fn(a, b) { a + b };", env)
+        evaluated = transpiler.run_source("add(2, 3)", env)
+        self.assertEqual(evaluated.value, 5)
+        self.assertIs(env.get("add").object_type(), "FUNCTION")
+
+    def test_code_objects_are_cached_per_source(self):
+        source = "let a = 20; a * 2 + 2"
+        code = transpiler.compile_source(source)
+        self.assertIs(transpiler.compile_source(source), code)
+        self.assertEqual(transpiler.execute(code, Environment()).value, 42)
+        self.assertEqual(transpiler.execute(code, Environment()).value, 42)
+
+    def _test_eval(self, input_code: str):
+        program = Parser(Lexer(input_code)).parse_program()
+        evaluated = transpiler.run(program, Environment())
+        if isinstance(evaluated, ReturnValue):
+            return evaluated.value
+        return evaluated
+
+
+if __name__ == '__main__':
+    unittest.main()
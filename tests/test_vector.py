@@ -0,0 +1,62 @@
+import unittest
+from dessa.engine import ENGINES, run
+from dessa.environment import Environment
+from dessa.object import Vector, new_array, new_integer, numpy
+
+
+@unittest.skipIf(numpy is None, "NumPy is not installed")
+class VectorTest(unittest.TestCase):
+    def test_elementwise_operators(self):
+        tests = [
+            ("let v = vector([1, 2, 3]); [v + 1, v * v, 10 - v, v / 2]",
+             "[vector([2, 3, 4]), vector([1, 4, 9]), vector([9, 8, 7]), vector([0, 1, 1])]"),
+            ("let v = vector([1, 2, 3]); [v < 2, 2 > v, v == v, v != 2]",
+             "[vector([1, 0, 0]), vector([1, 0, 0]), vector([1, 1, 1]), vector([1, 0, 1])]"),
+            ("let v = vector([5, 6]); [sum(v * 2), len(v), v[1], v[2], sum(v > 5)]", "[22, 2, 6, null, 1]"),
+            ("let f = fn(x) { x * 2 + 1 }; [f(vector([1, 2])), f(3)]", "[vector([3, 5]), 7]"),
+            ("vector([9223372036854775807]) + 1", "vector([-9223372036854775808])"),
+            ("vector([])", "vector([])"),
+        ]
+
+        for engine in ENGINES:
+            for input_code, expected in tests:
+                with self.subTest(engine=engine, input_code=input_code):
+                    self.assertEqual(run(input_code, Environment(), engine=engine).inspect(), expected)
+
+    def test_errors(self):
+        tests = [
+            ("vector([1, 2]) + vector([1])", "vector lengths differ: 2 + 1"),
+            ("vector([1, 0]) / vector([1, 0])", "division by zero"),
+            ("true + vector([1])", "type mismatch: BOOLEAN + VECTOR"),
+            ("vector([1]) + 99999999999999999999", "integer too large for a vector: 99999999999999999999"),
+            ("vector([1, true])", "vector elements must be INTEGER, got BOOLEAN"),
+            ("vector([99999999999999999999])", "vector elements must fit in 64 bits"),
+            ("vector(1)", "argument to `vector` must be ARRAY, got INTEGER"),
+            ("-vector([1])", "unknown operator: -VECTOR"),
+        ]
+
+        for input_code, expected_message in tests:
+            with self.subTest(input_code=input_code):
+                self.assertEqual(run(input_code, Environment()).message, expected_message)
+
+    def test_bulk_arithmetic_is_one_call(self):
+        env = Environment()
+        env.set("a", new_array([new_integer(i) for i in range(1_000_000)]))
+        evaluated = run("let v = vector(a); sum(v * 3 - v / 2 > 10)", env, engine="closures")
+        self.assertEqual(evaluated.value, 999_995)
+
+    def test_vectors_do_not_share_array_storage(self):
+        evaluated = run("let a = push([1], 2); let v = vector(a); [v, push(a, 3)]", Environment())
+        self.assertIsInstance(evaluated.get(0), Vector)
+        self.assertEqual(evaluated.inspect(), "[vector([1, 2]), [1, 2, 3]]")
+
+
+@unittest.skipUnless(numpy is None, "NumPy is installed")
+class MissingNumPyTest(unittest.TestCase):
+    def test_vector_reports_missing_numpy(self):
+        evaluated = run("vector([1])", Environment())
+        self.assertEqual(evaluated.message, "`vector` needs NumPy, which is not installed")
+
+
+if __name__ == "__main__":
+    unittest.main()
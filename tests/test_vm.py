@@ -0,0 +1,220 @@
+import unittest
+from dessa.compiler import compile_program
+from dessa.environment import Environment
+from dessa.engine import run
+from dessa.lexer import Lexer
+from dessa.object import Integer, Boolean, NULL, Error, Closure
+from dessa.parser import Parser
+from dessa.vm import VM
+
+
+class VMTest(unittest.TestCase):
+    def test_integer_arithmetic(self):
+        tests = [
+            ("5", 5),
+            ("-5", -5),
+            ("5 + 5 + 5 + 5 - 10", 10),
+            ("2 * 2 * 2 * 2 * 2", 32),
+            ("50 / 2 * 2 + 10", 60),
+            ("(5 + 10 * 2 + 15 / 3) * 2 + -10", 50),
+            ("-7 / 2", -4),
+        ]
+
+        for input_code, expected in tests:
+            with self.subTest(input_code=input_code):
+                self._assert_integer(self._run(input_code), expected)
+
+    def test_boolean_expressions(self):
+        tests = [
+            ("true", True),
+            ("!true", False),
+            ("!!5", True),
+            ("1 < 2", True),
+            ("1 != 1", False),
+            ("true == true", True),
+            ("true != false", True),
+            ("(1 > 2) == false", True),
+        ]
+
+        for input_code, expected in tests:
+            with self.subTest(input_code=input_code):
+                evaluated = self._run(input_code)
+                self.assertIsInstance(evaluated, Boolean)
+                self.assertEqual(evaluated.value, expected)
+
+    def test_conditionals(self):
+        tests = [
+            ("if (true) { 10 }", 10),
+            ("if (false) { 10 }", None),
+            ("if (1) { 10 }", 10),
+            ("if (1 > 2) { 10 } else { 20 }", 20),
+        ]
+
+        for input_code, expected in tests:
+            with self.subTest(input_code=input_code):
+                evaluated = self._run(input_code)
+                if expected is None:
+                    self.assertIs(evaluated, NULL)
+                else:
+                    self._assert_integer(evaluated, expected)
+
+    def test_return_statements(self):
+        tests = [
+            ("return 10; 9;", 10),
+            ("9; return 2 * 5; 9;", 10),
+            ("if (10 > 1) { if (10 > 1) { return 10; } return 1; }", 10),
+            ("let f = fn() { if (true) { return 1; } 2 }; f() + 10", 11),
+            ("let x = if (true) { return 1 }; x; 7", 1),
+            ("let f = fn(x) { x }; f(if (true) { return 3 }); 9", 9),
+            ("if (if (true) { return 1 }) { 5 }", 5),
+            ("let f = fn() { let a = while (true) { return 4 }; a; 9 }; f()", 4),
+        ]
+
+        for input_code, expected in tests:
+            with self.subTest(input_code=input_code):
+                self._assert_integer(self._run(input_code), expected)
+
+    def test_loops(self):
+        tests = [
+            ("let i = 0; let s = 0; while (i < 5) { let i = i + 1; let s = s + i }; s", 15),
+            ("let f = fn(n) { let s = 0; for (i in range(1, n + 1)) { let s = s + i }; s }; f(100)", 5050),
+            ("let f = fn(n) { for (i in range(n)) { for (j in range(n)) { if (i * j == 6) { return i * 10 + j } } }; 0 }; f(5) + 1", 24),
+        ]
+
+        for input_code, expected in tests:
+            with self.subTest(input_code=input_code):
+                self._assert_integer(self._run(input_code), expected)
+
+    def test_arrays_and_builtins(self):
+        tests = [
+            ("[1, 2 * 2, 3][1]", 4),
+            ("let a = [1, 2, 3]; a[0] + a[2]", 4),
+            ("let f = fn(n) { sum(map(push([1, 2], n), fn(x) { x * n })) }; f(3)", 18),
+            ("let f = fn(k) { reduce([1, 2, 3], 0, fn(s, x) { if (x == k) { return s }; s + x }) }; f(2)", 4),
+            ("let len = fn(a) { 0 }; len([1])", 0),
+            ("let h = {1: 2, true: {3: 4}}; h[1] + h[true][3]", 6),
+            ("let f = fn(k) { {k: k * 2}[k] }; f(100000)", 200000),
+        ]
+
+        for input_code, expected in tests:
+            with self.subTest(input_code=input_code):
+                self._assert_integer(self._run(input_code), expected)
+
+        self.assertEqual(self._run('let f = fn(s) { s + "!" }; f("hi") + f("")').inspect(), "hi!!")
+        self.assertIs(self._run("[1][1]"), NULL)
+        self.assertEqual(self._run("map([1], fn(x) { x + true })").message, "type mismatch: INTEGER + BOOLEAN")
+
+    def test_let_without_value(self):
+        self.assertIsNone(self._run("let a = 5;"))
+        self.assertIsNone(self._run("if (true) { let a = 5; }"))
+
+    def test_error_handling(self):
+        tests = [
+            ("5 + true;", "type mismatch: INTEGER + BOOLEAN"),
+            ("5 + true; 5;", "type mismatch: INTEGER + BOOLEAN"),
+            ("-true", "unknown operator: -BOOLEAN"),
+            ("true + false;", "unknown operator: BOOLEAN + BOOLEAN"),
+            ("if (10 > 1) { return true + false; }", "unknown operator: BOOLEAN + BOOLEAN"),
+            ("foobar", "identifier not found: foobar"),
+            ("let f = fn() { foobar }; f()", "identifier not found: foobar"),
+            ("1(2)", "not a function: INTEGER"),
+            ("fn(a, b) { a }(1)", "wrong number of arguments: want=2, got=1"),
+        ]
+
+        for input_code, expected_message in tests:
+            with self.subTest(input_code=input_code):
+                evaluated = self._run(input_code)
+                self.assertIsInstance(evaluated, Error)
+                self.assertEqual(evaluated.message, expected_message)
+
+    def test_function_application(self):
+        tests = [
+            ("let identity = fn(x) { x; }; identity(5);", 5),
+            ("let identity = fn(x) { return x; }; identity(5);", 5),
+            ("let add = fn(x, y) { x + y; }; add(5 + 5, add(5, 5));", 20),
+            ("fn(x) { x; }(5)", 5),
+            ("let f = fn(x) { let y = x * 2; y + 1 }; f(3)", 7),
+        ]
+
+        for input_code, expected in tests:
+            with self.subTest(input_code=input_code):
+                self._assert_integer(self._run(input_code), expected)
+
+    def test_function_object(self):
+        evaluated = self._run("fn(x) { x + 2; };")
+        self.assertIsInstance(evaluated, Closure)
+        self.assertEqual(evaluated.inspect(), "fn(x) {\n(x + 2)\n}")
+
+    def test_closures(self):
+        tests = [
+            ("let newAdder = fn(x) { fn(y) { x + y }; }; let addTwo = newAdder(2); addTwo(2);", 4),
+            ("let a = fn(x) { fn(y) { fn(z) { x + y + z } } }; a(1)(2)(3)", 6),
+            (
+                "let f = fn() { let g = fn(n) { if (n == 0) { 0 } else { g(n - 1) } }; g(10) }; f()",
+                0,
+            ),
+            ("let f = fn() { let g = fn() { x }; let x = 7; g() }; f()", 7),
+        ]
+
+        for input_code, expected in tests:
+            with self.subTest(input_code=input_code):
+                self._assert_integer(self._run(input_code), expected)
+
+    def test_lookup_falls_back_before_local_let(self):
+        input_code = "let x = 1; let f = fn() { let y = x; let x = 2; y * 10 + x }; f()"
+        self._assert_integer(self._run(input_code), 12)
+
+    def test_recursive_fibonacci(self):
+        input_code = """
+        let fib = fn(n) { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } };
+        fib(15);
+        """
+        self._assert_integer(self._run(input_code), 610)
+
+    def test_deep_recursion(self):
+        input_code = """
+        let count = fn(n) { if (n == 0) { 0 } else { 1 + count(n - 1) } };
+        count(5000);
+        """
+        self._assert_integer(self._run(input_code), 5000)
+
+    def test_stack_overflow(self):
+        program = Parser(Lexer("let f = fn() { f() }; f()")).parse_program()
+        evaluated = VM(compile_program(program), Environment(), max_frames=100).run()
+        self.assertIsInstance(evaluated, Error)
+        self.assertEqual(evaluated.message, "stack overflow")
+
+    def test_globals_persist_across_runs(self):
+        env = Environment()
+        run("let add = fn(a, b) { a + b };", env, engine="vm")
+        self._assert_integer(run("add(2, 3)", env, engine="vm"), 5)
+
+    def test_functions_keep_their_pools_across_runs(self):
+        env = Environment()
+        self._assert_integer(run("let f = fn(a) { a + 1 }; f(1)", env, engine="vm"), 2)
+        self._assert_integer(run("let z = 7; f(5)", env, engine="vm"), 6)
+        self._assert_integer(run("let g = fn(a) { fn(b) { a + b } }; g(1)(2)", env, engine="vm"), 3)
+        self._assert_integer(run('let s = "s"; let t = true; g(f(1))(3)', env, engine="vm"), 5)
+
+    def test_return_inside_an_if_used_as_a_value(self):
+        tests = [
+            ("1 + if (true) { return 2 }", "type mismatch: INTEGER + RETURN_VALUE"),
+            ("-if (true) { return 2 }", "unknown operator: -RETURN_VALUE"),
+        ]
+
+        for input_code, expected in tests:
+            with self.subTest(input_code=input_code):
+                evaluated = self._run(input_code)
+                self.assertIsInstance(evaluated, Error)
+                self.assertEqual(evaluated.message, expected)
+
+    def _run(self, input_code: str):
+        return run(input_code, Environment(), engine="vm")
+
+    def _assert_integer(self, evaluated, expected: int):
+        self.assertIsInstance(evaluated, Integer)
+        self.assertEqual(evaluated.value, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()